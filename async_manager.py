@@ -0,0 +1,411 @@
+"""
+async_manager.py – Cliente asyncio para la YouTube Data API.
+
+Misma superficie que YouTubeManager para listar, enriquecer, insertar,
+borrar y buscar, pero sobre aiohttp: un solo event loop puede mantener
+cientos de lecturas en vuelo entre muchos canales. La concurrencia se
+acota con un semáforo; cuota, limitador de ritmo y clasificación de
+errores son los mismos que usa el manager síncrono.
+
+`base_url` permite apuntar el cliente a un servidor local que imite la API.
+Con `mirror` (el PlaylistMirrorStore del manager) los inserts y deletes
+se anotan en el mismo mirror local que usa el manager síncrono.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import aiohttp
+import httplib2
+from googleapiclient.errors import HttpError
+from google.auth.transport.requests import Request
+
+from fields import FieldMask
+from keywords import KeywordMatcher
+from quota import QuotaExhausted
+from rate_limit import get_rate_limiter, is_throttle_error, method_kind
+from retry import RetryPolicy, classify_error
+from yt_manager import YouTubeManager
+
+API_BASE = "https://www.googleapis.com/youtube/v3"
+
+
+class AsyncYouTubeClient:
+    """
+    Uso:
+        async with AsyncYouTubeClient.from_manager(mgr) as yt:
+            async for item in yt.iter_playlist_items(pid): ...
+    """
+
+    # Máximo de IDs por videos().list
+    PAGE_LIMIT = 50
+
+    def __init__(self, creds, base_url: str = API_BASE, max_concurrency: int = 20,
+                 quota=None, rate_limiter=None, logger=None,
+                 max_retries: int = 3, retry_delay: float = 5,
+                 deadline: float = 300, timeout: float = 30, mirror=None):
+        self.creds = creds
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.quota = quota
+        self.mirror = mirror
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.logger = logger or logging.getLogger("YouTubeManager")
+        self.policy = RetryPolicy(max_retries, retry_delay, deadline=deadline)
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+        self._refresh_lock = None
+        self._playlist_locks = {}
+
+    @classmethod
+    def from_manager(cls, mgr: YouTubeManager, **kwargs) -> "AsyncYouTubeClient":
+        """Cliente que comparte credenciales, cuota, mirror y logger con un manager."""
+        kwargs.setdefault("quota", mgr.quota)
+        kwargs.setdefault("mirror", mgr.playlist_mirror)
+        kwargs.setdefault("rate_limiter", mgr.rate_limiter)
+        kwargs.setdefault("logger", mgr.logger)
+        kwargs.setdefault("max_retries", mgr.MAX_RETRIES)
+        kwargs.setdefault("retry_delay", mgr.RETRY_DELAY)
+        kwargs.setdefault("deadline", mgr.OPERATION_DEADLINE)
+        return cls(mgr.creds, **kwargs)
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._refresh_lock = asyncio.Lock()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # ------------------------------------------------------------------ #
+    # Transporte
+    # ------------------------------------------------------------------ #
+    async def _auth_headers(self) -> dict:
+        """Cabecera Bearer; refresca el token (una sola vez) si venció."""
+        if self.creds is None:
+            return {}
+        if not self.creds.valid:
+            async with self._refresh_lock:
+                if not self.creds.valid:
+                    await asyncio.to_thread(self.creds.refresh, Request())
+                    self.logger.info("Token refrescado.")
+        return {"Authorization": f"Bearer {self.creds.token}"}
+
+    async def _call_once(self, method_id: str, http_method: str, path: str,
+                         params: dict, body: dict):
+        kind = method_kind(method_id)
+        wait = self.rate_limiter.reserve(kind)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        query = {k: v for k, v in params.items() if v is not None}
+        async with self._semaphore:
+            headers = await self._auth_headers()
+            async with self._session.request(http_method, f"{self.base_url}/{path}",
+                                             params=query, json=body,
+                                             headers=headers) as resp:
+                content = await resp.read()
+                status = resp.status
+                retry_after = resp.headers.get("Retry-After")
+        if status >= 400:
+            info = {"status": str(status)}
+            if retry_after is not None:
+                info["retry-after"] = retry_after
+            # Mismo error que googleapiclient: retry.py y rate_limit.py lo clasifican igual
+            e = HttpError(httplib2.Response(info), content, uri=path)
+            if classify_error(e)[1] == "quotaExceeded" and self.quota is not None:
+                self.quota.mark_exhausted()
+                self.logger.error("Cuota de API excedida.")
+            if is_throttle_error(e):
+                try:
+                    pause = float(retry_after) if retry_after is not None else None
+                except ValueError:
+                    pause = None
+                pause = self.rate_limiter.on_throttle(kind, pause)
+                self.logger.warning(f"API saturada ({kind}); pausa de {pause:.0f}s.")
+            raise e
+        self.rate_limiter.on_success(kind)
+        return json.loads(content) if content else {}
+
+    async def _call(self, method_id: str, http_method: str, path: str,
+                    params: dict = None, body: dict = None, fields: FieldMask = None):
+        """
+        Una llamada con la política de reintentos del manager; con `fields`
+        pide respuesta parcial (y en modo estricto vigila lo que se lee).
+        La cuota se cobra una vez por llamada, no por intento.
+        """
+        if self.quota is not None:
+            self.quota.charge(method_id)
+        params = dict(params or {})
+        if fields is not None:
+            params["fields"] = str(fields)
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                resp = await self._call_once(method_id, http_method, path, params, body)
+                return fields.check(resp) if fields is not None else resp
+            except asyncio.TimeoutError as e:
+                error = e
+                retryable, reason = True, "timeout"
+            except aiohttp.ClientError as e:
+                error = e
+                retryable, reason = True, type(e).__name__
+            except HttpError as e:
+                error = e
+                retryable, reason = classify_error(e)
+            if not retryable or attempt >= self.policy.max_attempts:
+                raise error
+            wait = self.policy.delay(attempt)
+            deadline = self.policy.deadline
+            if deadline is not None and time.monotonic() - start + wait > deadline:
+                raise error
+            self.logger.warning(f"{method_id}: {reason} (intento {attempt}); "
+                                f"reintento en {wait:.1f}s.")
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def iter_pages(self, resource: str, params: dict, fields: FieldMask = None):
+        """Genera los items de un list paginado, página a página."""
+        params = dict(params)
+        while True:
+            r = await self._call(f"youtube.{resource}.list", "GET", resource, params,
+                                 fields=fields)
+            for it in r.get("items", []):
+                yield it
+            params["pageToken"] = r.get("nextPageToken")
+            if not params["pageToken"]:
+                return
+
+    # ------------------------------------------------------------------ #
+    # Lectura
+    # ------------------------------------------------------------------ #
+    async def get_channel_details(self, channel_id: str) -> dict:
+        """Devuelve título, descripción y suscriptores."""
+        r = await self._call("youtube.channels.list", "GET", "channels",
+                             {"part": "snippet,statistics", "id": channel_id},
+                             fields=YouTubeManager.FIELDS["channel_details"])
+        items = r.get("items", [])
+        if not items:
+            self.logger.warning("Canal no encontrado.")
+            return {}
+        snip = items[0]["snippet"]
+        return {
+            "title": snip["title"],
+            "description": snip["description"],
+            "subscriberCount": items[0]["statistics"].get("subscriberCount", "N/A")
+        }
+
+    async def uploads_playlist_id(self, channel_id: str) -> str:
+        r = await self._call("youtube.channels.list", "GET", "channels",
+                             {"part": "contentDetails", "id": channel_id},
+                             fields=YouTubeManager.FIELDS["uploads_playlist"])
+        items = r.get("items", [])
+        if not items:
+            raise ValueError(f"Canal no encontrado: {channel_id}")
+        return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    async def iter_playlist_items(self, playlist_id: str, part: str = "contentDetails",
+                                  fields: FieldMask = None):
+        async for it in self.iter_pages("playlistItems", {
+                "part": part, "playlistId": playlist_id, "maxResults": 50},
+                fields=fields or YouTubeManager.FIELDS["upload_items"]):
+            yield it
+
+    async def iter_channel_uploads(self, channel_id: str):
+        """Genera los videoId subidos por un canal (más recientes primero)."""
+        uploads = await self.uploads_playlist_id(channel_id)
+        async for it in self.iter_playlist_items(uploads):
+            yield it["contentDetails"]["videoId"]
+
+    async def get_video_ids_from_channel(self, channel_id: str) -> set:
+        return {vid async for vid in self.iter_channel_uploads(channel_id)}
+
+    async def get_channels_video_ids(self, channel_ids) -> dict:
+        """{channelId: set(videoIds)} leyendo todos los canales a la vez."""
+        channel_ids = list(channel_ids)
+        results = await asyncio.gather(
+            *(self.get_video_ids_from_channel(cid) for cid in channel_ids),
+            return_exceptions=True)
+        out = {}
+        for cid, res in zip(channel_ids, results):
+            if isinstance(res, BaseException):
+                self.logger.error(f"Canal {cid}: {res}")
+                continue
+            out[cid] = res
+        return out
+
+    async def get_existing_videos_from_playlist(self, playlist_id: str) -> dict:
+        """{videoId: itemId} de una playlist."""
+        return {it["contentDetails"]["videoId"]: it["id"]
+                async for it in self.iter_playlist_items(
+                    playlist_id, part="id,contentDetails",
+                    fields=YouTubeManager.FIELDS["mirror_items"])}
+
+    async def get_video_metadata(self, video_ids,
+                                 fields=("title", "description", "duration")) -> dict:
+        """
+        Metadatos {videoId: {campo: valor}} con el mismo formato que
+        YouTubeManager.iter_videos; los lotes de 50 se piden en paralelo.
+        """
+        ids = list(dict.fromkeys(video_ids))
+        parts = ",".join(sorted({YouTubeManager.VIDEO_FIELDS[f][0] for f in fields}))
+        mask = FieldMask("items.id", *(f"items.{part}.{key}" for part, key in
+                                       (YouTubeManager.VIDEO_FIELDS[f] for f in fields)))
+        chunks = [ids[i:i+self.PAGE_LIMIT] for i in range(0, len(ids), self.PAGE_LIMIT)]
+        pages = await asyncio.gather(*(
+            self._call("youtube.videos.list", "GET", "videos",
+                       {"part": parts, "id": ",".join(c), "maxResults": self.PAGE_LIMIT},
+                       fields=mask)
+            for c in chunks))
+        out = {}
+        for r in pages:
+            for it in r.get("items", []):
+                out[it["id"]] = {
+                    f: it.get(YouTubeManager.VIDEO_FIELDS[f][0], {})
+                         .get(YouTubeManager.VIDEO_FIELDS[f][1], "")
+                    for f in fields
+                }
+        return out
+
+    async def filter_videos(self, video_ids, exclude_keywords=(), min_duration=None,
+                            max_duration=None, include_keywords=(), whole_word: bool = False,
+                            accent_insensitive: bool = False) -> set:
+        """Filtra según palabras clave y duración (en segundos)."""
+        exclude = KeywordMatcher.compile(exclude_keywords, whole_word, accent_insensitive)
+        include = KeywordMatcher.compile(include_keywords, whole_word, accent_insensitive)
+        meta = await self.get_video_metadata(video_ids)
+        return {vid for vid, m in meta.items()
+                if YouTubeManager.video_passes_filter(m, exclude, min_duration,
+                                                      max_duration, include)}
+
+    async def search_channels(self, query: str, order: str = "relevance",
+                              published_after: str = "", published_before: str = "") -> list:
+        """Busca canales según palabras clave y filtros de fecha."""
+        params = {"part": "snippet", "q": query, "type": "channel",
+                  "order": order, "maxResults": 10,
+                  "publishedAfter": published_after or None,
+                  "publishedBefore": published_before or None}
+        try:
+            r = await self._call("youtube.search.list", "GET", "search", params,
+                                 fields=YouTubeManager.FIELDS["search_channels"])
+        except QuotaExhausted as e:
+            self.logger.error(f"Búsqueda omitida: {e}")
+            return []
+        results = []
+        for it in r.get("items", []):
+            if it.get("id", {}).get("kind") != "youtube#channel":
+                continue
+            cid = it["id"].get("channelId")
+            if not cid:
+                continue
+            sn = it.get("snippet", {})
+            results.append({"channelId": cid, "title": sn.get("title", ""),
+                            "description": sn.get("description", "")})
+        self.logger.info(f"Encontrados {len(results)} canales para '{query}'")
+        return results
+
+    # ------------------------------------------------------------------ #
+    # Escritura
+    # ------------------------------------------------------------------ #
+    def _playlist_lock(self, playlist_id: str) -> asyncio.Lock:
+        return self._playlist_locks.setdefault(playlist_id, asyncio.Lock())
+
+    async def add_videos_to_playlist(self, playlist_id: str, video_ids,
+                                     cancel_callback=None) -> dict:
+        """
+        Inserta los videos que falten en la playlist. Los inserts a una misma
+        playlist van en serie (en paralelo la API responde ABORTED/conflict).
+        Devuelve {added, skipped, failed} como el manager síncrono.
+        """
+        result = {"added": [], "skipped": [], "failed": []}
+        existing = await self.get_existing_videos_from_playlist(playlist_id)
+        async with self._playlist_lock(playlist_id):
+            for vid in dict.fromkeys(video_ids):
+                if vid in existing:
+                    result["skipped"].append({"videoId": vid, "reason": "already_in_playlist"})
+                    continue
+                if cancel_callback and cancel_callback():
+                    result["skipped"].append({"videoId": vid, "reason": "cancelled"})
+                    continue
+                body = {"snippet": {"playlistId": playlist_id,
+                                    "resourceId": {"kind": "youtube#video", "videoId": vid}}}
+                try:
+                    r = await self._call("youtube.playlistItems.insert", "POST",
+                                     "playlistItems", {"part": "snippet"}, body,
+                                     fields=YouTubeManager.FIELDS["created"])
+                except (QuotaExhausted, HttpError, aiohttp.ClientError,
+                        asyncio.TimeoutError) as e:
+                    reason = str(e) if isinstance(e, QuotaExhausted) else classify_error(e)[1]
+                    self.logger.error(f"Error al agregar {vid}: {reason}")
+                    result["failed"].append({"videoId": vid, "reason": reason})
+                    continue
+                existing[vid] = r.get("id")
+                if self.mirror is not None and r.get("id"):
+                    self.mirror.add(playlist_id, vid, r["id"])
+                result["added"].append(vid)
+                self.logger.info(f"Agregado video {vid}.")
+            if result["added"]:
+                await self._revalidate_mirror(playlist_id)
+        return result
+
+    async def delete_playlist_items(self, playlist_id: str, items: dict) -> int:
+        """
+        Borra {videoId: itemId} de la playlist en paralelo y actualiza el
+        mirror; devuelve cuántos se borraron.
+        """
+        items = dict(items)
+        results = await asyncio.gather(
+            *(self._call("youtube.playlistItems.delete", "DELETE", "playlistItems",
+                         {"id": iid}) for iid in items.values()),
+            return_exceptions=True)
+        removed = 0
+        for (vid, iid), res in zip(items.items(), results):
+            if isinstance(res, BaseException):
+                self.logger.error(f"Error al eliminar {iid}: {res}")
+                continue
+            if self.mirror is not None:
+                self.mirror.remove(playlist_id, vid)
+            removed += 1
+        if removed:
+            await self._revalidate_mirror(playlist_id)
+        return removed
+
+    async def _revalidate_mirror(self, playlist_id: str):
+        """Como YouTubeManager._revalidate_mirror: adopta el etag nuevo si
+        el itemCount coincide con el del mirror (1 unidad)."""
+        if self.mirror is None:
+            return
+        mask = YouTubeManager.FIELDS["playlist_version"]
+        try:
+            r = await self._call("youtube.playlists.list", "GET", "playlists",
+                                 {"part": "contentDetails", "id": playlist_id}, fields=mask)
+        except (QuotaExhausted, HttpError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"No se pudo revalidar el mirror de {playlist_id}: {e}")
+            return
+        items = r.get("items", [])
+        if not (items and self.mirror.adopt_etag(
+                playlist_id, items[0].get("etag"), items[0]["contentDetails"]["itemCount"])):
+            self.logger.info(f"Mirror de {playlist_id} sin revalidar: se recarga en el "
+                             f"próximo uso.")
+
+    async def empty_playlist(self, playlist_id: str) -> int:
+        """Borra todos los videos de una playlist."""
+        items = await self.get_existing_videos_from_playlist(playlist_id)
+        removed = await self.delete_playlist_items(playlist_id, items)
+        self.logger.info(f"Playlist vaciada ({removed}/{len(items)} eliminados).")
+        return removed
@@ -0,0 +1,329 @@
+"""
+cli.py – Entrada de línea de comandos, sin GUI (apta para cron/systemd).
+
+    python cli.py --config ytm.json batch
+    python cli.py process-channel UCxxxx --playlist PLxxxx
+    python cli.py playlists list
+
+Cada comando imprime su resultado como JSON en stdout; los logs van a
+stderr y a ytube.log. No importa nada de tkinter.
+
+Códigos de salida:
+    0  todo bien
+    1  terminó con fallos parciales (inserts fallidos, canales con error...)
+    2  uso o configuración inválidos
+    3  falta autenticar o el token no se puede refrescar (correr `auth`)
+    4  quedó trabajo diferido por falta de cuota
+    5  error inesperado
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+
+from logger import setup_logging
+from quota import QuotaExhausted
+from scheduler import Scheduler, ScheduleStore
+from settings import SCOPES, filter_kwargs, load_config, run_options
+
+EXIT_OK, EXIT_PARTIAL, EXIT_USAGE, EXIT_AUTH, EXIT_QUOTA, EXIT_ERROR = range(6)
+
+# Claves propias de la CLI, además de las de settings.DEFAULT_CONFIG
+CLI_DEFAULTS = {
+    "token_file": "token.pickle",
+    "client_secrets": "client_secrets.json",
+    "state_db": "ytmanager.db",
+    "playlist_id": "",
+    "channels": [],
+}
+
+
+class UsageError(Exception):
+    """Falta un parámetro que no vino ni por argumento ni en la config."""
+
+
+def _require(value, name: str):
+    if not value:
+        raise UsageError(f"Falta {name} (argumento o clave en la config).")
+    return value
+
+
+def _error_exit_code(mgr, exc: Exception = None) -> int:
+    """Un error que cortó la operación: por cuota (4) o inesperado (5)."""
+    if isinstance(exc, QuotaExhausted) or (mgr and mgr.quota.remaining() <= 0):
+        return EXIT_QUOTA
+    return EXIT_ERROR
+
+
+def _insert_exit_code(mgr, result: dict) -> int:
+    if result.get("error"):
+        return _error_exit_code(mgr)
+    skipped = result.get("skipped", [])
+    if any(s["reason"] == "quota_deferred" for s in skipped):
+        return EXIT_QUOTA
+    if result.get("failed"):
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+# ---------------------------------------------------------------------- #
+# Comandos: cada uno devuelve (resultado JSON, código de salida)
+# ---------------------------------------------------------------------- #
+def cmd_process_channel(mgr, args, config):
+    playlist = _require(args.playlist or config["playlist_id"], "playlist_id")
+    result = mgr.process_channel(
+        args.channel, playlist, config["batch_size"],
+        filter_kwargs=filter_kwargs(config),
+        full_resync=args.full_resync or config["full_resync"]
+    )
+    return result, _insert_exit_code(mgr, result)
+
+
+def _channel_ids(config) -> list:
+    """`channels` admite IDs sueltos o {"channelId", "interval", "playlist_id"}."""
+    return [c if isinstance(c, str) else c["channelId"] for c in config["channels"]]
+
+
+def schedule_entries(config, interval: float) -> list:
+    """(canal, playlist, minutos, opciones) para el programador; cada canal
+    puede traer su propio intervalo y playlist destino."""
+    entries = []
+    options = run_options(config)
+    for c in config["channels"]:
+        c = {"channelId": c} if isinstance(c, str) else c
+        playlist = _require(c.get("playlist_id") or config["playlist_id"], "playlist_id")
+        entries.append((c["channelId"], playlist, c.get("interval", interval), options))
+    return entries
+
+
+def run_batch(mgr, config, channels=None, playlist=None, full_resync=False):
+    """Un batch con los canales/playlist dados o los de la config."""
+    channels = _require(channels or _channel_ids(config), "channels")
+    playlist = _require(playlist or config["playlist_id"], "playlist_id")
+    report = mgr.process_batch(
+        channels, playlist, config["batch_size"],
+        filter_kwargs=filter_kwargs(config),
+        full_resync=full_resync or config["full_resync"]
+    )
+    code = EXIT_OK
+    skipped = [s for c in report["channels"].values() for s in c["skipped"]]
+    if any(s["reason"] == "quota_deferred" for s in skipped):
+        code = EXIT_QUOTA
+    elif report["totals"]["failed"] or report["totals"]["errors"]:
+        code = EXIT_PARTIAL
+    return report, code
+
+
+def cmd_batch(mgr, args, config):
+    return run_batch(mgr, config, args.channels, args.playlist, args.full_resync)
+
+
+def cmd_playlists(mgr, args, config):
+    if args.action == "list":
+        return mgr.list_playlists(), EXIT_OK
+    if args.action == "create":
+        pid = mgr.create_playlist(args.title, args.description, args.privacy)
+        return {"playlistId": pid}, EXIT_OK if pid else _error_exit_code(mgr)
+    if args.action == "update":
+        resp = mgr.update_playlist(args.playlist_id, args.title, args.description,
+                                   args.privacy)
+        return {"playlistId": args.playlist_id, "updated": bool(resp)}, \
+            EXIT_OK if resp else _error_exit_code(mgr)
+    # delete: si falla, la excepción llega a main() y sale con error
+    mgr.delete_playlist(args.playlist_id)
+    return {"playlistId": args.playlist_id, "deleted": True}, EXIT_OK
+
+
+def cmd_empty(mgr, args, config):
+    playlist = _require(args.playlist or config["playlist_id"], "playlist_id")
+    before = len(mgr.get_playlist_mirror(playlist))
+    mgr.empty_playlist(playlist)
+    left = len(mgr.get_playlist_mirror(playlist))
+    return {"playlistId": playlist, "removed": before - left, "remaining": left}, \
+        EXIT_OK if not left else EXIT_PARTIAL
+
+
+def cmd_clean(mgr, args, config):
+    playlist = _require(args.playlist or config["playlist_id"], "playlist_id")
+    min_d = args.min_duration if args.min_duration is not None else config["filter_min_duration"]
+    max_d = args.max_duration if args.max_duration is not None else config["filter_max_duration"]
+    if not (min_d or max_d):
+        raise UsageError("clean necesita --min-duration y/o --max-duration.")
+    result = mgr.remove_videos_by_duration(playlist, min_d or None, max_d or None)
+    return dict(result, playlistId=playlist), EXIT_OK if not result["failed"] else EXIT_PARTIAL
+
+
+def cmd_trending(mgr, args, config):
+    return mgr.get_trending_videos(regionCode=args.region, maxResults=args.max), EXIT_OK
+
+
+def cmd_jobs(mgr, args, config):
+    if args.action == "purge":
+        return {"purged": mgr.purge_jobs(args.older_than)}, EXIT_OK
+    return mgr.list_jobs(args.status), EXIT_OK
+
+
+def cmd_quota(mgr, args, config):
+    return mgr.quota.report(), EXIT_OK
+
+
+def cmd_daemon(mgr, args, config):
+    """
+    Batches programados hasta SIGTERM/SIGINT. Intervalo por canal (o
+    `auto_update_interval`), sin solapar batches sobre una misma playlist
+    (tampoco con los de la GUI sobre la misma base).
+    Emite una línea JSON por batch terminado.
+    """
+    interval = args.interval or config["auto_update_interval"]
+    entries = schedule_entries(config, interval)
+    if not entries or not all(minutes for _, _, minutes, _ in entries):
+        raise UsageError("daemon necesita canales y --interval o auto_update_interval > 0.")
+
+    def run(playlist, channel_ids, options):
+        report, code = run_batch(mgr, dict(config, **options), channel_ids, playlist)
+        _emit({"event": "batch", "playlist_id": playlist, "totals": report["totals"],
+               "exit_code": code, "schedule": scheduler.stats()}, compact=True)
+
+    scheduler = Scheduler(run, ScheduleStore(config["state_db"]), owner="daemon",
+                          logger=mgr.logger)
+    scheduler.set_entries(entries)
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    scheduler.start()
+    stop.wait()
+    scheduler.stop()
+    return {"event": "stopped", "schedule": scheduler.stats()}, EXIT_OK
+
+
+# ---------------------------------------------------------------------- #
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="cli.py", description="YouTubeVManager sin GUI.")
+    p.add_argument("--config", help="archivo JSON con las mismas claves que la GUI")
+    p.add_argument("--token", help="token.pickle a usar (por defecto el de la config)")
+    p.add_argument("-v", "--verbose", action="store_true", help="logs INFO en stderr")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("auth", help="autoriza en el navegador y guarda el token")
+    s.set_defaults(func=None)
+
+    s = sub.add_parser("process-channel", help="agrega los videos de un canal")
+    s.add_argument("channel")
+    s.add_argument("--playlist")
+    s.add_argument("--full-resync", action="store_true")
+    s.set_defaults(func=cmd_process_channel)
+
+    s = sub.add_parser("batch", help="procesa varios canales hacia una playlist")
+    s.add_argument("--channels", nargs="+")
+    s.add_argument("--playlist")
+    s.add_argument("--full-resync", action="store_true")
+    s.set_defaults(func=cmd_batch)
+
+    s = sub.add_parser("playlists", help="listar/crear/actualizar/borrar playlists")
+    ps = s.add_subparsers(dest="action", required=True)
+    ps.add_parser("list")
+    c = ps.add_parser("create")
+    c.add_argument("title")
+    c.add_argument("--description", default="")
+    c.add_argument("--privacy", default="private", choices=["private", "unlisted", "public"])
+    u = ps.add_parser("update")
+    u.add_argument("playlist_id")
+    u.add_argument("title")
+    u.add_argument("--description", default="")
+    u.add_argument("--privacy", default="private", choices=["private", "unlisted", "public"])
+    d = ps.add_parser("delete")
+    d.add_argument("playlist_id")
+    s.set_defaults(func=cmd_playlists)
+
+    s = sub.add_parser("empty", help="borra todos los videos de una playlist")
+    s.add_argument("--playlist")
+    s.set_defaults(func=cmd_empty)
+
+    s = sub.add_parser("clean", help="borra videos de la playlist por duración (seg)")
+    s.add_argument("--playlist")
+    s.add_argument("--min-duration", type=int)
+    s.add_argument("--max-duration", type=int)
+    s.set_defaults(func=cmd_clean)
+
+    s = sub.add_parser("trending", help="videos más populares")
+    s.add_argument("--region", default="US")
+    s.add_argument("--max", type=int, default=10)
+    s.set_defaults(func=cmd_trending)
+
+    s = sub.add_parser("jobs", help="diario de trabajos de inserción")
+    js = s.add_subparsers(dest="action", required=True)
+    jl = js.add_parser("list")
+    jl.add_argument("--status", choices=["running", "completed", "abandoned"])
+    jp = js.add_parser("purge")
+    jp.add_argument("--older-than", type=float, default=0, help="días")
+    s.set_defaults(func=cmd_jobs)
+
+    s = sub.add_parser("quota", help="cuota usada hoy por método")
+    s.set_defaults(func=cmd_quota)
+
+    s = sub.add_parser("daemon", help="batch periódico (cron/systemd)")
+    s.add_argument("--interval", type=int, help="minutos entre batches")
+    s.set_defaults(func=cmd_daemon)
+    return p
+
+
+def _emit(payload, compact: bool = False):
+    json.dump(payload, sys.stdout, ensure_ascii=False, default=list,
+              indent=None if compact else 2)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        config = dict(CLI_DEFAULTS, **load_config(args.config))
+    except (OSError, ValueError) as e:
+        _emit({"error": f"Config inválida: {e}"})
+        return EXIT_USAGE
+
+    logger = setup_logging()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setLevel(logging.INFO if args.verbose else logging.WARNING)
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    logger.addHandler(handler)
+
+    token = args.token or config["token_file"]
+    # Import diferido: `--help` y los errores de uso no pagan googleapiclient
+    from yt_manager import AuthRequired, YouTubeManager
+
+    if args.command == "auth":
+        try:
+            YouTubeManager.update_token_pickle(token, config["client_secrets"], SCOPES)
+        except Exception as e:
+            _emit({"error": str(e)})
+            return EXIT_AUTH
+        _emit({"token": os.path.abspath(token)})
+        return EXIT_OK
+
+    mgr = None
+    try:
+        mgr = YouTubeManager(token, SCOPES, state_db=config["state_db"],
+                             interactive_auth=False)
+        mgr.RETRY_DELAY = config["retry_delay"]
+        payload, code = args.func(mgr, args, config)
+    except UsageError as e:
+        _emit({"error": str(e)})
+        return EXIT_USAGE
+    except AuthRequired as e:
+        _emit({"error": str(e)})
+        return EXIT_AUTH
+    except Exception as e:
+        logger.exception(f"Error en {args.command}")
+        _emit({"error": str(e)})
+        return _error_exit_code(mgr, e)
+    _emit(payload)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
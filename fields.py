@@ -0,0 +1,100 @@
+"""
+fields.py – Máscaras `fields=` para respuestas parciales de la API.
+
+Cada método declara las rutas que realmente lee ("items.id",
+"items.snippet.title"...) y FieldMask las convierte en la sintaxis de
+`fields` de Google ("items(id,snippet/title)"). Así la API devuelve solo
+esas claves.
+
+Modo estricto (YTM_STRICT_FIELDS=1 o FieldMask.strict = True): las
+respuestas se envuelven para que leer una clave fuera de la máscara lance
+FieldNotRequested, aunque el servidor la haya mandado. Sirve para detectar
+código que depende de un campo que olvidó declarar.
+"""
+
+import os
+
+
+class FieldNotRequested(KeyError):
+    """Se leyó un campo que la máscara no pidió."""
+
+
+class FieldMask:
+    """Árbol de rutas declaradas y su representación para `fields=`."""
+
+    strict = os.environ.get("YTM_STRICT_FIELDS") == "1"
+
+    def __init__(self, *paths: str):
+        self.paths = paths
+        self.tree = {}
+        for path in paths:
+            node = self.tree
+            for key in path.split("."):
+                node = node.setdefault(key, {})
+
+    def __add__(self, other: "FieldMask") -> "FieldMask":
+        return FieldMask(*self.paths, *other.paths)
+
+    @staticmethod
+    def _render(tree: dict) -> str:
+        out = []
+        for key, sub in tree.items():
+            if not sub:
+                out.append(key)
+            elif len(sub) == 1 and not next(iter(sub.values())):
+                out.append(f"{key}/{next(iter(sub))}")
+            else:
+                out.append(f"{key}({FieldMask._render(sub)})")
+        return ",".join(out)
+
+    def __str__(self) -> str:
+        return self._render(self.tree)
+
+    def __repr__(self) -> str:
+        return f"FieldMask({str(self)!r})"
+
+    def check(self, resp):
+        """La respuesta tal cual, o envuelta en vistas estrictas si corresponde."""
+        if not self.strict:
+            return resp
+        return _wrap(resp, self.tree, "")
+
+
+class StrictDict(dict):
+    """dict que solo deja leer las claves de su nodo de la máscara."""
+
+    def __init__(self, data: dict, tree: dict, path: str):
+        super().__init__(data)
+        self._tree = tree
+        self._path = path
+
+    def _allowed(self, key):
+        if key not in self._tree:
+            where = f"{self._path}.{key}" if self._path else key
+            raise FieldNotRequested(f"'{where}' no está en la máscara fields=")
+
+    def __getitem__(self, key):
+        self._allowed(key)
+        return _wrap(super().__getitem__(key), self._tree[key],
+                     f"{self._path}.{key}" if self._path else key)
+
+    def get(self, key, default=None):
+        self._allowed(key)
+        if key not in self:
+            return default
+        return self[key]
+
+    def __contains__(self, key):
+        self._allowed(key)
+        return super().__contains__(key)
+
+
+def _wrap(value, tree: dict, path: str):
+    # Un nodo hoja pidió el objeto entero: no hay nada más que vigilar
+    if not tree:
+        return value
+    if isinstance(value, dict):
+        return StrictDict(value, tree, path)
+    if isinstance(value, list):
+        return [_wrap(v, tree, path) for v in value]
+    return value
@@ -17,18 +17,31 @@ No se eliminó ni se cambió ninguna funcionalidad existente.
 """
 
 import queue
-import threading
-import time
+import shutil
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 
+from gui.executor import QueueFull, TaskExecutor
+from gui.log_viewer import LogViewer
+from log_index import LogIndex
 from logger import setup_logging
+from scheduler import Scheduler, ScheduleStore
+from session import get_session, invalidate_session, session_stats
+from settings import DEFAULT_CONFIG, SCOPES, filter_kwargs as config_filter_kwargs, run_options
 from yt_manager import YouTubeManager
 
 
 class App:
     """Interfaz Tkinter y puente hacia YouTubeManager."""
 
+    SCOPES = SCOPES
+    STATE_DB = "ytmanager.db"
+    LOG_FILE = "ytube.log"
+
+    # Panel de log: líneas visibles como máximo y mensajes dibujados por tick
+    LOG_MAX_LINES = 2000
+    LOG_MAX_PER_TICK = 500
+
     # ------------------------------------------------------------------ #
     # 1. CONSTRUCTOR Y VARIABLES GLOBALES
     # ------------------------------------------------------------------ #
@@ -39,17 +52,12 @@ class App:
 
         # ---- cola de logs + logger ------------------------------------
         self.log_queue = queue.Queue()
+        self._log_lines = 0
+        self._log_index = None        # índice de ytube.log, al abrir el historial
         self.logger = setup_logging(log_queue=self.log_queue)
 
         # ---- configuración por defecto (duraciones en segundos) -------
-        self.config = {
-            "retry_delay": 5,            # seg
-            "batch_size": 20,
-            "filter_exclude_keywords": "",
-            "filter_min_duration": 0,    # seg (0 = sin mínimo)
-            "filter_max_duration": 0,    # seg (0 = sin máximo)
-            "auto_update_interval": 0    # min
-        }
+        self.config = dict(DEFAULT_CONFIG)
         self.cancel_operation = False
 
         # ---- variables Tkinter (para widgets) -------------------------
@@ -61,18 +69,30 @@ class App:
         self.published_after = tk.StringVar()
         self.published_before= tk.StringVar()
         self.status_var      = tk.StringVar(value="Listo")
+        self.tasks_var       = tk.StringVar(value="")
         self.progress_value  = tk.DoubleVar(value=0)
 
         # ---- contenedores --------------------------------------------
         self.batch_channels: list[dict] = []
         self.playlist_data : list[dict] = []
 
+        # ---- tareas en segundo plano (pool acotado) -------------------
+        self.tasks = TaskExecutor(
+            max_workers=4, dispatch=lambda fn: self.root.after(0, fn),
+            on_change=self._update_tasks_label, logger=self.logger
+        )
+
         # ---- construir UI + lector de logs ---------------------------
         self.build_ui()
         self.update_log()
 
-        if self.config["auto_update_interval"] > 0:
-            self.start_auto_update()
+        # ---- programador de batches (reemplaza el bucle con sleep) ----
+        # Las entradas guardadas de una sesión anterior siguen vigentes, cada
+        # una con las opciones (filtros, lote...) con las que se programó
+        self.scheduler = Scheduler(self._run_batch, ScheduleStore(self.STATE_DB),
+                                   owner="gui", logger=self.logger)
+        self._restore_schedule()
+        self.scheduler.start()
 
     # ------------------------------------------------------------------ #
     # 2. INTERFAZ COMPLETA
@@ -91,6 +111,8 @@ class App:
         cfg = tk.Menu(menubar, tearoff=0)
         cfg.add_command(label="Configuración", command=self.open_config_window)
         cfg.add_command(label="Actualizar Token", command=self.update_token_action)
+        cfg.add_command(label="Estado de Programación", command=self.show_schedule_stats)
+        cfg.add_command(label="Tareas en Curso", command=self.show_tasks)
         menubar.add_cascade(label="Configuración", menu=cfg)
 
         ayuda = tk.Menu(menubar, tearoff=0)
@@ -183,6 +205,8 @@ class App:
             variable=self.progress_value, maximum=100
         )
         self.progress_bar.grid(row=12, column=2, sticky="ew", padx=5, pady=2)
+        ttk.Label(f1, textvariable=self.tasks_var, foreground="#555")\
+            .grid(row=13, column=0, columnspan=3, sticky="w", pady=2)
 
         # ---------------- PESTAÑA 2: Batch Processing ------------------
         fb = ttk.Frame(notebook, padding=10)
@@ -271,17 +295,45 @@ class App:
     # 3. REGISTRO / ESTADO / PROGRESO
     # ------------------------------------------------------------------ #
     def update_log(self):
-        """Vacía la cola y escribe los logs en pantalla cada 100 ms."""
+        """
+        Vacía la cola y escribe los logs en pantalla cada 100 ms: todo lo
+        pendiente va en un solo insert y el panel guarda solo las últimas
+        LOG_MAX_LINES líneas (el historial completo queda en ytube.log).
+        """
+        msgs, dropped = [], 0
+        # Lo que igual saldría del panel en este tick no se llega a dibujar
+        backlog = self.log_queue.qsize() - self.LOG_MAX_LINES
         try:
-            while True:
-                msg = self.log_queue.get_nowait()
-                self.log_text.config(state='normal')
-                self.log_text.insert(tk.END, msg + "\n")
-                self.log_text.see(tk.END)
-                self.log_text.config(state='disabled')
+            while dropped < backlog:
+                self.log_queue.get_nowait()
+                dropped += 1
+            while len(msgs) < self.LOG_MAX_PER_TICK:
+                msgs.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
-        self.root.after(100, self.update_log)
+        if dropped:
+            msgs.insert(0, f"… {dropped} líneas omitidas en pantalla (ver Historial).")
+        if msgs:
+            follow = self.log_text.yview()[1] >= 0.999
+            text = "\n".join(msgs) + "\n"
+            self.log_text.config(state='normal')
+            self.log_text.insert(tk.END, text)
+            self._log_lines += text.count("\n")
+            excess = self._log_lines - self.LOG_MAX_LINES
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self._log_lines -= excess
+            self.log_text.config(state='disabled')
+            if follow:
+                self.log_text.see(tk.END)
+        # Si quedó algo en la cola se vuelve enseguida, sin bloquear la UI
+        busy = len(msgs) >= self.LOG_MAX_PER_TICK
+        self.root.after(10 if busy else 100, self.update_log)
+
+    def _manager(self, token: str = None) -> YouTubeManager:
+        """Sesión compartida para el token (no se crea un manager por acción)."""
+        return get_session(token or self.token_file.get(), self.SCOPES,
+                           log_queue=self.log_queue)
 
     def update_status(self, text: str):
         self.root.after(0, lambda: self.status_var.set(text))
@@ -289,6 +341,21 @@ class App:
     def update_progress(self, value: float):
         self.root.after(0, lambda: self.progress_value.set(value))
 
+    def run_task(self, fn, *args, **kwargs):
+        """Manda fn al ejecutor; None si la cola está llena."""
+        try:
+            return self.tasks.submit(fn, *args, **kwargs)
+        except QueueFull as e:
+            self.logger.warning(str(e))
+            self.update_status("Demasiadas tareas en cola; espera un momento.")
+            return None
+
+    def _update_tasks_label(self):
+        snap = self.tasks.snapshot()
+        running, queued = len(snap["running"]), len(snap["queued"])
+        self.tasks_var.set(f"Tareas: {running} en curso, {queued} en cola"
+                           if running or queued else "")
+
     # ------------------------------------------------------------------ #
     # 4. BÚSQUEDA DE CANALES
     # ------------------------------------------------------------------ #
@@ -301,18 +368,10 @@ class App:
             return
         cid = vals[1]
         self.channel_id.set(cid)
-
-        def worker():
-            mgr = YouTubeManager(
-                self.token_file.get(),
-                ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                log_queue=self.log_queue
-            )
-            details = mgr.get_channel_details(cid)
-            self.root.after(0,
-                            lambda: self._show_channel_details(details))
-
-        threading.Thread(target=worker, daemon=True).start()
+        # Cambiar de selección descarta los detalles del canal anterior
+        self.run_task(lambda: self._manager().get_channel_details(cid),
+                      key=("get_channel_details", cid), group="channel_details",
+                      label=f"detalles {cid}", on_done=self._show_channel_details)
 
     def _show_channel_details(self, details: dict | None):
         self.details_text.config(state='normal')
@@ -345,22 +404,20 @@ class App:
         self.update_status("Buscando canales...")
         self.btn_search.config(state='disabled')
 
-        def worker():
-            mgr = YouTubeManager(
-                self.token_file.get(),
-                ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                log_queue=self.log_queue
-            )
-            channels = mgr.search_channels(
-                query,
-                self.order_option.get(),
-                self.published_after.get(),
-                self.published_before.get()
-            )
-            self.root.after(0,
-                            lambda: self._insert_search_results(channels))
+        params = (query, self.order_option.get(),
+                  self.published_after.get(), self.published_before.get())
+
+        def failed(e):
+            self.logger.error(f"Error en búsqueda: {e}")
+            self.update_status("Error en la búsqueda.")
+            self.btn_search.config(state='normal')
 
-        threading.Thread(target=worker, daemon=True).start()
+        task = self.run_task(lambda: self._manager().search_channels(*params),
+                             key=("search_channels", *params), group="search",
+                             label=f"búsqueda '{query}'",
+                             on_done=self._insert_search_results, on_error=failed)
+        if task is None:
+            self.btn_search.config(state='normal')
 
     def _insert_search_results(self, channels: list[dict]):
         for ch in channels:
@@ -393,6 +450,7 @@ class App:
         self.batch_channels.append({"channelId": cid, "title": title})
         self.batch_listbox.insert(tk.END, f"{title} (ID: {cid})")
         self.logger.info(f"Canal {cid} agregado a batch.")
+        self._sync_schedule()
 
     def remove_channel_from_batch(self):
         sel = self.batch_listbox.curselection()
@@ -402,6 +460,7 @@ class App:
         removed = self.batch_channels.pop(idx)
         self.batch_listbox.delete(idx)
         self.logger.info(f"Canal {removed['channelId']} removido de batch.")
+        self._sync_schedule()
 
     # ------------------------------------------------------------------ #
     # 6. PROCESAR CANAL INDIVIDUAL
@@ -424,31 +483,27 @@ class App:
         self.btn_search.config(state='disabled')
         self.cancel_operation = False
 
-        exclude = [kw.strip() for kw in
-                   self.config["filter_exclude_keywords"].split(",")
-                   if kw.strip()]
-        filter_kwargs = {
-            "exclude_keywords": exclude,
-            "min_duration": self.config["filter_min_duration"] or None,
-            "max_duration": self.config["filter_max_duration"] or None
-        }
+        filter_kwargs = self._filter_kwargs()
+        full_resync = self._take_full_resync()
 
         def worker():
             try:
-                mgr = YouTubeManager(
-                    token,
-                    ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                    log_queue=self.log_queue
-                )
+                mgr = self._manager(token)
                 mgr.RETRY_DELAY = self.config["retry_delay"]
-                mgr.process_channel(
+                result = mgr.process_channel(
                     channel, playlist, self.config["batch_size"],
                     progress_callback=self.update_progress,
                     cancel_callback=lambda: self.cancel_operation,
-                    filter_kwargs=filter_kwargs
+                    filter_kwargs=filter_kwargs,
+                    full_resync=full_resync
                 )
+                if result["error"]:
+                    self.update_status(f"Proceso cortado por error: {result['error']} "
+                                       f"({len(result['added'])} agregados).")
+                    return
                 self.logger.info(f"Proceso del canal {channel} finalizado.")
-                self.update_status("Proceso completado.")
+                self.update_status(f"Proceso completado: {len(result['added'])} agregados, "
+                                   f"{len(result['failed'])} fallidos.")
             except Exception as e:
                 self.logger.critical(f"Error procesando canal {channel}: {e}")
                 self.update_status("Error en el proceso.")
@@ -456,7 +511,9 @@ class App:
                 self.root.after(
                     0, lambda: self.btn_search.config(state='normal'))
 
-        threading.Thread(target=worker, daemon=True).start()
+        if self.run_task(worker, key=("process_channel", channel, playlist),
+                         label=f"canal {channel}") is None:
+            self.btn_search.config(state='normal')
 
     # ------------------------------------------------------------------ #
     # 7. PROCESAR BATCH
@@ -473,49 +530,102 @@ class App:
                                    "No hay canales en la lista de batch.")
             return
 
-        min_min = self.config["filter_min_duration"] // 60
-        max_min = self.config["filter_max_duration"] // 60
+        # Mismo camino que las ejecuciones programadas: nunca dos a la vez
+        if self.scheduler.is_running(playlist):
+            messagebox.showinfo("Información",
+                                "Ya hay un batch en curso para esta playlist.")
+            return
+        self.cancel_operation = False
+        self._sync_schedule()
+        if not self.scheduler.submit(playlist, [ch["channelId"] for ch in self.batch_channels],
+                                     run_options(self.config)):
+            messagebox.showinfo("Información",
+                                "Otro proceso (p. ej. `cli.py daemon`) está procesando "
+                                "esta playlist.")
+
+    def _run_batch(self, playlist: str, channel_ids: list, options: dict):
+        """Un batch completo; corre en el hilo que le da el programador."""
+        config = dict(self.config, **options)
+        min_min = config["filter_min_duration"] // 60
+        max_min = config["filter_max_duration"] // 60
         dur_msg = (f" | Filtro {min_min or 0}-{max_min or '∞'} min"
                    if (min_min or max_min) else "")
         self.update_status(f"Procesando batch de canales...{dur_msg}")
         self.update_progress(0)
-        self.cancel_operation = False
-        total = len(self.batch_channels)
-
-        def worker():
-            try:
-                for idx, ch in enumerate(self.batch_channels):
-                    if self.cancel_operation:
-                        self.logger.info("Operación batch cancelada.")
-                        break
-                    self.logger.info(f"Procesando canal {ch['channelId']} "
-                                     f"({idx + 1}/{total})")
-                    mgr = YouTubeManager(
-                        token,
-                        ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                        log_queue=self.log_queue
-                    )
-                    mgr.RETRY_DELAY = self.config["retry_delay"]
-                    fk = {
-                        "exclude_keywords": [kw.strip() for kw in
-                                             self.config["filter_exclude_keywords"]
-                                             .split(",") if kw.strip()],
-                        "min_duration": self.config["filter_min_duration"] or None,
-                        "max_duration": self.config["filter_max_duration"] or None
-                    }
-                    mgr.process_channel(
-                        ch["channelId"], playlist, self.config["batch_size"],
-                        progress_callback=self.update_progress,
-                        cancel_callback=lambda: self.cancel_operation,
-                        filter_kwargs=fk
-                    )
-                    time.sleep(2)
-                self.update_status("Batch completado.")
-            except Exception as e:
-                self.logger.error(f"Error en batch: {e}")
-                self.update_status("Error en batch.")
-
-        threading.Thread(target=worker, daemon=True).start()
+        full_resync = self._take_full_resync()
+        try:
+            mgr = self._manager()
+            mgr.RETRY_DELAY = config["retry_delay"]
+            # Lecturas de todos los canales en paralelo; inserts en serie
+            report = mgr.process_batch(
+                channel_ids, playlist, config["batch_size"],
+                progress_callback=self.update_progress,
+                cancel_callback=lambda: self.cancel_operation,
+                filter_kwargs=config_filter_kwargs(config), full_resync=full_resync
+            )
+            t = report["totals"]
+            stats = session_stats()
+            self.logger.info(f"Sesión reutilizada {stats['reuses']} veces, "
+                             f"{stats['saved_seconds']}s de arranque ahorrados.")
+            self.update_status(f"Batch completado: {t['added']} agregados, "
+                               f"{t['failed']} fallidos, {t['errors']} canales con error.")
+        except Exception as e:
+            self.logger.error(f"Error en batch: {e}")
+            self.update_status("Error en batch.")
+            raise
+
+    def _restore_schedule(self):
+        """
+        Muestra lo programado en una sesión anterior: intervalo, opciones,
+        playlist y canales del batch, así se puede editar o apagar.
+        """
+        entries = self.scheduler.store.entries(self.scheduler.owner)
+        if not entries:
+            return
+        playlist = self.playlist_id.get().strip() or entries[0]["playlist_id"]
+        mine = [e for e in entries if e["playlist_id"] == playlist] or entries
+        self.playlist_id.set(mine[0]["playlist_id"])
+        self.config.update(mine[0]["options"])
+        self.config["auto_update_interval"] = round(min(e["interval_s"] for e in mine) / 60)
+        for e in mine:
+            if any(ch["channelId"] == e["channel_id"] for ch in self.batch_channels):
+                continue
+            self.batch_channels.append({"channelId": e["channel_id"], "title": e["channel_id"]})
+            self.batch_listbox.insert(tk.END, f"{e['channel_id']} (ID: {e['channel_id']})")
+        self.logger.info(f"Programación restaurada: {len(entries)} canal(es).")
+
+    def _sync_schedule(self, clear: bool = False):
+        """
+        Programa los canales del batch hacia la playlist actual, con la
+        config actual. Solo toca las entradas de esa playlist. Sin
+        intervalo no borra nada, salvo `clear` (el usuario apagó la
+        actualización automática): entonces quita todo lo programado.
+        """
+        playlist = self.playlist_id.get().strip()
+        minutes = self.config["auto_update_interval"]
+        if minutes <= 0:
+            if clear and self.scheduler.store.entries(self.scheduler.owner):
+                self.scheduler.set_entries([])
+                self.logger.info("Actualización automática desactivada.")
+            return
+        if not playlist or not self.batch_channels:
+            # Sin datos en pantalla no se toca lo programado antes
+            return
+        options = run_options(self.config)
+        self.scheduler.set_entries(
+            [(ch["channelId"], playlist, minutes, options) for ch in self.batch_channels],
+            playlists=[playlist])
+
+    def _filter_kwargs(self) -> dict:
+        return config_filter_kwargs(self.config)
+
+    def _take_full_resync(self) -> bool:
+        """Devuelve y apaga la opción de resincronización completa (un solo uso)."""
+        full = self.config["full_resync"]
+        if full:
+            self.config["full_resync"] = False
+            self.logger.info("Resincronización completa: se reconstruyen los checkpoints.")
+        return full
 
     def cancel_current_operation(self):
         self.cancel_operation = True
@@ -531,17 +641,9 @@ class App:
                                    "Ingresa el ID de la playlist.")
             return
 
-        def fetch():
-            mgr = YouTubeManager(
-                self.token_file.get(),
-                ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                log_queue=self.log_queue
-            )
-            vids = mgr.get_existing_videos_from_playlist(pid)
-            self.root.after(0, lambda:
-                            self._show_videos_window(list(vids)))
-
-        threading.Thread(target=fetch, daemon=True).start()
+        self.run_task(lambda: list(self._manager().get_existing_videos_from_playlist(pid)),
+                      key=("playlist_videos", pid), group="playlist_videos",
+                      label=f"videos de {pid}", on_done=self._show_videos_window)
 
     def _show_videos_window(self, videos: list[str]):
         win = tk.Toplevel(self.root)
@@ -560,17 +662,12 @@ class App:
                    command=win.destroy).pack(pady=5)
 
     def refresh_playlists(self):
-        def worker():
-            mgr = YouTubeManager(
-                self.token_file.get(),
-                ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                log_queue=self.log_queue
-            )
-            pls = mgr.list_playlists()
-            self.root.after(0, lambda:
-                            self._insert_playlists(pls))
-
-        threading.Thread(target=worker, daemon=True).start()
+        # Varios clics seguidos comparten una sola llamada
+        self.run_task(lambda: self._manager().list_playlists(),
+                      key=("list_playlists",), label="playlists",
+                      on_done=self._insert_playlists,
+                      on_error=lambda e: messagebox.showerror(
+                          "Error", f"No se pudieron listar las playlists: {e}"))
 
     def _insert_playlists(self, playlists: list[dict]):
         self.playlist_listbox.delete(0, tk.END)
@@ -621,13 +718,7 @@ class App:
                                        "Ponle un título a la playlist.")
                 return
 
-            def worker():
-                mgr = YouTubeManager(
-                    self.token_file.get(),
-                    ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                    log_queue=self.log_queue
-                )
-                pid = mgr.create_playlist(t, d, p)
+            def done(pid):
                 if pid:
                     self.playlist_id.set(pid)
                     messagebox.showinfo("Éxito",
@@ -638,7 +729,9 @@ class App:
                     messagebox.showerror("Error",
                                          "No se pudo crear la playlist.")
 
-            threading.Thread(target=worker, daemon=True).start()
+            self.run_task(lambda: self._manager().create_playlist(t, d, p),
+                          key=("create_playlist", t, d, p),
+                          label=f"crear '{t}'", on_done=done)
 
         ttk.Button(win, text="Crear Playlist",
                    command=create)\
@@ -686,13 +779,7 @@ class App:
                                        "El título es obligatorio.")
                 return
 
-            def worker():
-                mgr = YouTubeManager(
-                    self.token_file.get(),
-                    ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                    log_queue=self.log_queue
-                )
-                resp = mgr.update_playlist(pid, t, d, p)
+            def done(resp):
                 if resp:
                     messagebox.showinfo("Éxito",
                                         f"Playlist {pid} actualizada.")
@@ -702,7 +789,9 @@ class App:
                     messagebox.showerror("Error",
                                          "No se pudo actualizar la playlist.")
 
-            threading.Thread(target=worker, daemon=True).start()
+            self.run_task(lambda: self._manager().update_playlist(pid, t, d, p),
+                          key=("update_playlist", pid, t, d, p),
+                          label=f"actualizar {pid}", on_done=done)
 
         ttk.Button(win, text="Actualizar Playlist",
                    command=update)\
@@ -721,18 +810,15 @@ class App:
                                    "¿Estás seguro de eliminar esta playlist?"):
             return
 
-        def worker():
-            mgr = YouTubeManager(
-                self.token_file.get(),
-                ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                log_queue=self.log_queue
-            )
-            mgr.delete_playlist(pid)
+        def done(_):
             messagebox.showinfo("Éxito", f"Playlist {pid} eliminada.")
             self.playlist_id.set("")
             self.refresh_playlists()
 
-        threading.Thread(target=worker, daemon=True).start()
+        self.run_task(lambda: self._manager().delete_playlist(pid),
+                      key=("delete_playlist", pid), label=f"borrar {pid}", on_done=done,
+                      on_error=lambda e: messagebox.showerror(
+                          "Error", f"No se pudo eliminar la playlist: {e}"))
 
     # ------------------ VACIAR PLAYLIST -------------------------------
     def empty_playlist_action(self):
@@ -746,16 +832,12 @@ class App:
                                    "(eliminar todos sus videos)?"):
             return
 
-        def worker():
-            mgr = YouTubeManager(
-                self.token_file.get(),
-                ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                log_queue=self.log_queue
-            )
-            mgr.empty_playlist(pid)
-            messagebox.showinfo("Éxito", f"Playlist {pid} vaciada.")
-
-        threading.Thread(target=worker, daemon=True).start()
+        self.run_task(lambda: self._manager().empty_playlist(pid),
+                      key=("empty_playlist", pid), label=f"vaciar {pid}",
+                      on_done=lambda removed: messagebox.showinfo(
+                          "Éxito", f"Playlist {pid} vaciada ({removed} videos)."),
+                      on_error=lambda e: messagebox.showerror(
+                          "Error", f"No se pudo vaciar la playlist: {e}"))
 
     # ------ ELIMINAR VIDEOS POR DURACIÓN (con ayuda integrada) -------
     def remove_videos_by_duration_action(self):
@@ -815,22 +897,25 @@ class App:
 
             self.update_status("Eliminando videos por duración...")
 
-            def worker():
-                mgr = YouTubeManager(
-                    self.token_file.get(),
-                    ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                    log_queue=self.log_queue
-                )
-                removed = mgr.remove_videos_by_duration(
-                    pid, min_sec, max_sec)
-                messagebox.showinfo(
-                    "Éxito",
-                    f"Eliminados {removed} videos de la playlist."
-                )
+            def done(result):
+                if result["failed"]:
+                    messagebox.showwarning(
+                        "Atención",
+                        f"Eliminados {result['removed']} videos; "
+                        f"{result['failed']} no se pudieron borrar (ver log)."
+                    )
+                else:
+                    messagebox.showinfo(
+                        "Éxito",
+                        f"Eliminados {result['removed']} videos de la playlist."
+                    )
                 self.refresh_playlists()
                 win.destroy()
 
-            threading.Thread(target=worker, daemon=True).start()
+            self.run_task(
+                lambda: self._manager().remove_videos_by_duration(pid, min_sec, max_sec),
+                key=("remove_videos_by_duration", pid, min_sec, max_sec),
+                label=f"limpiar {pid}", on_done=done)
 
         ttk.Button(win, text="Eliminar Videos", command=delete)\
             .grid(row=4, column=0, columnspan=2, pady=10)
@@ -849,9 +934,9 @@ class App:
             return
         try:
             YouTubeManager.update_token_pickle(
-                self.token_file.get(), path,
-                ["https://www.googleapis.com/auth/youtube.force-ssl"]
+                self.token_file.get(), path, self.SCOPES
             )
+            invalidate_session(self.token_file.get())
             messagebox.showinfo("Éxito", "Token actualizado correctamente.")
         except Exception as e:
             messagebox.showerror("Error",
@@ -871,6 +956,7 @@ class App:
         retry_var = tk.IntVar(value=self.config["retry_delay"])
         batch_var = tk.IntVar(value=self.config["batch_size"])
         excl_var  = tk.StringVar(value=self.config["filter_exclude_keywords"])
+        incl_var  = tk.StringVar(value=self.config["filter_include_keywords"])
         mind_var  = tk.IntVar(value=self.config["filter_min_duration"] // 60)
         maxd_var  = tk.IntVar(value=self.config["filter_max_duration"] // 60)
         au_var    = tk.IntVar(value=self.config["auto_update_interval"])
@@ -878,61 +964,88 @@ class App:
         add_row("Tiempo de reintento (seg):", retry_var, 0)
         add_row("Videos por lote:",            batch_var, 1)
         add_row("Excluir Palabras (coma):",    excl_var,  2)
-        add_row("Duración mínima (min):",      mind_var,  3)
-        add_row("Duración máxima (min):",      maxd_var,  4)
+        add_row("Incluir Palabras (coma):",    incl_var,  3)
+
+        word_var = tk.BooleanVar(value=self.config["filter_whole_word"])
+        ttk.Checkbutton(win, text="Solo palabras completas", variable=word_var)\
+            .grid(row=4, column=0, columnspan=2, padx=5, sticky="w")
+        accent_var = tk.BooleanVar(value=self.config["filter_accent_insensitive"])
+        ttk.Checkbutton(win, text="Ignorar acentos", variable=accent_var)\
+            .grid(row=5, column=0, columnspan=2, padx=5, sticky="w")
+
+        add_row("Duración mínima (min):",      mind_var,  6)
+        add_row("Duración máxima (min):",      maxd_var,  7)
 
         # Tip de ejemplo
         ttk.Label(
             win,
             text="Ejemplo: 1-20 = entre 1 y 20 min (0 = sin límite).",
             foreground="#555"
-        ).grid(row=5, column=0, columnspan=2, padx=5, sticky="w")
+        ).grid(row=8, column=0, columnspan=2, padx=5, sticky="w")
+
+        add_row("Auto actualización (min):",   au_var,    9)
 
-        add_row("Auto actualización (min):",   au_var,    6)
+        resync_var = tk.BooleanVar(value=self.config["full_resync"])
+        ttk.Checkbutton(
+            win, text="Resincronizar canales completos en la próxima ejecución",
+            variable=resync_var
+        ).grid(row=10, column=0, columnspan=2, padx=5, sticky="w")
 
         def save():
             self.config["retry_delay"]            = retry_var.get()
             self.config["batch_size"]             = batch_var.get()
             self.config["filter_exclude_keywords"]= excl_var.get()
+            self.config["filter_include_keywords"]= incl_var.get()
+            self.config["filter_whole_word"]      = word_var.get()
+            self.config["filter_accent_insensitive"] = accent_var.get()
             self.config["filter_min_duration"]    = mind_var.get() * 60
             self.config["filter_max_duration"]    = maxd_var.get() * 60
             self.config["auto_update_interval"]   = au_var.get()
+            self.config["full_resync"]            = resync_var.get()
             self.logger.info("Configuración actualizada.")
             win.destroy()
-            if self.config["auto_update_interval"] > 0:
-                self.start_auto_update()
+            # Guardar con intervalo 0 apaga lo programado, también lo restaurado
+            self._sync_schedule(clear=True)
 
         ttk.Button(win, text="Guardar", command=save)\
-            .grid(row=7, column=0, columnspan=2, pady=10)
+            .grid(row=11, column=0, columnspan=2, pady=10)
         win.grid_columnconfigure(0, weight=1)
         win.grid_columnconfigure(1, weight=1)
 
-    def start_auto_update(self):
-        def worker():
-            self.logger.info("Actualización automática iniciada.")
-            while self.config["auto_update_interval"] > 0:
-                time.sleep(self.config["auto_update_interval"] * 60)
-                if self.batch_channels and self.playlist_id.get().strip():
-                    self.process_batch_action()
-
-        threading.Thread(target=worker, daemon=True).start()
+    def show_schedule_stats(self):
+        st = self.scheduler.stats()
+        nxt = st["next_run_in_seconds"]
+        messagebox.showinfo("Programación", "\n".join([
+            f"Canales programados: {st['entries']}",
+            f"En curso: {', '.join(st['running']) or 'ninguno'}",
+            f"En curso en otro proceso: {', '.join(st['leased_elsewhere']) or 'ninguno'}",
+            f"En cola: {st['queued']} (retraso {st['queue_lag_seconds']}s)",
+            f"Próxima ejecución: {'—' if nxt is None else f'en {nxt / 60:.1f} min'}",
+            f"Ejecuciones: {st['runs']} ({st['failed_runs']} con error), "
+            f"{st['coalesced']} agrupadas",
+            f"Retraso último/máximo: {st['last_lag']}s / {st['max_lag']}s",
+        ]))
+
+    def show_tasks(self):
+        snap = self.tasks.snapshot()
+        lines = [f"En curso ({len(snap['running'])}/{snap['workers']}):"]
+        lines += [f"  • {label} ({secs}s)" for label, secs in snap["running"]] or ["  —"]
+        lines.append(f"En cola ({len(snap['queued'])}):")
+        lines += [f"  • {label} (espera {secs}s)" for label, secs in snap["queued"]] or ["  —"]
+        lines.append(f"Completadas: {snap['done']}, con error: {snap['failed']}, "
+                     f"agrupadas: {snap['coalesced']}, descartadas: {snap['cancelled']}")
+        messagebox.showinfo("Tareas", "\n".join(lines))
 
     # ------------------------------------------------------------------ #
     # 10. RECOMENDACIONES, LOG, AYUDA
     # ------------------------------------------------------------------ #
     def recommendations_action(self):
-        def worker():
-            mgr = YouTubeManager(
-                self.token_file.get(),
-                ["https://www.googleapis.com/auth/youtube.force-ssl"],
-                log_queue=self.log_queue
-            )
-            trending = mgr.get_trending_videos(
-                regionCode='US', maxResults=10)
-            self.root.after(0,
-                            lambda: self._show_recommendations(trending))
-
-        threading.Thread(target=worker, daemon=True).start()
+        self.run_task(
+            lambda: self._manager().get_trending_videos(regionCode='US', maxResults=10),
+            key=("get_trending_videos", "US", 10), label="recomendaciones",
+            on_done=self._show_recommendations,
+            on_error=lambda e: messagebox.showerror(
+                "Error", f"No se pudieron cargar las recomendaciones: {e}"))
 
     def _show_recommendations(self, items: list[dict]):
         win = tk.Toplevel(self.root)
@@ -950,24 +1063,15 @@ class App:
         ttk.Button(win, text="Cerrar", command=win.destroy)\
             .pack(pady=5)
 
+    def log_index(self) -> LogIndex:
+        """Índice de líneas del log (se carga del sidecar la primera vez)."""
+        if self._log_index is None:
+            self._log_index = LogIndex(self.LOG_FILE)
+        return self._log_index
+
     def view_log_history(self):
-        try:
-            with open("ytube.log", "r", encoding="utf-8",
-                      errors="replace") as f:
-                content = f.read()
-        except Exception as e:
-            messagebox.showerror("Error",
-                                 f"No se pudo leer el log: {e}")
-            return
-        win = tk.Toplevel(self.root)
-        win.title("Historial de Log")
-        win.geometry("600x400")
-        txt = scrolledtext.ScrolledText(win, wrap="word")
-        txt.insert(tk.END, content)
-        txt.configure(state='disabled')
-        txt.pack(padx=10, pady=10, fill="both", expand=True)
-        ttk.Button(win, text="Cerrar",
-                   command=win.destroy).pack(pady=5)
+        # Solo se dibujan las líneas visibles; el índice se extiende con lo nuevo
+        LogViewer(self.root, self.log_index(), self.run_task)
 
     def export_log(self):
         path = filedialog.asksaveasfilename(
@@ -976,16 +1080,17 @@ class App:
         )
         if not path:
             return
-        try:
-            with open("ytube.log", "r", encoding="utf-8",
-                      errors="replace") as src, \
-                 open(path, "w", encoding="utf-8",
-                      errors="replace") as dst:
-                dst.write(src.read())
-            messagebox.showinfo("Éxito", f"Log exportado a {path}")
-        except Exception as e:
-            messagebox.showerror("Error",
-                                 f"No se pudo exportar el log: {e}")
+
+        def export():
+            # Copia de a bloques: el log puede pesar cientos de MB
+            with open(self.LOG_FILE, "rb") as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+
+        self.run_task(export, key=("export_log", path), label="exportar log",
+                      on_done=lambda _: messagebox.showinfo(
+                          "Éxito", f"Log exportado a {path}"),
+                      on_error=lambda e: messagebox.showerror(
+                          "Error", f"No se pudo exportar el log: {e}"))
 
     def open_help_window(self):
         help_text = (
@@ -0,0 +1,215 @@
+"""
+executor.py – Ejecutor de tareas en segundo plano para la GUI.
+
+Reemplaza el `threading.Thread(...).start()` por botón:
+
+* pool acotado: `max_workers` hilos daemon y una cola visible de a lo sumo
+  `max_queue` tareas (snapshot() / on_change para mostrarla).
+* single-flight: pedir otra vez lo mismo (misma clave, por defecto
+  función + argumentos) mientras sigue en cola o corriendo no lanza otra
+  llamada; se suma a la existente y recibe el mismo resultado.
+* grupos: una tarea nueva de un grupo ("channel_details", "search"...)
+  cancela las anteriores del mismo grupo; si estaban en cola no llegan a
+  correr y si ya corrían su resultado se descarta.
+
+Los callbacks on_done/on_error se entregan con `dispatch` (en la GUI,
+root.after), o sea en el hilo de Tk.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class QueueFull(RuntimeError):
+    """La cola de tareas llegó a su tope."""
+
+
+class Task:
+    """Una tarea enviada al ejecutor."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, fn, args, kwargs, key, group, label):
+        self.id = next(self._ids)
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.key = key
+        self.group = group
+        self.label = label
+        self.state = QUEUED
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.joined = 0              # pedidos iguales que se sumaron a esta
+        self._callbacks = []         # [(on_done, on_error)]
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Para tareas largas: consultarlo como cancel_callback."""
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+
+class TaskExecutor:
+    """Pool de hilos acotado con cola visible, single-flight y grupos."""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64, dispatch=None,
+                 on_change=None, logger=None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._dispatch = dispatch or (lambda fn: fn())
+        self._on_change = on_change
+        self.logger = logger or logging.getLogger("YouTubeManager")
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._by_key = {}            # clave → tarea en cola o corriendo
+        self._by_group = {}          # grupo → última tarea del grupo
+        self._running = set()
+        self._workers = []
+        self._closed = False
+        self._counters = {"submitted": 0, "coalesced": 0, "cancelled": 0,
+                          "failed": 0, "done": 0}
+
+    # ------------------------------------------------------------------ #
+    def submit(self, fn, *args, key=None, group: str = None, label: str = None,
+               on_done=None, on_error=None, **kwargs) -> Task:
+        """
+        Encola fn(*args, **kwargs). Si ya hay una tarea viva con la misma
+        clave, devuelve esa y le agrega los callbacks. Lanza QueueFull si
+        la cola está llena.
+        """
+        if key is None:
+            key = (getattr(fn, "__qualname__", repr(fn)), args,
+                   tuple(sorted(kwargs.items())))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("El ejecutor está cerrado.")
+            task = self._by_key.get(key)
+            if task is not None and not task.cancelled:
+                task.joined += 1
+                task._callbacks.append((on_done, on_error))
+                self._counters["coalesced"] += 1
+                return task
+            if len(self._queue) >= self.max_queue:
+                raise QueueFull(f"Cola de tareas llena ({self.max_queue}).")
+            if group is not None:
+                stale = self._by_group.get(group)
+                if stale is not None and stale.state in (QUEUED, RUNNING):
+                    self._cancel_locked(stale)
+            task = Task(fn, args, kwargs, key, group, label or key[0])
+            task._callbacks.append((on_done, on_error))
+            self._by_key[key] = task
+            if group is not None:
+                self._by_group[group] = task
+            self._queue.append(task)
+            self._counters["submitted"] += 1
+            self._ensure_workers()
+            self._cond.notify()
+        self._changed()
+        return task
+
+    def cancel_group(self, group: str):
+        """Cancela la tarea viva del grupo (p. ej. al cerrar una ventana)."""
+        with self._cond:
+            task = self._by_group.get(group)
+            if task is not None and task.state in (QUEUED, RUNNING):
+                self._cancel_locked(task)
+        self._changed()
+
+    def shutdown(self):
+        """Descarta la cola; las tareas en curso terminan solas."""
+        with self._cond:
+            self._closed = True
+            for task in list(self._queue):
+                self._cancel_locked(task)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------ #
+    def snapshot(self) -> dict:
+        """Tareas en curso y en cola, más contadores, para mostrar en la GUI."""
+        now = time.time()
+        with self._cond:
+            return {
+                "running": [(t.label, round(now - t.started_at, 1)) for t in self._running],
+                "queued": [(t.label, round(now - t.submitted_at, 1)) for t in self._queue],
+                "workers": self.max_workers,
+                **self._counters,
+            }
+
+    # ------------------------------------------------------------------ #
+    def _cancel_locked(self, task: Task):
+        task.cancel()
+        self._counters["cancelled"] += 1
+        if task.state == QUEUED:
+            self._queue.remove(task)
+            task.state = CANCELLED
+        self._forget_locked(task)
+
+    def _forget_locked(self, task: Task):
+        if self._by_key.get(task.key) is task:
+            del self._by_key[task.key]
+        if task.group is not None and self._by_group.get(task.group) is task:
+            del self._by_group[task.group]
+
+    def _ensure_workers(self):
+        self._workers = [w for w in self._workers if w.is_alive()]
+        busy = len(self._running) + len(self._queue)
+        while len(self._workers) < min(self.max_workers, busy):
+            w = threading.Thread(target=self._work, name=f"gui-task-{len(self._workers)}",
+                                 daemon=True)
+            self._workers.append(w)
+            w.start()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    # Un hilo ocioso se retira solo tras un rato sin trabajo
+                    if not self._cond.wait(timeout=30) and not self._queue:
+                        self._workers.remove(threading.current_thread())
+                        return
+                if self._closed and not self._queue:
+                    return
+                task = self._queue.popleft()
+                task.state = RUNNING
+                task.started_at = time.time()
+                self._running.add(task)
+            self._changed()
+            self._run(task)
+
+    def _run(self, task: Task):
+        result = error = None
+        try:
+            result = task.fn(*task.args, **task.kwargs)
+        except Exception as e:
+            error = e
+        with self._cond:
+            self._running.discard(task)
+            self._forget_locked(task)
+            if task.cancelled:
+                task.state = CANCELLED
+            else:
+                task.state = FAILED if error else DONE
+                self._counters["failed" if error else "done"] += 1
+            callbacks = list(task._callbacks)
+        self._changed()
+        if task.cancelled:
+            # Resultado de una selección vieja: no se muestra
+            return
+        if error is not None and not any(on_error for _, on_error in callbacks):
+            self.logger.error(f"Tarea {task.label} falló: {error}")
+        for on_done, on_error in callbacks:
+            if error is None and on_done:
+                self._dispatch(lambda cb=on_done: cb(result))
+            elif error is not None and on_error:
+                self._dispatch(lambda cb=on_error: cb(error))
+
+    def _changed(self):
+        if self._on_change:
+            self._dispatch(self._on_change)
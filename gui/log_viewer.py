@@ -0,0 +1,188 @@
+"""
+log_viewer.py – Ventana de historial del log, paginada sobre LogIndex.
+
+El Text solo contiene las líneas que entran en pantalla; la barra de
+desplazamiento recorre la vista filtrada (números de línea del índice)
+y cada movimiento vuelve a dibujar esa ventana. Filtrar y exportar
+corren en el ejecutor de tareas de la app.
+"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+from datetime import datetime
+from tkinter import ttk, messagebox, filedialog
+
+from log_index import LEVELS
+
+
+class LogViewer:
+    """Historial de log con filtros por nivel, palabra y rango de hora."""
+
+    TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+    def __init__(self, root, index, run_task):
+        self.index = index
+        self.run_task = run_task
+        self.view = range(0)
+        self.pos = 0
+
+        self.win = tk.Toplevel(root)
+        self.win.title("Historial de Log")
+        self.win.geometry("800x500")
+
+        bar = ttk.Frame(self.win, padding=5)
+        bar.pack(fill="x")
+        self.level_var = tk.StringVar(value="Todos")
+        self.keyword_var = tk.StringVar()
+        self.since_var = tk.StringVar()
+        self.until_var = tk.StringVar()
+        ttk.Label(bar, text="Nivel:").pack(side="left")
+        ttk.Combobox(bar, textvariable=self.level_var, state="readonly", width=9,
+                     values=["Todos", *[lv for lv in LEVELS if lv != "DEBUG"]])\
+            .pack(side="left", padx=(2, 8))
+        ttk.Label(bar, text="Palabra:").pack(side="left")
+        kw = ttk.Entry(bar, textvariable=self.keyword_var, width=16)
+        kw.pack(side="left", padx=(2, 8))
+        kw.bind("<Return>", lambda e: self.apply_filters())
+        ttk.Label(bar, text="Desde:").pack(side="left")
+        ttk.Entry(bar, textvariable=self.since_var, width=16).pack(side="left", padx=(2, 8))
+        ttk.Label(bar, text="Hasta:").pack(side="left")
+        ttk.Entry(bar, textvariable=self.until_var, width=16).pack(side="left", padx=(2, 8))
+        ttk.Button(bar, text="Filtrar", command=self.apply_filters).pack(side="left")
+        ttk.Label(self.win, text="Horas en formato AAAA-MM-DD HH:MM (vacío = sin límite).",
+                  foreground="#555").pack(anchor="w", padx=5)
+
+        body = ttk.Frame(self.win, padding=5)
+        body.pack(fill="both", expand=True)
+        body.grid_rowconfigure(0, weight=1)
+        body.grid_columnconfigure(0, weight=1)
+        self.text = tk.Text(body, wrap="none", state="disabled")
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.vbar = ttk.Scrollbar(body, orient="vertical", command=self._on_scroll)
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        hbar = ttk.Scrollbar(body, orient="horizontal", command=self.text.xview)
+        hbar.grid(row=1, column=0, sticky="ew")
+        self.text.configure(xscrollcommand=hbar.set)
+        self._linespace = tkfont.Font(font=self.text["font"]).metrics("linespace")
+
+        for seq, delta in (("<Button-4>", -3), ("<Button-5>", 3), ("<Up>", -1),
+                           ("<Down>", 1)):
+            self.text.bind(seq, lambda e, d=delta: self._scroll_by(d))
+        self.text.bind("<MouseWheel>",
+                       lambda e: self._scroll_by(-3 if e.delta > 0 else 3))
+        self.text.bind("<Prior>", lambda e: self._scroll_by(-self._rows()))
+        self.text.bind("<Next>", lambda e: self._scroll_by(self._rows()))
+        self.text.bind("<Home>", lambda e: self._goto(0))
+        self.text.bind("<End>", lambda e: self._goto(len(self.view)))
+        self.text.bind("<Configure>", lambda e: self._render())
+
+        foot = ttk.Frame(self.win, padding=5)
+        foot.pack(fill="x")
+        self.status_var = tk.StringVar(value="Indexando log...")
+        ttk.Label(foot, textvariable=self.status_var).pack(side="left")
+        ttk.Button(foot, text="Cerrar", command=self.win.destroy).pack(side="right")
+        ttk.Button(foot, text="Exportar vista", command=self.export_view)\
+            .pack(side="right", padx=5)
+
+        self.apply_filters()
+
+    # ------------------------------------------------------------------ #
+    def _filters(self) -> dict:
+        def parse(var, label):
+            value = var.get().strip()
+            if not value:
+                return None
+            try:
+                return datetime.strptime(value, self.TIME_FORMAT)
+            except ValueError:
+                raise ValueError(f"{label} inválida: {value!r}")
+
+        level = self.level_var.get()
+        return {
+            "min_level": None if level == "Todos" else level,
+            "keyword": self.keyword_var.get().strip() or None,
+            "since": parse(self.since_var, "Hora desde"),
+            "until": parse(self.until_var, "Hora hasta"),
+        }
+
+    def apply_filters(self):
+        """Incorpora lo nuevo del log y recalcula la vista (en segundo plano)."""
+        try:
+            filters = self._filters()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e), parent=self.win)
+            return
+        self.status_var.set("Filtrando...")
+
+        def select():
+            self.index.refresh()
+            return self.index.select(**filters)
+
+        # Filtrar de nuevo descarta el filtrado anterior si no terminó
+        self.run_task(select, key=("log_select", *sorted(filters.items(), key=str)),
+                      group=f"log_view-{id(self)}", label="historial de log",
+                      on_done=self._set_view)
+
+    def _set_view(self, view):
+        if not self.win.winfo_exists():
+            return
+        self.view = view
+        self.pos = max(0, len(view) - self._rows())   # empieza por lo más nuevo
+        self._render()
+
+    # ------------------------------------------------------------------ #
+    def _rows(self) -> int:
+        return max(1, self.text.winfo_height() // self._linespace)
+
+    def _goto(self, pos: int):
+        self.pos = max(0, min(pos, len(self.view) - self._rows()))
+        self._render()
+        return "break"
+
+    def _scroll_by(self, delta: int):
+        return self._goto(self.pos + delta)
+
+    def _on_scroll(self, action, value, unit=None):
+        if action == "moveto":
+            self._goto(int(float(value) * len(self.view)))
+        elif action == "scroll":
+            step = self._rows() if unit == "pages" else 1
+            self._goto(self.pos + int(value) * step)
+
+    def _render(self):
+        total, rows = len(self.view), self._rows()
+        self.pos = max(0, min(self.pos, total - rows))
+        lines = self.index.lines(self.view[self.pos:self.pos + rows]) if total else []
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.config(state="disabled")
+        if total:
+            self.vbar.set(self.pos / total, min(1.0, (self.pos + rows) / total))
+            self.status_var.set(f"Líneas {self.pos + 1}–{self.pos + len(lines)} de {total}")
+        else:
+            self.vbar.set(0, 1)
+            self.status_var.set("Sin líneas para estos filtros.")
+
+    # ------------------------------------------------------------------ #
+    def export_view(self):
+        """Guarda las líneas de la vista filtrada, de a bloques."""
+        path = filedialog.asksaveasfilename(
+            parent=self.win, defaultextension=".log",
+            filetypes=[("Log Files", "*.log"), ("All Files", "*.*")]
+        )
+        if not path:
+            return
+        view = self.view
+
+        def export():
+            with open(path, "wb") as dst:
+                # Sin filtros la vista es un range: se copia el archivo de corrido
+                self.index.export(dst, None if isinstance(view, range) else view)
+            return len(view)
+
+        self.run_task(export, key=("log_export_view", path), label="exportar vista",
+                      on_done=lambda n: messagebox.showinfo(
+                          "Éxito", f"{n} líneas exportadas a {path}"),
+                      on_error=lambda e: messagebox.showerror(
+                          "Error", f"No se pudo exportar: {e}"))
@@ -0,0 +1,265 @@
+"""
+journal.py – Diario de trabajos de inserción (write-ahead, en SQLite).
+
+Cada trabajo guarda la playlist destino, los canales, los filtros usados
+y el conjunto planificado de videos. Antes de mandar un lote, sus videos
+se marcan `inflight`; al volver la respuesta queda el resultado de cada
+uno. Si la app se cierra a mitad de camino, la próxima ejecución con los
+mismos parámetros retoma solo lo pendiente, sin volver a leer el canal.
+
+Los fallos permanentes de un video (PERMANENT_FAILURES) se guardan aparte,
+por playlist, y sobreviven al purge de los trabajos: los trabajos
+siguientes no vuelven a planificar ese video.
+"""
+
+import json
+import time
+import uuid
+
+from storage import SQLiteStore
+
+# Estados de cada video dentro de un trabajo
+PENDING, INFLIGHT, ADDED, SKIPPED, FAILED = "pending", "inflight", "added", "skipped", "failed"
+
+# Fallos propios del video: reintentarlo en otro trabajo daría lo mismo
+PERMANENT_FAILURES = ("videoNotFound", "invalidValue")
+
+
+class JobJournal(SQLiteStore):
+    """Trabajos y el estado de cada video planificado."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id       TEXT PRIMARY KEY,
+        kind         TEXT NOT NULL,
+        signature    TEXT NOT NULL,
+        playlist_id  TEXT NOT NULL,
+        channel_ids  TEXT NOT NULL,
+        filters      TEXT NOT NULL,
+        status       TEXT NOT NULL,
+        planned      INTEGER NOT NULL DEFAULT 0,
+        created_at   REAL NOT NULL,
+        updated_at   REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_signature ON jobs (signature, status);
+    CREATE TABLE IF NOT EXISTS job_videos (
+        job_id     TEXT NOT NULL,
+        seq        INTEGER NOT NULL,
+        video_id   TEXT NOT NULL,
+        channel_id TEXT,
+        state      TEXT NOT NULL,
+        reason     TEXT,
+        PRIMARY KEY (job_id, video_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_job_videos_state ON job_videos (job_id, state, seq);
+    CREATE TABLE IF NOT EXISTS failed_videos (
+        playlist_id TEXT NOT NULL,
+        video_id    TEXT NOT NULL,
+        reason      TEXT NOT NULL,
+        failed_at   REAL NOT NULL,
+        PRIMARY KEY (playlist_id, video_id)
+    );
+    """
+
+    @staticmethod
+    def signature(kind: str, channel_ids, playlist_id: str, filters) -> str:
+        """Identidad de un trabajo: mismos parámetros = mismo trabajo."""
+        return json.dumps([kind, sorted(channel_ids), playlist_id, filters or {}],
+                          sort_keys=True, ensure_ascii=False)
+
+    def create(self, kind: str, channel_ids, playlist_id: str, filters=None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, signature, playlist_id, channel_ids, "
+                "filters, status, planned, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 'running', 0, ?, ?)",
+                (job_id, kind, self.signature(kind, channel_ids, playlist_id, filters),
+                 playlist_id, json.dumps(list(channel_ids)),
+                 json.dumps(filters or {}, ensure_ascii=False), now, now)
+            )
+        return job_id
+
+    def find_open(self, kind: str, channel_ids, playlist_id: str, filters=None) -> str | None:
+        """El trabajo sin terminar más reciente con estos parámetros."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE signature = ? AND status = 'running' "
+                "ORDER BY created_at DESC LIMIT 1",
+                (self.signature(kind, channel_ids, playlist_id, filters),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, kind, playlist_id, channel_ids, filters, status, planned, "
+                "created_at, updated_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT state, COUNT(*) FROM job_videos WHERE job_id = ? GROUP BY state",
+                (job_id,)
+            ).fetchall())
+        jid, kind, pid, cids, filters, status, planned, created, updated = row
+        return {
+            "job_id": jid,
+            "kind": kind,
+            "playlist_id": pid,
+            "channel_ids": json.loads(cids),
+            "filters": json.loads(filters),
+            "status": status,
+            "planned": bool(planned),
+            "created_at": created,
+            "updated_at": updated,
+            "counts": counts,
+        }
+
+    def list_jobs(self, status: str = None) -> list:
+        """Trabajos (más nuevos primero) con el conteo de videos por estado."""
+        with self._lock:
+            q = "SELECT job_id FROM jobs"
+            args = ()
+            if status:
+                q += " WHERE status = ?"
+                args = (status,)
+            ids = [r[0] for r in self._conn.execute(q + " ORDER BY created_at DESC", args)]
+        return [self.get(j) for j in ids]
+
+    def add_planned(self, job_id: str, video_ids, channel_id: str = None):
+        """Agrega videos al plan (los ya presentes no se tocan)."""
+        with self._lock, self._conn:
+            (seq,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM job_videos WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO job_videos (job_id, seq, video_id, channel_id, state) "
+                "VALUES (?, ?, ?, ?, 'pending')",
+                [(job_id, seq + i, vid, channel_id) for i, vid in enumerate(video_ids)]
+            )
+            self._touch(job_id)
+
+    def permanent_failures(self, playlist_id: str) -> dict:
+        """{videoId: reason} de los videos con fallo permanente en la playlist."""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT video_id, reason FROM failed_videos WHERE playlist_id = ?",
+                (playlist_id,)
+            ))
+
+    def mark_planned(self, job_id: str):
+        """El plan quedó completo: reanudar ya no necesita leer nada."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET planned = 1 WHERE job_id = ?", (job_id,))
+            self._touch(job_id)
+
+    def video_ids(self, job_id: str, *states) -> list:
+        """IDs del trabajo en alguno de los estados dados, en orden de plan."""
+        with self._lock:
+            marks = ",".join("?" * len(states))
+            return [r[0] for r in self._conn.execute(
+                f"SELECT video_id FROM job_videos WHERE job_id = ? AND state IN ({marks}) "
+                "ORDER BY seq", (job_id, *states)
+            )]
+
+    def video_owners(self, job_id: str) -> dict:
+        """{videoId: canal} del plan del trabajo."""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT video_id, channel_id FROM job_videos WHERE job_id = ?", (job_id,)))
+
+    def mark_inflight(self, job_id: str, video_ids):
+        """Se escribe antes de mandar el lote (write-ahead)."""
+        self._set_state(job_id, [(INFLIGHT, None, v) for v in video_ids])
+
+    def record(self, job_id: str, result: dict):
+        """Resultado de un lote en el formato {"added", "skipped", "failed"}."""
+        rows = [(ADDED, None, v) for v in result.get("added", [])]
+        rows += [(SKIPPED, s["reason"], s["videoId"]) for s in result.get("skipped", [])
+                 if s["reason"] not in ("quota_deferred", "cancelled")]
+        # Diferidos y cancelados siguen pendientes para la próxima ejecución
+        rows += [(PENDING, None, s["videoId"]) for s in result.get("skipped", [])
+                 if s["reason"] in ("quota_deferred", "cancelled")]
+        rows += [(FAILED, f["reason"], f["videoId"]) for f in result.get("failed", [])]
+        self._set_state(job_id, rows)
+        self._remember_failures(job_id, result)
+
+    def _remember_failures(self, job_id: str, result: dict):
+        """Anota los fallos permanentes y olvida los de videos que ya entraron."""
+        failed = [(f["videoId"], f["reason"]) for f in result.get("failed", [])
+                  if f["reason"] in PERMANENT_FAILURES]
+        added = result.get("added", [])
+        if not (failed or added):
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            (playlist_id,) = self._conn.execute(
+                "SELECT playlist_id FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO failed_videos (playlist_id, video_id, reason, "
+                "failed_at) VALUES (?, ?, ?, ?)",
+                [(playlist_id, vid, reason, now) for vid, reason in failed]
+            )
+            self._conn.executemany(
+                "DELETE FROM failed_videos WHERE playlist_id = ? AND video_id = ?",
+                [(playlist_id, vid) for vid in added]
+            )
+
+    def reset_pending(self, job_id: str, video_ids):
+        self._set_state(job_id, [(PENDING, None, v) for v in video_ids])
+
+    def _set_state(self, job_id: str, rows: list):
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE job_videos SET state = ?, reason = ? "
+                "WHERE job_id = ? AND video_id = ?",
+                [(state, reason, job_id, vid) for state, reason, vid in rows]
+            )
+            self._touch(job_id)
+
+    def finish(self, job_id: str) -> str:
+        """
+        Cierra el trabajo si ya no le queda nada: 'completed'. Si quedan
+        pendientes sigue 'running' y se retoma en la próxima ejecución.
+        """
+        with self._lock, self._conn:
+            planned, left = self._conn.execute(
+                "SELECT planned, (SELECT COUNT(*) FROM job_videos WHERE job_id = ? "
+                "AND state IN ('pending', 'inflight')) FROM jobs WHERE job_id = ?",
+                (job_id, job_id)
+            ).fetchone()
+            status = "completed" if planned and not left else "running"
+            self._conn.execute("UPDATE jobs SET status = ? WHERE job_id = ?", (status, job_id))
+            self._touch(job_id)
+        return status
+
+    def abandon(self, job_id: str):
+        """Deja de considerar el trabajo para reanudar (p. ej. resync completo)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'abandoned' WHERE job_id = ?", (job_id,))
+            self._touch(job_id)
+
+    def purge(self, older_than_days: float = 0, include_abandoned: bool = True) -> int:
+        """Borra los trabajos terminados; devuelve cuántos se borraron."""
+        statuses = ("completed", "abandoned") if include_abandoned else ("completed",)
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock, self._conn:
+            marks = ",".join("?" * len(statuses))
+            ids = [r[0] for r in self._conn.execute(
+                f"SELECT job_id FROM jobs WHERE status IN ({marks}) AND updated_at <= ?",
+                (*statuses, cutoff)
+            )]
+            self._conn.executemany("DELETE FROM job_videos WHERE job_id = ?",
+                                   [(j,) for j in ids])
+            self._conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(j,) for j in ids])
+        return len(ids)
+
+    def _touch(self, job_id: str):
+        self._conn.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?",
+                           (time.time(), job_id))
@@ -0,0 +1,162 @@
+"""
+keywords.py – Búsqueda de muchas palabras clave a la vez.
+
+KeywordMatcher compila la lista una sola vez en una regex con forma de
+trie (las palabras con prefijo común comparten rama), así cada texto se
+recorre una vez sin importar cuántas palabras haya. En modo palabra
+completa, si todas las claves son palabras sueltas, basta con partir el
+texto en palabras y buscarlas en un set. El texto y las palabras se
+normalizan igual: casefold de Unicode y, opcionalmente, sin acentos
+("canción" == "cancion").
+
+    python keywords.py   # micro-benchmark contra el filtro anterior
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+_WORD = re.compile(r"\w+")
+
+
+def parse_keywords(text: str) -> list:
+    """Lista de palabras desde el formato de la config ("a, b, c")."""
+    return [kw.strip() for kw in (text or "").split(",") if kw.strip()]
+
+
+def _strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text)
+                   if not unicodedata.combining(c))
+
+
+def _trie_pattern(words) -> str:
+    """Regex equivalente a word1|word2|... agrupando prefijos comunes."""
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node) -> str:
+        end = "" in node
+        alts = [re.escape(ch) + render(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class KeywordMatcher:
+    """
+    Conjunto de palabras clave compilado.
+    whole_word: solo coincide con palabras completas ("art" no toca "party").
+    accent_insensitive: ignora tildes y diacríticos.
+    """
+
+    def __init__(self, keywords, whole_word: bool = False,
+                 accent_insensitive: bool = False):
+        self.whole_word = whole_word
+        self.accent_insensitive = accent_insensitive
+        self._original = {}
+        for kw in keywords:
+            norm = self.normalize(kw.strip())
+            if norm:
+                self._original.setdefault(norm, kw.strip())
+        self.keywords = list(self._original.values())
+        self._regex = None
+        self._words = None
+        if whole_word and self._original and all(
+                _WORD.fullmatch(k) for k in self._original):
+            self._words = frozenset(self._original)
+        if self._original:
+            pattern = _trie_pattern(self._original)
+            if whole_word:
+                pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+            self._regex = re.compile(pattern)
+
+    @classmethod
+    def compile(cls, keywords, whole_word: bool = False,
+                accent_insensitive: bool = False) -> "KeywordMatcher":
+        """Matcher para `keywords`; reutiliza el ya compilado si es el mismo."""
+        if isinstance(keywords, cls):
+            return keywords
+        return _compiled(tuple(keywords or ()), whole_word, accent_insensitive)
+
+    def normalize(self, text: str) -> str:
+        if self.accent_insensitive:
+            text = _strip_accents(text)
+        return text.casefold()
+
+    def __bool__(self) -> bool:
+        return self._regex is not None
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find(self, *texts: str) -> str | None:
+        """Primera palabra clave encontrada en alguno de los textos (o None)."""
+        if self._regex is None:
+            return None
+        for text in texts:
+            if not text:
+                continue
+            norm = self.normalize(text)
+            if self._words is not None:
+                for token in _WORD.findall(norm):
+                    if token in self._words:
+                        return self._original[token]
+                continue
+            m = self._regex.search(norm)
+            if m:
+                return self._original.get(m.group(0), m.group(0))
+        return None
+
+    def search(self, *texts: str) -> bool:
+        """True si alguna palabra clave aparece en alguno de los textos."""
+        return self.find(*texts) is not None
+
+
+@lru_cache(maxsize=64)
+def _compiled(keywords: tuple, whole_word: bool, accent_insensitive: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, whole_word, accent_insensitive)
+
+
+if __name__ == "__main__":
+    import random
+    import string
+    import time
+
+    rnd = random.Random(0)
+
+    def word(n):
+        return "".join(rnd.choice(string.ascii_lowercase) for _ in range(n))
+
+    keywords = [word(rnd.randint(4, 10)) for _ in range(250)]
+    videos = [(" ".join(word(rnd.randint(2, 9)) for _ in range(8)).title(),
+               " ".join(word(rnd.randint(2, 9)) for _ in range(600)))
+              for _ in range(500)]
+
+    t0 = time.perf_counter()
+    naive = [any(kw.lower() in title.lower() or kw.lower() in desc.lower()
+                 for kw in keywords) for title, desc in videos]
+    t_naive = time.perf_counter() - t0
+
+    print(f"{len(keywords)} palabras x {len(videos)} videos "
+          f"(~{len(videos[0][1]) // 1000} KB de descripción)")
+    print(f"  {'filtro anterior:':32} {t_naive * 1000:8.1f} ms")
+    for label, whole in (("subcadena", False), ("palabra completa", True)):
+        t0 = time.perf_counter()
+        matcher = KeywordMatcher(keywords, whole_word=whole)
+        t_compile = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fast = [matcher.search(title, desc) for title, desc in videos]
+        t_fast = time.perf_counter() - t0
+        if not whole:
+            assert naive == fast
+        print(f"  KeywordMatcher {label + ':':17} {t_fast * 1000:8.1f} ms "
+              f"(+{t_compile * 1000:.1f} ms compilación, {t_naive / t_fast:.1f}x)")
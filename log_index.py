@@ -0,0 +1,289 @@
+"""
+log_index.py – Índice de líneas de ytube.log para leerlo por ventanas.
+
+El log se abre con mmap y se guarda, por cada línea completa, su offset
+en bytes junto con la hora y el nivel del registro al que pertenece (las
+líneas de un traceback heredan los del registro que las abrió). El índice
+vive en un archivo al lado (`ytube.log.idx`) y solo se extiende con lo
+que se agregó desde la última vez; si el log se truncó o se reemplazó,
+se reconstruye.
+
+Con el índice, mostrar una ventana de N líneas cuesta N lecturas, y
+filtrar por nivel u hora no toca el archivo. La búsqueda por palabra
+recorre el mmap con una regex de bytes, sin decodificar el log entero.
+
+    python log_index.py ytube.log   # construye/actualiza y mide
+"""
+
+import bisect
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from array import array
+from datetime import datetime
+
+LEVELS = {"DEBUG": 1, "INFO": 2, "WARNING": 3, "ERROR": 4, "CRITICAL": 5}
+
+# Mismo formato que logger.setup_logging: '%(asctime)s [%(levelname)s] %(message)s'
+_RECORD = re.compile(rb"(\d{4}-\d\d-\d\d \d\d:\d\d):(\d\d),\d+ \[([A-Z]+)\]")
+
+_MAGIC = b"YTMLIDX1"
+_HEADER = struct.Struct("<8sQQQQ")   # magic, bytes indexados, líneas, largo y crc de la cabeza
+_HEAD_BYTES = 4096
+_CHUNK = 8 << 20
+
+
+def _case_insensitive(keyword: str) -> re.Pattern:
+    """Regex de bytes (UTF-8) que ignora mayúsculas, también fuera de ASCII."""
+    parts = []
+    for ch in keyword:
+        lo, up = ch.lower().encode(), ch.upper().encode()
+        parts.append(re.escape(lo) if lo == up
+                     else b"(?:" + re.escape(lo) + b"|" + re.escape(up) + b")")
+    return re.compile(b"".join(parts))
+
+
+class LogIndex:
+    """
+    Índice persistente de offsets de línea de un archivo de log.
+    Llamar refresh() antes de leer para incorporar lo nuevo.
+    """
+
+    def __init__(self, path: str, index_path: str = None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._lock = threading.RLock()
+        self._offsets = array("Q")
+        self._meta = array("Q")      # (epoch << 8) | nivel
+        self._size = 0               # bytes indexados (hasta el último '\n')
+        self._head = (0, 0)          # (largo, crc32) de la cabeza del log
+        self._mm = None
+        self._file = None
+        self._minute_cache = {}
+        self._load()
+
+    # ------------------------------------------------------------------ #
+    # Persistencia
+    # ------------------------------------------------------------------ #
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size, count, head_len, head_crc = _HEADER.unpack(
+                    f.read(_HEADER.size))
+                if magic != _MAGIC:
+                    return
+                pairs = array("Q")
+                pairs.frombytes(f.read(count * 16))
+        except (OSError, struct.error, ValueError):
+            return
+        if len(pairs) != count * 2:
+            return
+        self._offsets, self._meta = pairs[0::2], pairs[1::2]
+        self._size, self._head = size, (head_len, head_crc)
+
+    def _save(self, first_new: int):
+        """Agrega los registros nuevos al sidecar y después actualiza la cabecera."""
+        if not os.path.exists(self.index_path):
+            first_new = 0
+        count = len(self._offsets)
+        rewrite = first_new == 0
+        pairs = array("Q", bytes(16 * (count - first_new)))
+        pairs[0::2] = self._offsets[first_new:]
+        pairs[1::2] = self._meta[first_new:]
+        header = _HEADER.pack(_MAGIC, self._size, count, *self._head)
+        try:
+            with open(self.index_path, "wb" if rewrite else "r+b") as f:
+                if rewrite:
+                    f.write(header)
+                f.seek(_HEADER.size + 16 * first_new)
+                f.write(pairs.tobytes())
+                f.truncate()
+                f.seek(0)
+                f.write(header)
+        except OSError:
+            # Sin sidecar se sigue funcionando; solo se reindexa la próxima vez
+            pass
+
+    # ------------------------------------------------------------------ #
+    # Construcción incremental
+    # ------------------------------------------------------------------ #
+    def refresh(self) -> int:
+        """Indexa lo agregado al log desde la última vez; devuelve las líneas nuevas."""
+        with self._lock:
+            self._unmap()
+            try:
+                file_size = os.path.getsize(self.path)
+            except OSError:
+                file_size = 0
+            if file_size == 0:
+                self._reset()
+                return 0
+            self._file = open(self.path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            head_len, head_crc = self._head
+            if (file_size < self._size
+                    or zlib.crc32(self._mm[:head_len]) != head_crc):
+                # Log truncado o reemplazado
+                self._reset()
+            first_new = len(self._offsets)
+            self._scan(file_size)
+            if self._head[0] < _HEAD_BYTES and self._size > self._head[0]:
+                # La cabeza de referencia crece hasta _HEAD_BYTES con el log
+                n = min(self._size, _HEAD_BYTES)
+                self._head = (n, zlib.crc32(self._mm[:n]))
+            if len(self._offsets) > first_new or first_new == 0:
+                self._save(first_new)
+            return len(self._offsets) - first_new
+
+    def _reset(self):
+        self._offsets, self._meta = array("Q"), array("Q")
+        self._size, self._head = 0, (0, 0)
+
+    def _scan(self, file_size: int):
+        mm, pos = self._mm, self._size
+        meta = self._meta[-1] if self._meta else 0
+        offsets_append, meta_append = self._offsets.append, self._meta.append
+        while pos < file_size:
+            end = mm.rfind(b"\n", pos, min(pos + _CHUNK, file_size))
+            if end < 0:
+                if pos + _CHUNK < file_size:
+                    # Línea más larga que el bloque: buscar su fin hacia adelante
+                    end = mm.find(b"\n", pos, file_size)
+                if end < 0:
+                    break            # última línea sin terminar: se indexa después
+            for line in mm[pos:end].split(b"\n"):
+                m = _RECORD.match(line)
+                if m:
+                    meta = (self._epoch(m.group(1), m.group(2)) << 8) | LEVELS.get(
+                        m.group(3).decode("ascii"), 0)
+                offsets_append(pos)
+                meta_append(meta)
+                pos += len(line) + 1
+        self._size = pos
+
+    def _epoch(self, minute: bytes, second: bytes) -> int:
+        base = self._minute_cache.get(minute)
+        if base is None:
+            if len(self._minute_cache) > 4096:
+                self._minute_cache.clear()
+            base = int(datetime.strptime(minute.decode("ascii"), "%Y-%m-%d %H:%M").timestamp())
+            self._minute_cache[minute] = base
+        return base + int(second)
+
+    def _unmap(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = self._file = None
+
+    def close(self):
+        with self._lock:
+            self._unmap()
+
+    # ------------------------------------------------------------------ #
+    # Lectura
+    # ------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _span(self, n: int) -> tuple[int, int]:
+        start = self._offsets[n]
+        end = self._offsets[n + 1] if n + 1 < len(self._offsets) else self._size
+        return start, end
+
+    def lines(self, numbers) -> list:
+        """Texto de las líneas pedidas (números de línea del índice)."""
+        with self._lock:
+            if self._mm is None:
+                return []
+            out, count = [], len(self._offsets)
+            for n in numbers:
+                if n >= count:
+                    break            # vista vieja de un log que se truncó
+                start, end = self._span(n)
+                out.append(self._mm[start:end].rstrip(b"\r\n").decode("utf-8", "replace"))
+            return out
+
+    def select(self, min_level: str = None, keyword: str = None,
+               since: datetime = None, until: datetime = None):
+        """
+        Números de línea que cumplen los filtros (todos opcionales):
+        nivel mínimo, palabra (sin distinguir mayúsculas) y rango de hora.
+        Sin filtros devuelve un range, sin materializar nada.
+        """
+        with self._lock:
+            count = len(self._offsets)
+            if not (min_level or keyword or since or until):
+                return range(count)
+            lo_level = LEVELS.get(min_level, 0) if min_level else 0
+            t_from = int(since.timestamp()) if since else 0
+            t_to = int(until.timestamp()) if until else None
+            candidates = self._keyword_lines(keyword) if keyword else range(count)
+            meta = self._meta
+            keep = array("I")
+            for n in candidates:
+                m = meta[n]
+                if (m & 0xFF) < lo_level:
+                    continue
+                t = m >> 8
+                if t < t_from or (t_to is not None and t > t_to):
+                    continue
+                keep.append(n)
+            return keep
+
+    def _keyword_lines(self, keyword: str) -> array:
+        found = array("I")
+        if self._mm is None:
+            return found
+        regex, offsets, pos = _case_insensitive(keyword), self._offsets, 0
+        while True:
+            m = regex.search(self._mm, pos, self._size)
+            if m is None:
+                return found
+            n = bisect.bisect_right(offsets, m.start()) - 1
+            found.append(n)
+            pos = self._span(n)[1]     # siguiente línea: una coincidencia por línea
+
+    def export(self, dst, numbers=None, chunk_size: int = 1 << 20):
+        """
+        Copia al archivo binario `dst` el log completo o solo `numbers`,
+        de a bloques de `chunk_size` bytes.
+        """
+        with self._lock:
+            if self._mm is None:
+                return
+            if numbers is None:
+                for pos in range(0, self._size, chunk_size):
+                    dst.write(self._mm[pos:min(pos + chunk_size, self._size)])
+                return
+            buf = bytearray()
+            for n in numbers:
+                start, end = self._span(n)
+                buf += self._mm[start:end]
+                if len(buf) >= chunk_size:
+                    dst.write(buf)
+                    buf.clear()
+            dst.write(buf)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "ytube.log"
+    t0 = time.perf_counter()
+    idx = LogIndex(path)
+    t_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = idx.refresh()
+    t_refresh = time.perf_counter() - t0
+    print(f"{path}: {len(idx)} líneas ({new} nuevas) — carga {t_load * 1000:.1f} ms, "
+          f"refresh {t_refresh * 1000:.1f} ms")
+    for label, kw in (("ERROR+", {"min_level": "ERROR"}), ("'error'", {"keyword": "error"})):
+        t0 = time.perf_counter()
+        n = len(idx.select(**kw))
+        print(f"  {label:8} {n:8} líneas en {(time.perf_counter() - t0) * 1000:.1f} ms")
@@ -0,0 +1,103 @@
+"""
+pipeline.py – Pipeline productor/consumidor por etapas.
+
+Cada etapa corre en su propio hilo y se conecta con la siguiente mediante
+una cola acotada: si una etapa se atrasa, las anteriores se bloquean
+(backpressure). Cancelar o un error en cualquier etapa detiene todas.
+"""
+
+import queue
+import threading
+
+_DONE = object()
+
+
+class Pipeline:
+    """
+    source: iterable que produce los items iniciales.
+    stages: funciones gen(iterable) -> iterable, en orden.
+    Iterar el pipeline devuelve lo que produce la última etapa.
+    """
+
+    def __init__(self, source, *stages, maxsize: int = 64, cancel_callback=None):
+        self.source = source
+        self.stages = stages
+        self.maxsize = maxsize
+        self.cancel_callback = cancel_callback
+        self._cancel = threading.Event()
+        self._errors = []
+        self._threads = []
+
+    def cancel(self):
+        self._cancel.set()
+
+    def cancelled(self) -> bool:
+        if not self._cancel.is_set() and self.cancel_callback and self.cancel_callback():
+            self._cancel.set()
+        return self._cancel.is_set()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Encola esperando lugar; False si se canceló mientras esperaba."""
+        while not self.cancelled():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _drain(self, q: queue.Queue):
+        """Itera una cola hasta el fin de la etapa anterior o la cancelación."""
+        while not self.cancelled():
+            try:
+                item = q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def _run_stage(self, produce, out_q: queue.Queue):
+        try:
+            for item in produce():
+                if not self._put(out_q, item):
+                    break
+        except BaseException as e:
+            self._errors.append(e)
+            self._cancel.set()
+        finally:
+            # El marcador de fin siempre se entrega; si se canceló, se hace
+            # lugar descartando items que ya nadie va a procesar
+            while True:
+                try:
+                    out_q.put(_DONE, timeout=0.1)
+                    break
+                except queue.Full:
+                    if self.cancelled():
+                        try:
+                            out_q.get_nowait()
+                        except queue.Empty:
+                            pass
+
+    def __iter__(self):
+        in_q = queue.Queue(self.maxsize)
+        self._start(lambda: iter(self.source), in_q)
+        for stage in self.stages:
+            out_q = queue.Queue(self.maxsize)
+            self._start(lambda stage=stage, q=in_q: stage(self._drain(q)), out_q)
+            in_q = out_q
+        try:
+            yield from self._drain(in_q)
+        finally:
+            # Detiene lo que siga vivo: etapas previas a una que terminó antes
+            # de consumir todo, o todas si el consumidor cortó
+            self._cancel.set()
+            for t in self._threads:
+                t.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def _start(self, produce, out_q):
+        t = threading.Thread(target=self._run_stage, args=(produce, out_q), daemon=True)
+        self._threads.append(t)
+        t.start()
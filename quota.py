@@ -0,0 +1,126 @@
+"""
+quota.py – Contabilidad de cuota de la YouTube Data API.
+
+Cada llamada se cobra según su método (search=100, insert=50, list=1...)
+en un registro diario persistido. El día de cuota de Google se reinicia a
+medianoche del Pacífico.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from storage import SQLiteStore
+
+try:
+    from zoneinfo import ZoneInfo
+    PACIFIC = ZoneInfo("America/Los_Angeles")
+except Exception:  # sin base de zonas horarias (p. ej. Windows sin tzdata)
+    PACIFIC = timezone(timedelta(hours=-8))
+
+# Unidades por método (sin el prefijo "youtube.")
+COSTS = {
+    "search.list": 100,
+    "playlistItems.insert": 50,
+    "playlistItems.update": 50,
+    "playlistItems.delete": 50,
+    "playlists.insert": 50,
+    "playlists.update": 50,
+    "playlists.delete": 50,
+    "channels.list": 1,
+    "playlists.list": 1,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+}
+DEFAULT_COST = 1
+DAILY_LIMIT = 10000
+
+
+class QuotaExhausted(Exception):
+    """No queda cuota suficiente hoy para la llamada pedida."""
+
+
+def method_cost(method_id: str) -> int:
+    return COSTS.get(method_id.removeprefix("youtube."), DEFAULT_COST)
+
+
+def quota_day(now: datetime = None) -> str:
+    """Día de cuota actual (fecha en hora del Pacífico)."""
+    return (now or datetime.now(timezone.utc)).astimezone(PACIFIC).strftime("%Y-%m-%d")
+
+
+class QuotaLedger(SQLiteStore):
+    """Unidades y llamadas por día y método."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS quota_ledger (
+        day    TEXT NOT NULL,
+        method TEXT NOT NULL,
+        units  INTEGER NOT NULL,
+        calls  INTEGER NOT NULL,
+        PRIMARY KEY (day, method)
+    );
+    """
+
+    def add(self, day: str, method: str, units: int, calls: int = 1):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO quota_ledger (day, method, units, calls) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(day, method) DO UPDATE SET "
+                "units = units + excluded.units, calls = calls + excluded.calls",
+                (day, method, units, calls)
+            )
+
+    def used(self, day: str) -> int:
+        with self._lock:
+            (units,) = self._conn.execute(
+                "SELECT COALESCE(SUM(units), 0) FROM quota_ledger WHERE day = ?", (day,)
+            ).fetchone()
+        return units
+
+    def breakdown(self, day: str) -> dict:
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT method, units, calls FROM quota_ledger WHERE day = ?", (day,))
+            return {m: {"units": u, "calls": c} for m, u, c in cur}
+
+
+class QuotaMeter:
+    """Cobra cada llamada en el ledger y bloquea las que ya no caben hoy."""
+
+    def __init__(self, ledger: QuotaLedger, daily_limit: int = DAILY_LIMIT):
+        self.ledger = ledger
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+
+    def used(self) -> int:
+        return self.ledger.used(quota_day())
+
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.used())
+
+    def charge(self, method_id: str, count: int = 1) -> int:
+        """Cobra `count` llamadas al método; QuotaExhausted si no caben."""
+        units = method_cost(method_id) * count
+        with self._lock:
+            if units > self.remaining():
+                raise QuotaExhausted(
+                    f"{method_id} necesita {units} unidades; quedan {self.remaining()}.")
+            self.ledger.add(quota_day(), method_id.removeprefix("youtube."), units, count)
+        return units
+
+    def mark_exhausted(self):
+        """La API respondió quotaExceeded: se da por gastado el resto del día."""
+        with self._lock:
+            left = self.remaining()
+            if left:
+                self.ledger.add(quota_day(), "quotaExceeded", left, 0)
+
+    def report(self) -> dict:
+        day = quota_day()
+        return {
+            "day": day,
+            "used": self.ledger.used(day),
+            "limit": self.daily_limit,
+            "remaining": self.remaining(),
+            "by_method": self.ledger.breakdown(day),
+        }
@@ -0,0 +1,154 @@
+"""
+rate_limit.py – Limitador de ritmo adaptativo para la API de YouTube.
+
+Un token bucket por tipo de endpoint (list / insert / delete / search).
+Mientras las respuestas son sanas el ritmo sube poco a poco; ante
+403 rateLimitExceeded, 429 o 5xx se reduce a la mitad y el bucket se
+pausa un tiempo creciente.
+"""
+
+import json
+import threading
+import time
+
+from googleapiclient.errors import HttpError
+
+THROTTLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+def error_status_reason(exc) -> tuple:
+    """(status HTTP, reason de la API) de un HttpError; (None, '') si no lo es."""
+    if not isinstance(exc, HttpError):
+        return None, ""
+    status = getattr(exc.resp, "status", None)
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        status = None
+    reason = ""
+    try:
+        data = json.loads(exc.content.decode("utf-8"))
+        errors = data.get("error", {}).get("errors", [])
+        if errors:
+            reason = errors[0].get("reason", "")
+    except Exception:
+        pass
+    return status, reason
+
+
+def is_throttle_error(exc) -> bool:
+    """True si el error indica que hay que bajar el ritmo."""
+    status, reason = error_status_reason(exc)
+    if status is None:
+        return False
+    return status == 429 or status >= 500 or reason in THROTTLE_REASONS
+
+
+def request_kind(request) -> str:
+    """Clase de endpoint de una petición: list, insert, delete o search."""
+    return method_kind(getattr(request, "methodId", "") or "")
+
+
+def method_kind(method: str) -> str:
+    """Clase de endpoint de un methodId ("youtube.playlistItems.insert"...)."""
+    resource, _, verb = method.rpartition(".")
+    if resource.endswith("search"):
+        return "search"
+    if verb in ("insert", "update"):
+        return "insert"
+    if verb == "delete":
+        return "delete"
+    return "list"
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: int, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+
+    def reserve(self) -> float:
+        """Toma un token (puede quedar en deuda) y devuelve cuánto esperar."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+
+class AdaptiveRateLimiter:
+    """Token buckets por tipo de endpoint, compartidos por todos los managers."""
+
+    # peticiones/seg iniciales, ráfaga y límites del ajuste adaptativo
+    DEFAULT_BUDGETS = {
+        "list":   {"rate": 5.0, "burst": 10, "min_rate": 0.5, "max_rate": 20.0},
+        "insert": {"rate": 1.0, "burst": 3,  "min_rate": 0.1, "max_rate": 5.0},
+        "delete": {"rate": 2.0, "burst": 5,  "min_rate": 0.2, "max_rate": 10.0},
+        "search": {"rate": 0.5, "burst": 2,  "min_rate": 0.1, "max_rate": 2.0},
+    }
+
+    def __init__(self, budgets: dict = None, increase: float = 1.05,
+                 decrease: float = 0.5, base_cooldown: float = 2.0,
+                 max_cooldown: float = 120.0):
+        self.increase = increase
+        self.decrease = decrease
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._buckets = {}
+        for kind, cfg in self.DEFAULT_BUDGETS.items():
+            self._buckets[kind] = _Bucket(**dict(cfg, **(budgets or {}).get(kind, {})))
+
+    def configure(self, kind: str, **budget):
+        """Cambia rate/burst/min_rate/max_rate de un tipo de endpoint."""
+        with self._lock:
+            b = self._buckets[kind]
+            for k, v in budget.items():
+                setattr(b, k, v)
+
+    def reserve(self, kind: str) -> float:
+        """Toma cupo sin bloquear; devuelve los segundos a esperar antes de usarlo."""
+        with self._lock:
+            return self._buckets[kind].reserve()
+
+    def acquire(self, kind: str):
+        """Bloquea hasta que haya cupo para una petición del tipo dado."""
+        wait = self.reserve(kind)
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self, kind: str):
+        with self._lock:
+            b = self._buckets[kind]
+            b.strikes = 0
+            b.rate = min(b.max_rate, b.rate * self.increase)
+
+    def on_throttle(self, kind: str, retry_after: float = None) -> float:
+        """Baja el ritmo y pausa el bucket; devuelve la pausa aplicada."""
+        with self._lock:
+            b = self._buckets[kind]
+            b.strikes += 1
+            b.rate = max(b.min_rate, b.rate * self.decrease)
+            pause = retry_after if retry_after is not None else min(
+                self.max_cooldown, self.base_cooldown * 2 ** (b.strikes - 1))
+            b.blocked_until = max(b.blocked_until, time.monotonic() + pause)
+            return pause
+
+    def snapshot(self) -> dict:
+        """Ritmo actual (peticiones/seg) por tipo de endpoint."""
+        with self._lock:
+            return {k: round(b.rate, 3) for k, b in self._buckets.items()}
+
+
+_shared_limiter = AdaptiveRateLimiter()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Limitador único del proceso."""
+    return _shared_limiter
@@ -0,0 +1,83 @@
+"""
+retry.py – Política de reintentos para las llamadas a la API.
+
+Los errores se clasifican por su `reason`: los transitorios se reintentan
+con backoff exponencial + jitter hasta un plazo máximo por operación; los
+permanentes (videoNotFound, forbidden, playlist llena...) fallan al
+primer intento.
+"""
+
+import random
+import time
+
+import httplib2
+
+from rate_limit import error_status_reason
+
+RETRYABLE_REASONS = {
+    "rateLimitExceeded", "userRateLimitExceeded", "backendError",
+    "internalError", "serviceUnavailable", "SERVICE_UNAVAILABLE",
+    # inserts concurrentes en la misma playlist (p. ej. dentro de un lote)
+    "ABORTED", "aborted", "conflict",
+}
+
+PERMANENT_REASONS = {
+    "videoNotFound", "forbidden", "playlistContainsMaximumNumberOfVideos",
+    "quotaExceeded", "dailyLimitExceeded", "playlistNotFound", "notFound",
+    "playlistItemNotFound", "channelNotFound", "invalidValue",
+    "manualSortRequired", "playlistOperationUnsupported", "insufficientPermissions",
+}
+
+
+def classify_error(exc) -> tuple:
+    """(reintentable, reason) de una excepción de la API o de red."""
+    status, reason = error_status_reason(exc)
+    if status is None:
+        # Sin respuesta HTTP: timeouts y errores de conexión son transitorios
+        if isinstance(exc, (OSError, httplib2.HttpLib2Error)):
+            return True, type(exc).__name__
+        return False, type(exc).__name__
+    if reason in PERMANENT_REASONS:
+        return False, reason
+    if reason in RETRYABLE_REASONS or status == 429 or status >= 500:
+        return True, reason or f"http_{status}"
+    return False, reason or f"http_{status}"
+
+
+class RetryPolicy:
+    """Backoff exponencial con jitter completo y plazo por operación."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 5,
+                 max_delay: float = 60, deadline: float = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def delay(self, attempt: int) -> float:
+        """Espera antes del intento `attempt + 1`."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def call(self, fn, on_retry=None, deadline: float = None):
+        """
+        Ejecuta fn() reintentando los errores transitorios.
+        on_retry(intento, reason, espera) se llama antes de cada espera.
+        """
+        deadline = deadline if deadline is not None else self.deadline
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                retryable, reason = classify_error(e)
+                if not retryable or attempt >= self.max_attempts:
+                    raise
+                wait = self.delay(attempt)
+                if deadline is not None and time.monotonic() - start + wait > deadline:
+                    raise
+                if on_retry:
+                    on_retry(attempt, reason, wait)
+                time.sleep(wait)
+                attempt += 1
@@ -0,0 +1,365 @@
+"""
+scheduler.py – Ejecuciones periódicas de batch sin solapamiento.
+
+Cada entrada es (canal, playlist) con su propio intervalo y las opciones
+del batch (filtros, tamaño de lote...) con las que se programó. El hilo del
+scheduler despierta en la próxima hora de ejecución, junta los canales
+vencidos de una misma playlist y lanza un único batch por playlist:
+
+* single-flight: nunca corren dos batches sobre la misma playlist; lo que
+  vence mientras tanto espera a que termine el actual. Entre procesos (la
+  GUI y `cli.py daemon` sobre el mismo `ytmanager.db`) lo garantiza un
+  lease por playlist en SQLite, que se renueva mientras el batch corre.
+* coalescencia: si se perdieron varias ejecuciones (app cerrada, batch
+  largo) se corre una sola vez y se reprograma desde ahora.
+* jitter: cada próxima ejecución se corre ±`jitter` del intervalo para que
+  los canales no venzan todos en el mismo segundo.
+
+Las entradas son de un dueño (`owner`: "gui", "daemon"): cada programador
+solo ve y reemplaza las suyas. Las horas de próxima ejecución quedan en
+SQLite, así un reinicio no reinicia los relojes.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+
+from storage import SQLiteStore
+
+
+class ScheduleStore(SQLiteStore):
+    """Entradas programadas por dueño, su próxima ejecución y los leases."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS schedule_entries (
+        owner       TEXT NOT NULL,
+        channel_id  TEXT NOT NULL,
+        playlist_id TEXT NOT NULL,
+        interval_s  REAL NOT NULL,
+        options     TEXT NOT NULL,
+        next_run    REAL NOT NULL,
+        last_run    REAL,
+        last_status TEXT,
+        runs        INTEGER NOT NULL DEFAULT 0,
+        coalesced   INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (owner, channel_id, playlist_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_schedule_entries_next
+        ON schedule_entries (owner, next_run);
+    CREATE TABLE IF NOT EXISTS schedule_leases (
+        playlist_id TEXT PRIMARY KEY,
+        holder      TEXT NOT NULL,
+        expires_at  REAL NOT NULL
+    );
+    """
+
+    def entries(self, owner: str) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel_id, playlist_id, interval_s, options, next_run, last_run, "
+                "last_status, runs, coalesced FROM schedule_entries WHERE owner = ? "
+                "ORDER BY next_run", (owner,)
+            ).fetchall()
+        keys = ("channel_id", "playlist_id", "interval_s", "options", "next_run",
+                "last_run", "last_status", "runs", "coalesced")
+        out = [dict(zip(keys, r)) for r in rows]
+        for e in out:
+            e["options"] = json.loads(e["options"])
+        return out
+
+    def replace(self, owner: str, wanted: dict, first_run, playlists=None):
+        """
+        Deja exactamente las entradas de `wanted` {(canal, playlist):
+        (seg, opciones)} entre las del dueño (solo las de `playlists`, si
+        se da). Las que ya existían con el mismo intervalo conservan su
+        próxima ejecución; las nuevas o cambiadas vencen en
+        `first_run(intervalo)`.
+        """
+        with self._lock, self._conn:
+            current = {(c, p): (i, n) for c, p, i, n in self._conn.execute(
+                "SELECT channel_id, playlist_id, interval_s, next_run "
+                "FROM schedule_entries WHERE owner = ?", (owner,))}
+            gone = [(owner, c, p) for c, p in current if (c, p) not in wanted
+                    and (playlists is None or p in playlists)]
+            self._conn.executemany(
+                "DELETE FROM schedule_entries "
+                "WHERE owner = ? AND channel_id = ? AND playlist_id = ?", gone)
+            for (cid, pid), (interval, options) in wanted.items():
+                options = json.dumps(options or {}, sort_keys=True, ensure_ascii=False)
+                old = current.get((cid, pid))
+                if old and old[0] == interval:
+                    self._conn.execute(
+                        "UPDATE schedule_entries SET options = ? "
+                        "WHERE owner = ? AND channel_id = ? AND playlist_id = ?",
+                        (options, owner, cid, pid))
+                    continue
+                next_run = first_run(interval)
+                if old:
+                    # Se acortó el intervalo: no esperar más que el nuevo
+                    next_run = min(old[1], next_run)
+                self._conn.execute(
+                    "INSERT INTO schedule_entries (owner, channel_id, playlist_id, "
+                    "interval_s, options, next_run) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (owner, channel_id, playlist_id) "
+                    "DO UPDATE SET interval_s = excluded.interval_s, "
+                    "options = excluded.options, next_run = excluded.next_run",
+                    (owner, cid, pid, interval, options, next_run)
+                )
+
+    def reschedule(self, owner: str, rows: list):
+        """rows: [(next_run, last_run, missed, canal, playlist)]."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE schedule_entries SET next_run = ?, last_run = ?, runs = runs + 1, "
+                "coalesced = coalesced + ? "
+                "WHERE owner = ? AND channel_id = ? AND playlist_id = ?",
+                [(nxt, last, missed, owner, cid, pid) for nxt, last, missed, cid, pid in rows]
+            )
+
+    def set_status(self, owner: str, playlist_id: str, channel_ids, status: str):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE schedule_entries SET last_status = ? "
+                "WHERE owner = ? AND channel_id = ? AND playlist_id = ?",
+                [(status, owner, cid, playlist_id) for cid in channel_ids]
+            )
+
+    # ---------------------- leases entre procesos ---------------------- #
+    def acquire_lease(self, playlist_id: str, holder: str, ttl: float, now: float) -> bool:
+        """Toma la playlist si está libre, vencida o ya es de `holder`."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO schedule_leases (playlist_id, holder, expires_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (playlist_id) DO UPDATE SET "
+                "holder = excluded.holder, expires_at = excluded.expires_at "
+                "WHERE schedule_leases.expires_at <= ? "
+                "OR schedule_leases.holder = excluded.holder",
+                (playlist_id, holder, now + ttl, now)
+            )
+            (owner,) = self._conn.execute(
+                "SELECT holder FROM schedule_leases WHERE playlist_id = ?", (playlist_id,)
+            ).fetchone()
+        return owner == holder
+
+    def renew_leases(self, playlist_ids, holder: str, ttl: float, now: float):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE schedule_leases SET expires_at = ? "
+                "WHERE playlist_id = ? AND holder = ?",
+                [(now + ttl, pid, holder) for pid in playlist_ids]
+            )
+
+    def release_lease(self, playlist_id: str, holder: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM schedule_leases WHERE playlist_id = ? AND holder = ?",
+                (playlist_id, holder))
+
+
+class Scheduler:
+    """
+    Corre `run(playlist_id, channel_ids, options)` para los canales
+    vencidos. Cada batch corre en su propio hilo daemon (a lo sumo uno por
+    playlist, también entre procesos); si la app se cierra a mitad, el
+    diario de trabajos lo retoma.
+    """
+
+    # Tope de espera entre revisiones (seg), por si cambia el reloj
+    MAX_SLEEP = 60
+    # Vida del lease de una playlist; el hilo del scheduler lo renueva en
+    # cada vuelta (como mucho cada MAX_SLEEP) mientras el batch corre
+    LEASE_SECONDS = 5 * MAX_SLEEP
+
+    def __init__(self, run, store: ScheduleStore, owner: str = "gui", jitter: float = 0.1,
+                 logger=None, clock=time.time, seed=None):
+        self._run = run
+        self.store = store
+        self.owner = owner
+        self.holder = f"{owner}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.jitter = jitter
+        self.logger = logger or logging.getLogger("YouTubeManager")
+        self._clock = clock
+        self._rng = random.Random(seed)
+        self._running = {}           # playlist_id → hora de inicio
+        self._leased = {}            # playlist_id → reintento (lease de otro proceso)
+        self._guard = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._metrics = {"runs": 0, "failed_runs": 0, "coalesced": 0,
+                         "busy_waits": 0, "lease_waits": 0,
+                         "last_lag": 0.0, "max_lag": 0.0}
+
+    # ------------------------------------------------------------------ #
+    def set_entries(self, entries, playlists=None):
+        """
+        entries: iterable de (canal, playlist, minutos, opciones). Reemplaza
+        las entradas de este dueño (solo las de `playlists`, si se da);
+        minutos <= 0 quita la entrada. Las opciones se guardan con la
+        entrada y se le pasan a `run`.
+        """
+        wanted = {(cid, pid): (float(minutes) * 60, options)
+                  for cid, pid, minutes, options in entries if minutes and minutes > 0}
+        self.store.replace(self.owner, wanted,
+                           lambda interval: self._next_after(self._clock(), interval),
+                           playlists=playlists)
+        self._wake.set()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+        self.logger.info("Programador iniciado.")
+
+    def stop(self):
+        """Deja de despachar; los batches en curso terminan solos."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def submit(self, playlist_id: str, channel_ids, options: dict = None) -> bool:
+        """
+        Corre ya un batch (p. ej. el botón de la GUI). False si la
+        playlist tiene un batch en curso, en este proceso o en otro. Las
+        entradas programadas de esos canales se reprograman desde ahora.
+        """
+        channel_ids = list(channel_ids)
+        now = self._clock()
+        if not self._claim(playlist_id, now):
+            return False
+        due = [e for e in self.store.entries(self.owner)
+               if e["playlist_id"] == playlist_id and e["channel_id"] in channel_ids]
+        self._reschedule(due, now)
+        self._spawn(playlist_id, channel_ids, options or {})
+        return True
+
+    def is_running(self, playlist_id: str) -> bool:
+        with self._guard:
+            return playlist_id in self._running
+
+    # ------------------------------------------------------------------ #
+    def _next_after(self, now: float, interval: float) -> float:
+        return now + interval * (1 + self._rng.uniform(-self.jitter, self.jitter))
+
+    def _claim(self, playlist_id: str, now: float) -> bool:
+        """Marca la playlist en curso si nadie (ni otro proceso) la tiene."""
+        with self._guard:
+            if playlist_id in self._running:
+                self._metrics["busy_waits"] += 1
+                return False
+            self._running[playlist_id] = now
+        if self.store.acquire_lease(playlist_id, self.holder, self.LEASE_SECONDS, now):
+            self._leased.pop(playlist_id, None)
+            return True
+        with self._guard:
+            self._running.pop(playlist_id, None)
+        # Otro proceso la está procesando: se reintenta más tarde
+        self._leased[playlist_id] = now + self.MAX_SLEEP
+        self._metrics["lease_waits"] += 1
+        return False
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                with self._guard:
+                    running = list(self._running)
+                self.store.renew_leases(running, self.holder, self.LEASE_SECONDS,
+                                        self._clock())
+                self._dispatch_due()
+            except Exception as e:
+                self.logger.error(f"Programador: {e}")
+            self._wake.wait(self._sleep_seconds())
+            self._wake.clear()
+
+    def _dispatch_due(self):
+        now = self._clock()
+        by_playlist = {}
+        for e in self.store.entries(self.owner):
+            if e["next_run"] <= now and self._leased.get(e["playlist_id"], 0) <= now:
+                by_playlist.setdefault(e["playlist_id"], []).append(e)
+        for pid, due in by_playlist.items():
+            # Un batch usa un solo juego de opciones: los canales con otras
+            # opciones quedan vencidos y corren al terminar este
+            options = due[0]["options"]
+            due = [e for e in due if e["options"] == options]
+            if not self._claim(pid, now):
+                # Queda vencido y se corre al terminar el batch actual
+                continue
+            lag = now - min(e["next_run"] for e in due)
+            self._metrics["last_lag"] = lag
+            self._metrics["max_lag"] = max(self._metrics["max_lag"], lag)
+            missed = self._reschedule(due, now)
+            cids = [e["channel_id"] for e in due]
+            self.logger.info(f"Programador: batch de {len(cids)} canal(es) → {pid} "
+                             f"(retraso {lag:.0f}s"
+                             + (f", {missed} ejecución(es) agrupadas" if missed else "") + ").")
+            self._spawn(pid, cids, options)
+
+    def _reschedule(self, due: list, now: float) -> int:
+        """Próxima ejecución desde ahora; las vueltas perdidas no se recuperan."""
+        rows, missed_total = [], 0
+        for e in due:
+            missed = max(0, int((now - e["next_run"]) // e["interval_s"]))
+            missed_total += missed
+            rows.append((self._next_after(now, e["interval_s"]), now, missed,
+                         e["channel_id"], e["playlist_id"]))
+        self.store.reschedule(self.owner, rows)
+        self._metrics["coalesced"] += missed_total
+        return missed_total
+
+    def _spawn(self, playlist_id: str, channel_ids: list, options: dict):
+        threading.Thread(target=self._execute, args=(playlist_id, channel_ids, options),
+                         name=f"batch-{playlist_id}", daemon=True).start()
+
+    def _execute(self, playlist_id: str, channel_ids: list, options: dict):
+        status = "ok"
+        try:
+            self._run(playlist_id, channel_ids, options)
+        except Exception as e:
+            status = f"error: {e}"
+            self._metrics["failed_runs"] += 1
+            self.logger.error(f"Programador: batch de {playlist_id} falló: {e}")
+        finally:
+            self._metrics["runs"] += 1
+            self.store.set_status(self.owner, playlist_id, channel_ids, status)
+            self.store.release_lease(playlist_id, self.holder)
+            with self._guard:
+                self._running.pop(playlist_id, None)
+            # Lo que venció durante el batch se despacha ya
+            self._wake.set()
+
+    def _sleep_seconds(self) -> float:
+        now = self._clock()
+        with self._guard:
+            busy = set(self._running)
+        waits = [max(e["next_run"], self._leased.get(e["playlist_id"], 0)) - now
+                 for e in self.store.entries(self.owner)
+                 if e["playlist_id"] not in busy]
+        return min([self.MAX_SLEEP, *waits]) if waits else self.MAX_SLEEP
+
+    # ------------------------------------------------------------------ #
+    def stats(self) -> dict:
+        """Cola, retraso y contadores para mostrar en la GUI o la CLI."""
+        now = self._clock()
+        entries = self.store.entries(self.owner)
+        with self._guard:
+            running = {pid: round(now - t, 1) for pid, t in self._running.items()}
+        due = [e for e in entries if e["next_run"] <= now]
+        upcoming = [e["next_run"] for e in entries if e["next_run"] > now]
+        return {
+            "entries": len(entries),
+            "running": running,
+            "leased_elsewhere": sorted(p for p, t in self._leased.items() if t > now),
+            "queued": len(due),
+            "queue_lag_seconds": round(max((now - e["next_run"] for e in due), default=0), 1),
+            "next_run_in_seconds": round(min(upcoming) - now, 1) if upcoming else None,
+            **{k: round(v, 1) if isinstance(v, float) else v
+               for k, v in self._metrics.items()},
+        }
@@ -0,0 +1,81 @@
+"""
+session.py – Sesiones YouTubeManager compartidas.
+
+Crear un YouTubeManager implica leer el token, a veces refrescarlo y
+construir el servicio; el registro lo hace una sola vez por
+(token, scopes) y entrega siempre el mismo manager.
+"""
+
+import os
+import threading
+import time
+
+from yt_manager import YouTubeManager
+
+
+class SessionRegistry:
+    """Entrega un YouTubeManager de larga vida por (token_path, scopes)."""
+
+    def __init__(self, refresh_margin: int = 300):
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._build_seconds = {}
+        self._reuses = {}
+
+    @staticmethod
+    def _key(token_path: str, scopes) -> tuple:
+        return os.path.abspath(token_path), tuple(sorted(scopes))
+
+    def get(self, token_path: str, scopes, log_queue=None) -> YouTubeManager:
+        key = self._key(token_path, scopes)
+        with self._lock:
+            mgr = self._sessions.get(key)
+            if mgr is not None:
+                self._reuses[key] += 1
+                return mgr
+            t0 = time.perf_counter()
+            mgr = YouTubeManager(token_path, list(scopes), log_queue=log_queue)
+            self._build_seconds[key] = time.perf_counter() - t0
+            self._reuses[key] = 0
+            self._sessions[key] = mgr
+        mgr.start_auto_refresh(self.refresh_margin)
+        mgr.logger.info(f"Sesión creada en {self._build_seconds[key]:.2f}s "
+                        f"({os.path.basename(token_path)}).")
+        return mgr
+
+    def invalidate(self, token_path: str):
+        """Descarta las sesiones de un token (p. ej. tras cambiarlo)."""
+        path = os.path.abspath(token_path)
+        with self._lock:
+            for key in [k for k in self._sessions if k[0] == path]:
+                self._sessions.pop(key).close()
+                self._build_seconds.pop(key, None)
+                self._reuses.pop(key, None)
+
+    def stats(self) -> dict:
+        """Sesiones activas, reutilizaciones y segundos de construcción ahorrados."""
+        with self._lock:
+            reuses = sum(self._reuses.values())
+            saved = sum(self._build_seconds[k] * n for k, n in self._reuses.items())
+            return {
+                "sessions": len(self._sessions),
+                "reuses": reuses,
+                "saved_seconds": round(saved, 2),
+            }
+
+
+_registry = SessionRegistry()
+
+
+def get_session(token_path: str, scopes, log_queue=None) -> YouTubeManager:
+    """Manager compartido para el token/scopes dados."""
+    return _registry.get(token_path, scopes, log_queue=log_queue)
+
+
+def invalidate_session(token_path: str):
+    _registry.invalidate(token_path)
+
+
+def session_stats() -> dict:
+    return _registry.stats()
@@ -0,0 +1,58 @@
+"""
+settings.py – Configuración compartida por la GUI y la CLI.
+
+Las claves son las mismas en la ventana de Configuración y en el archivo
+JSON de la CLI; las duraciones van en segundos.
+"""
+
+import json
+
+from keywords import parse_keywords
+
+# Permisos OAuth que piden la GUI y la CLI (comparten token.pickle)
+SCOPES = ["https://www.googleapis.com/auth/youtube.force-ssl"]
+
+DEFAULT_CONFIG = {
+    "retry_delay": 5,                 # seg
+    "batch_size": 20,
+    "filter_exclude_keywords": "",
+    "filter_include_keywords": "",    # vacío = no exige ninguna
+    "filter_whole_word": False,
+    "filter_accent_insensitive": False,
+    "filter_min_duration": 0,         # seg (0 = sin mínimo)
+    "filter_max_duration": 0,         # seg (0 = sin máximo)
+    "auto_update_interval": 0,        # min
+    "full_resync": False,             # ignora checkpoints en la próxima ejecución
+}
+
+# Claves que definen un batch; se guardan con cada entrada programada
+RUN_OPTION_KEYS = ("retry_delay", "batch_size", "filter_exclude_keywords",
+                   "filter_include_keywords", "filter_whole_word",
+                   "filter_accent_insensitive", "filter_min_duration",
+                   "filter_max_duration")
+
+
+def load_config(path: str = None) -> dict:
+    """DEFAULT_CONFIG completado con lo que traiga el archivo JSON."""
+    config = dict(DEFAULT_CONFIG)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            config.update(json.load(f))
+    return config
+
+
+def run_options(config: dict) -> dict:
+    """Lo que un batch programado necesita de la config, para guardarlo aparte."""
+    return {k: config[k] for k in RUN_OPTION_KEYS}
+
+
+def filter_kwargs(config: dict) -> dict:
+    """Filtros de la config en el formato de YouTubeManager.iter_filtered."""
+    return {
+        "exclude_keywords": parse_keywords(config["filter_exclude_keywords"]),
+        "include_keywords": parse_keywords(config["filter_include_keywords"]),
+        "whole_word": config["filter_whole_word"],
+        "accent_insensitive": config["filter_accent_insensitive"],
+        "min_duration": config["filter_min_duration"] or None,
+        "max_duration": config["filter_max_duration"] or None
+    }
@@ -0,0 +1,440 @@
+"""
+storage.py – Persistencia local (SQLite) para cachés y estado de la app.
+
+Todas las tablas viven en un mismo archivo (por defecto `ytmanager.db`);
+cada store crea las suyas con `CREATE TABLE IF NOT EXISTS`.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+
+class SQLiteStore:
+    """
+    Conexión SQLite compartida entre hilos y protegida con un lock.
+    Los stores que apuntan al mismo archivo reutilizan una sola conexión.
+    """
+
+    SCHEMA = ""
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        with SQLiteStore._shared_lock:
+            if path not in SQLiteStore._shared:
+                conn = sqlite3.connect(path, check_same_thread=False)
+                SQLiteStore._shared[path] = (conn, threading.RLock())
+            self._conn, self._lock = SQLiteStore._shared[path]
+        with self._lock, self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with SQLiteStore._shared_lock, self._lock:
+            if SQLiteStore._shared.pop(self.path, None):
+                self._conn.close()
+
+
+class VideoMetadataCache(SQLiteStore):
+    """
+    Caché de metadatos de video por videoId.
+    Cada campo (título, descripción, duración) tiene su propio TTL y el
+    número de videos guardados está acotado con desalojo LRU.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS video_fields (
+        video_id   TEXT NOT NULL,
+        field      TEXT NOT NULL,
+        value      TEXT,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (video_id, field)
+    );
+    CREATE TABLE IF NOT EXISTS video_access (
+        video_id    TEXT PRIMARY KEY,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_video_access_last
+        ON video_access (last_access);
+    """
+
+    # TTL por campo, en segundos
+    DEFAULT_TTLS = {
+        "title": 7 * 86400,
+        "description": 7 * 86400,
+        "duration": 30 * 86400,
+    }
+
+    def __init__(self, path: str, ttls: dict = None, max_entries: int = 50000):
+        super().__init__(path)
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, video_ids, fields) -> tuple[dict, list]:
+        """
+        Devuelve ({videoId: {campo: valor}}, [videoIds faltantes]).
+        Un video cuenta como faltante si algún campo pedido no está o venció.
+        """
+        ids = list(video_ids)
+        fields = tuple(fields)
+        now = time.time()
+        rows = {}
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i+500]
+                marks = ",".join("?" * len(chunk))
+                cur = self._conn.execute(
+                    "SELECT video_id, field, value, fetched_at FROM video_fields "
+                    f"WHERE video_id IN ({marks})", chunk
+                )
+                for vid, field, value, ts in cur:
+                    if field in fields and now - ts <= self.ttls.get(field, 0):
+                        rows.setdefault(vid, {})[field] = json.loads(value)
+
+            found, missing = {}, []
+            for vid in ids:
+                rec = rows.get(vid)
+                if rec is not None and len(rec) == len(fields):
+                    found[vid] = rec
+                else:
+                    missing.append(vid)
+
+            if found:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE video_access SET last_access = ? WHERE video_id = ?",
+                        [(now, vid) for vid in found]
+                    )
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, records: dict):
+        """Guarda {videoId: {campo: valor}} y aplica el límite LRU."""
+        if not records:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO video_fields "
+                "(video_id, field, value, fetched_at) VALUES (?, ?, ?, ?)",
+                [(vid, f, json.dumps(v), now)
+                 for vid, rec in records.items() for f, v in rec.items()]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO video_access (video_id, last_access) "
+                "VALUES (?, ?)",
+                [(vid, now) for vid in records]
+            )
+            self._evict()
+
+    def _evict(self):
+        """Borra los videos usados hace más tiempo si se pasa del máximo."""
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM video_access").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        old = [r[0] for r in self._conn.execute(
+            "SELECT video_id FROM video_access ORDER BY last_access LIMIT ?",
+            (excess,)
+        )]
+        self._conn.executemany(
+            "DELETE FROM video_fields WHERE video_id = ?", [(v,) for v in old])
+        self._conn.executemany(
+            "DELETE FROM video_access WHERE video_id = ?", [(v,) for v in old])
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+class ChannelSyncStore(SQLiteStore):
+    """
+    Checkpoint por canal: playlist de uploads, video más nuevo visto y el
+    conjunto de IDs ya conocidos, para sincronizar solo lo nuevo.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS channel_sync (
+        channel_id          TEXT PRIMARY KEY,
+        uploads_playlist_id TEXT NOT NULL,
+        newest_video_id     TEXT,
+        newest_published_at TEXT,
+        updated_at          REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS channel_videos (
+        channel_id   TEXT NOT NULL,
+        video_id     TEXT NOT NULL,
+        published_at TEXT,
+        PRIMARY KEY (channel_id, video_id)
+    );
+    """
+
+    def get_checkpoint(self, channel_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uploads_playlist_id, newest_video_id, newest_published_at, "
+                "updated_at FROM channel_sync WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "uploads_playlist_id": row[0],
+            "newest_video_id": row[1],
+            "newest_published_at": row[2] or "",
+            "updated_at": row[3],
+        }
+
+    def known_video_ids(self, channel_id: str) -> set:
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT video_id FROM channel_videos WHERE channel_id = ?",
+                (channel_id,)
+            )
+            return {r[0] for r in cur}
+
+    def save(self, channel_id: str, uploads_playlist_id: str,
+             new_items: list, full: bool = False):
+        """
+        Registra los videos nuevos [(videoId, publishedAt), ...] (más nuevo
+        primero). Con full=True reemplaza todo lo conocido del canal.
+        """
+        with self._lock, self._conn:
+            if full:
+                self._conn.execute(
+                    "DELETE FROM channel_videos WHERE channel_id = ?", (channel_id,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO channel_videos "
+                "(channel_id, video_id, published_at) VALUES (?, ?, ?)",
+                [(channel_id, vid, pub) for vid, pub in new_items]
+            )
+            if new_items:
+                newest_vid, newest_pub = new_items[0]
+            else:
+                cp = self.get_checkpoint(channel_id) or {}
+                newest_vid = cp.get("newest_video_id")
+                newest_pub = cp.get("newest_published_at", "")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channel_sync (channel_id, "
+                "uploads_playlist_id, newest_video_id, newest_published_at, "
+                "updated_at) VALUES (?, ?, ?, ?, ?)",
+                (channel_id, uploads_playlist_id, newest_vid, newest_pub, time.time())
+            )
+
+    def reset(self, channel_id: str):
+        """Olvida el checkpoint del canal (la próxima lectura será completa)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM channel_sync WHERE channel_id = ?", (channel_id,))
+            self._conn.execute(
+                "DELETE FROM channel_videos WHERE channel_id = ?", (channel_id,))
+
+
+class PlaylistMirrorStore(SQLiteStore):
+    """
+    Copia local de la membresía de una playlist {videoId: playlistItemId},
+    con el etag e itemCount que tenía la playlist al sincronizarla.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS playlist_mirror (
+        playlist_id TEXT PRIMARY KEY,
+        etag        TEXT,
+        item_count  INTEGER NOT NULL,
+        loaded_at   REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS playlist_items (
+        playlist_id TEXT NOT NULL,
+        video_id    TEXT NOT NULL,
+        item_id     TEXT NOT NULL,
+        PRIMARY KEY (playlist_id, video_id)
+    );
+    """
+
+    def get(self, playlist_id: str) -> dict | None:
+        """{'etag', 'item_count', 'items': {videoId: itemId}} o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, item_count FROM playlist_mirror WHERE playlist_id = ?",
+                (playlist_id,)
+            ).fetchone()
+            if not row:
+                return None
+            cur = self._conn.execute(
+                "SELECT video_id, item_id FROM playlist_items WHERE playlist_id = ?",
+                (playlist_id,)
+            )
+            return {"etag": row[0], "item_count": row[1], "items": dict(cur)}
+
+    def replace(self, playlist_id: str, items: dict, etag: str, item_count: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM playlist_items WHERE playlist_id = ?", (playlist_id,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO playlist_items (playlist_id, video_id, item_id) "
+                "VALUES (?, ?, ?)",
+                [(playlist_id, vid, iid) for vid, iid in items.items()]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO playlist_mirror "
+                "(playlist_id, etag, item_count, loaded_at) VALUES (?, ?, ?, ?)",
+                (playlist_id, etag, item_count, time.time())
+            )
+
+    def add(self, playlist_id: str, video_id: str, item_id: str):
+        """
+        Registra un insert propio. El etag queda en NULL hasta que
+        adopt_etag lo revalide; si eso no llega a pasar, el próximo uso
+        re-pagina.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO playlist_items (playlist_id, video_id, item_id) "
+                "VALUES (?, ?, ?)", (playlist_id, video_id, item_id)
+            )
+            self._conn.execute(
+                "UPDATE playlist_mirror SET item_count = item_count + 1, etag = NULL "
+                "WHERE playlist_id = ?", (playlist_id,)
+            )
+
+    def remove(self, playlist_id: str, video_id: str):
+        """Registra un delete propio; el etag queda en NULL como en add."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM playlist_items WHERE playlist_id = ? AND video_id = ?",
+                (playlist_id, video_id)
+            )
+            if cur.rowcount:
+                self._conn.execute(
+                    "UPDATE playlist_mirror SET item_count = MAX(item_count - 1, 0), "
+                    "etag = NULL WHERE playlist_id = ?", (playlist_id,)
+                )
+
+    def adopt_etag(self, playlist_id: str, etag: str, item_count: int) -> bool:
+        """
+        Tras escrituras propias: guarda el etag nuevo solo si el itemCount
+        de la API coincide con el del mirror. False si no coincide (alguien
+        más tocó la playlist) y el mirror sigue invalidado.
+        """
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE playlist_mirror SET etag = ? "
+                "WHERE playlist_id = ? AND item_count = ?",
+                (etag, playlist_id, item_count)
+            )
+            return bool(cur.rowcount)
+
+    def drop(self, playlist_id: str):
+        """Olvida el mirror (se recarga completo en el próximo uso)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM playlist_items WHERE playlist_id = ?", (playlist_id,))
+            self._conn.execute(
+                "DELETE FROM playlist_mirror WHERE playlist_id = ?", (playlist_id,))
+
+
+class HttpResponseCache(SQLiteStore):
+    """
+    Respuestas GET guardadas con su ETag para revalidar con If-None-Match.
+    La clave incluye el token (las respuestas `mine=True` son por usuario).
+    Con `max_age` > 0 una entrada reciente se sirve sin ir a la red.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS http_cache (
+        key        TEXT PRIMARY KEY,
+        etag       TEXT NOT NULL,
+        headers    TEXT NOT NULL,
+        content    BLOB NOT NULL,
+        fetched_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_http_cache_access
+        ON http_cache (last_access);
+    """
+
+    def __init__(self, path: str, max_age: float = 0, max_entries: int = 5000):
+        super().__init__(path)
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict | None:
+        """{etag, headers, content, fresh} o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, headers, content, fetched_at FROM http_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, headers, content, ts = row
+        return {
+            "etag": etag,
+            "headers": json.loads(headers),
+            "content": bytes(content),
+            "fresh": time.time() - ts <= self.max_age,
+        }
+
+    def put(self, key: str, etag: str, headers: dict, content: bytes):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(key, etag, headers, content, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, json.dumps(headers), content, now, now)
+            )
+            self.misses += 1
+            self._evict()
+
+    def record_hit(self, key: str, revalidated: bool):
+        """Una respuesta servida desde disco (fresca o tras un 304)."""
+        now = time.time()
+        with self._lock, self._conn:
+            if revalidated:
+                self._conn.execute(
+                    "UPDATE http_cache SET fetched_at = ?, last_access = ? WHERE key = ?",
+                    (now, now, key))
+                self.revalidated += 1
+            else:
+                self._conn.execute(
+                    "UPDATE http_cache SET last_access = ? WHERE key = ?", (now, key))
+                self.hits += 1
+
+    def record_miss(self):
+        """Respuesta completa que no se pudo guardar (sin ETag o no-200)."""
+        with self._lock:
+            self.misses += 1
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM http_cache WHERE key IN "
+                "(SELECT key FROM http_cache ORDER BY last_access LIMIT ?)", (excess,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+                "revalidation_ratio": (self.revalidated / total) if total else 0.0,
+                "miss_ratio": (self.misses / total) if total else 0.0,
+            }
@@ -0,0 +1,220 @@
+"""
+Fixtures comunes: un servicio de YouTube falso en memoria y un
+YouTubeManager que lo usa, con su estado SQLite en tmp_path.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yt_manager import YouTubeManager  # noqa: E402
+
+
+def http_error(status: int, reason: str) -> HttpError:
+    content = json.dumps({"error": {"code": status, "message": reason,
+                                    "errors": [{"reason": reason}]}}).encode()
+    return HttpError(httplib2.Response({"status": str(status)}), content)
+
+
+class FakeRequest:
+    def __init__(self, service, resource, verb, kwargs):
+        self.methodId = f"youtube.{resource}.{verb}"
+        self.service, self.resource, self.verb, self.kwargs = service, resource, verb, kwargs
+
+    def execute(self, http=None):
+        return self.service.handle(self.resource, self.verb, self.kwargs)
+
+
+class FakeBatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+class FakeResource:
+    def __init__(self, service, name):
+        self.service, self.name = service, name
+
+    def __getattr__(self, verb):
+        if verb not in ("list", "insert", "update", "delete"):
+            raise AttributeError(verb)
+        return lambda **kwargs: FakeRequest(self.service, self.name, verb, kwargs)
+
+
+class FakeYouTube:
+    """
+    Lo justo de la API para los flujos del manager. Un canal "UC1" con
+    uploads "UU1" (del más nuevo al más viejo) y playlists propias en
+    `lists` ({playlistId: [(itemId, videoId)]}). El etag de una
+    playlist depende de su contenido, como en la API real. Los inserts de
+    los videos en `rejected` ({videoId: reason}) fallan con ese reason.
+    """
+
+    def __init__(self, uploads=30):
+        self.uploads = [(f"v{i:04d}", f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z")
+                        for i in range(uploads, 0, -1)]
+        self.lists = {"PL1": []}
+        self.rejected = {}
+        self.calls = []
+        self._item_seq = 0
+
+    def __getattr__(self, name):
+        if name in ("channels", "search", "playlists", "playlistItems", "videos"):
+            return lambda: FakeResource(self, name)
+        raise AttributeError(name)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(callback)
+
+    # -- helpers para los tests --
+    def etag(self, playlist_id: str) -> str:
+        raw = ",".join(i for i, _ in self.lists[playlist_id]).encode()
+        return hashlib.md5(raw).hexdigest()
+
+    def new_item(self, playlist_id: str, video_id: str) -> str:
+        self._item_seq += 1
+        item_id = f"item{self._item_seq}"
+        self.lists[playlist_id].append((item_id, video_id))
+        return item_id
+
+    def count(self, resource: str, verb: str) -> int:
+        return sum(1 for r, v, _ in self.calls if (r, v) == (resource, verb))
+
+    # -- respuestas --
+    def handle(self, resource, verb, k):
+        self.calls.append((resource, verb, k))
+        return getattr(self, f"_{resource}_{verb}")(k)
+
+    def _channels_list(self, k):
+        if k["id"] != "UC1":
+            return {"items": []}
+        return {"items": [{
+            "id": "UC1",
+            "snippet": {"title": "Canal", "description": "Desc"},
+            "statistics": {"subscriberCount": "42"},
+            "contentDetails": {"relatedPlaylists": {"uploads": "UU1"}},
+        }]}
+
+    def _search_list(self, k):
+        return {"items": [
+            {"id": {"kind": "youtube#channel", "channelId": "UC1"},
+             "snippet": {"title": "Canal", "description": "Desc"}},
+            {"id": {"kind": "youtube#video", "videoId": "v0001"},
+             "snippet": {"title": "Video", "description": ""}},
+        ]}
+
+    def _page(self, rows, k):
+        start = int(k.get("pageToken") or 0)
+        out = {"items": rows[start:start + 50]}
+        if start + 50 < len(rows):
+            out["nextPageToken"] = str(start + 50)
+        return out
+
+    def _playlistItems_list(self, k):
+        pid = k["playlistId"]
+        if pid == "UU1":
+            rows = [{"id": f"up-{v}", "contentDetails": {"videoId": v, "videoPublishedAt": p}}
+                    for v, p in self.uploads]
+        else:
+            rows = [{"id": i, "contentDetails": {"videoId": v}}
+                    for i, v in self.lists[pid]]
+        return self._page(rows, k)
+
+    def _playlistItems_insert(self, k):
+        snip = k["body"]["snippet"]
+        reason = self.rejected.get(snip["resourceId"]["videoId"])
+        if reason:
+            raise http_error(404, reason)
+        return {"id": self.new_item(snip["playlistId"], snip["resourceId"]["videoId"])}
+
+    def _playlistItems_delete(self, k):
+        for pid, items in self.lists.items():
+            self.lists[pid] = [(i, v) for i, v in items if i != k["id"]]
+        return ""
+
+    def _videos_list(self, k):
+        if k.get("chart") == "mostPopular":
+            ids = [v for v, _ in self.uploads[:k.get("maxResults", 10)]]
+        else:
+            ids = k["id"].split(",")
+        return {"items": [{
+            "id": v,
+            "snippet": {"title": f"Título {v}", "description": "desc"},
+            "contentDetails": {"duration": f"PT{int(v[1:]) % 20 + 1}M"},
+            "statistics": {"viewCount": "7"},
+        } for v in ids]}
+
+    def _playlists_list(self, k):
+        if k.get("mine"):
+            return {"items": [{
+                "id": pid, "etag": self.etag(pid),
+                "snippet": {"title": pid, "description": ""},
+                "status": {"privacyStatus": "private"},
+                "contentDetails": {"itemCount": len(items)},
+            } for pid, items in self.lists.items()]}
+        pid = k["id"]
+        if pid not in self.lists:
+            return {"items": []}
+        return {"items": [{"id": pid, "etag": self.etag(pid),
+                           "contentDetails": {"itemCount": len(self.lists[pid])}}]}
+
+    def _playlists_insert(self, k):
+        pid = f"PL{len(self.lists) + 1}"
+        self.lists[pid] = []
+        return {"id": pid, "snippet": k["body"]["snippet"]}
+
+    def _playlists_update(self, k):
+        return {"id": k["body"]["id"], "snippet": k["body"]["snippet"]}
+
+    def _playlists_delete(self, k):
+        del self.lists[k["id"]]
+        return ""
+
+
+@pytest.fixture
+def service():
+    return FakeYouTube()
+
+
+@pytest.fixture
+def make_manager(tmp_path, monkeypatch):
+    """Fábrica de managers sobre el servicio falso, sin OAuth ni red."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(YouTubeManager, "_authenticate", lambda self: None)
+    managers = []
+
+    def make(service, **kwargs):
+        mgr = YouTubeManager("token.pickle", [], state_db=str(tmp_path / "state.db"),
+                             **kwargs)
+        mgr._service = service
+        mgr.RETRY_DELAY = 0
+        for kind in ("list", "insert", "delete"):
+            mgr.rate_limiter.configure(kind, rate=1000, burst=1000)
+        managers.append(mgr)
+        return mgr
+
+    yield make
+    for mgr in managers:
+        mgr.close()
+
+
+@pytest.fixture
+def manager(make_manager, service):
+    return make_manager(service)
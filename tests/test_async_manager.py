@@ -0,0 +1,110 @@
+"""
+AsyncYouTubeClient contra un servidor aiohttp local que imita la API
+(`base_url`), respaldado por el mismo servicio falso que el manager.
+"""
+
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from async_manager import AsyncYouTubeClient
+
+VERBS = {"GET": "list", "POST": "insert", "PUT": "update", "DELETE": "delete"}
+
+
+def stand_in(service, failures):
+    """App aiohttp que atiende /youtube/v3/<recurso>; `failures` fuerza errores."""
+    async def handle(request):
+        resource, verb = request.match_info["resource"], VERBS[request.method]
+        pending = failures.get((resource, verb))
+        if pending:
+            status, reason = pending.pop(0)
+            return web.json_response({"error": {"code": status, "message": reason,
+                                                "errors": [{"reason": reason}]}},
+                                     status=status)
+        kwargs = dict(request.query)
+        if request.can_read_body:
+            kwargs["body"] = await request.json()
+        resp = service.handle(resource, verb, kwargs)
+        return web.json_response(resp) if resp else web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_route("*", "/youtube/v3/{resource}", handle)
+    return app
+
+
+def run(manager, service, work, failures=None):
+    async def main():
+        server = TestServer(stand_in(service, failures or {}))
+        await server.start_server()
+        try:
+            async with AsyncYouTubeClient.from_manager(
+                    manager, base_url=str(server.make_url("/youtube/v3"))) as yt:
+                return await work(yt)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_reads(manager, service):
+    async def work(yt):
+        details = await yt.get_channel_details("UC1")
+        ids = await yt.get_channels_video_ids(["UC1", "UCx"])
+        meta = await yt.get_video_metadata(["v0001", "v0002"])
+        found = await yt.search_channels("canal")
+        return details, ids, meta, found
+
+    details, ids, meta, found = run(manager, service, work)
+    assert details == {"title": "Canal", "description": "Desc", "subscriberCount": "42"}
+    # UCx no existe: se registra el error y el resto sigue
+    assert ids == {"UC1": {v for v, _ in service.uploads}}
+    assert meta["v0002"] == {"title": "Título v0002", "description": "desc",
+                             "duration": "PT3M"}
+    assert [c["channelId"] for c in found] == ["UC1"]
+
+
+def test_writes_update_mirror(manager, service):
+    manager.get_playlist_mirror("PL1")
+
+    added = run(manager, service,
+                lambda yt: yt.add_videos_to_playlist("PL1", ["v0001", "v0002"]))
+    assert added["added"] == ["v0001", "v0002"]
+    mirror = manager.playlist_mirror.get("PL1")
+    assert mirror["items"] == {vid: iid for iid, vid in service.lists["PL1"]}
+    # Revalidado tras el lote: el manager no necesita re-paginar
+    pages = service.count("playlistItems", "list")
+    assert manager.get_playlist_mirror("PL1") == mirror["items"]
+    assert service.count("playlistItems", "list") == pages
+
+    removed = run(manager, service, lambda yt: yt.empty_playlist("PL1"))
+    assert removed == 2
+    assert service.lists["PL1"] == []
+    assert manager.playlist_mirror.get("PL1")["items"] == {}
+
+
+def test_quota_charged_once_per_call(manager, service):
+    failures = {("playlistItems", "insert"): [(503, "backendError")]}
+    used = manager.quota.used()
+
+    result = run(manager, service,
+                 lambda yt: yt.add_videos_to_playlist("PL1", ["v0001"]), failures)
+
+    assert result["added"] == ["v0001"]
+    assert failures[("playlistItems", "insert")] == []      # hubo un reintento
+    # 1 list de la playlist + 1 insert (50), aunque el insert se intentó dos
+    # veces, + 1 list para revalidar el mirror
+    assert manager.quota.used() - used == 52
+    by_method = manager.quota.report()["by_method"]
+    assert by_method["playlistItems.insert"]["calls"] == 1
+
+
+def test_permanent_error_not_retried(manager, service):
+    failures = {("playlistItems", "insert"): [(404, "videoNotFound"), (503, "backendError")]}
+
+    result = run(manager, service,
+                 lambda yt: yt.add_videos_to_playlist("PL1", ["v0001"]), failures)
+
+    assert result["failed"] == [{"videoId": "v0001", "reason": "videoNotFound"}]
+    assert len(failures[("playlistItems", "insert")]) == 1
@@ -0,0 +1,15 @@
+"""Lectura incremental de uploads con checkpoint."""
+
+
+def test_incremental_read_stops_at_known_id(manager, service):
+    assert len(set(manager.iter_channel_video_ids("UC1"))) == 30
+    pages = service.count("playlistItems", "list")
+
+    # Un video viejo que se hizo público recién: arriba de uploads, con fecha anterior
+    service.uploads.insert(0, ("v0100", "2023-06-01T00:00:00Z"))
+    ids = list(manager.iter_channel_video_ids("UC1"))
+
+    assert ids[0] == "v0100"
+    assert set(ids) == {v for v, _ in service.uploads}
+    assert service.count("playlistItems", "list") == pages + 1
+    assert "v0100" in manager.channel_sync.known_video_ids("UC1")
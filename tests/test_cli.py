@@ -0,0 +1,76 @@
+"""Códigos de salida de la CLI cuando el manager falla."""
+
+import json
+
+import pytest
+
+import cli
+import settings
+import yt_manager
+from conftest import http_error
+
+
+@pytest.fixture
+def run_cli(tmp_path, monkeypatch, capsys):
+    """main() con el manager dado; devuelve (código, JSON emitido)."""
+    config = tmp_path / "ytm.json"
+    config.write_text(json.dumps({"retry_delay": 0}))
+
+    def run(mgr, *argv):
+        monkeypatch.setattr(yt_manager, "YouTubeManager", lambda *a, **k: mgr)
+        code = cli.main(["--config", str(config), *argv])
+        return code, json.loads(capsys.readouterr().out)
+    return run
+
+
+def test_delete_reports_failure(manager, service, monkeypatch, run_cli):
+    def missing(k):
+        raise http_error(404, "playlistNotFound")
+    monkeypatch.setattr(service, "_playlists_delete", missing)
+
+    code, payload = run_cli(manager, "playlists", "delete", "PLx")
+    assert code == cli.EXIT_ERROR
+    assert "playlistNotFound" in payload["error"]
+
+
+def test_delete_ok(manager, service, run_cli):
+    code, payload = run_cli(manager, "playlists", "delete", "PL1")
+    assert (code, payload) == (cli.EXIT_OK, {"playlistId": "PL1", "deleted": True})
+    assert "PL1" not in service.lists
+
+
+def test_list_and_trending_report_failure(manager, service, monkeypatch, run_cli):
+    def broken(k):
+        raise http_error(404, "notFound")
+    monkeypatch.setattr(service, "_playlists_list", broken)
+    monkeypatch.setattr(service, "_videos_list", broken)
+
+    assert run_cli(manager, "playlists", "list")[0] == cli.EXIT_ERROR
+    assert run_cli(manager, "trending")[0] == cli.EXIT_ERROR
+
+
+def test_quota_exhausted_exit_code(make_manager, service, run_cli):
+    mgr = make_manager(service, quota_limit=0)
+    code, payload = run_cli(mgr, "trending")
+    assert code == cli.EXIT_QUOTA and payload["error"]
+
+
+def test_clean_partial(manager, service, monkeypatch, run_cli):
+    for vid in ("v0001", "v0002", "v0003"):
+        service.new_item("PL1", vid)
+    first = service.lists["PL1"][0][0]
+    delete = service._playlistItems_delete
+
+    def flaky(k):
+        if k["id"] == first:
+            raise http_error(404, "playlistItemNotFound")
+        return delete(k)
+    monkeypatch.setattr(service, "_playlistItems_delete", flaky)
+
+    code, payload = run_cli(manager, "clean", "--playlist", "PL1", "--max-duration", "3600")
+    assert code == cli.EXIT_PARTIAL
+    assert (payload["removed"], payload["failed"]) == (2, 1)
+
+
+def test_cli_and_gui_share_scopes():
+    assert cli.SCOPES is settings.SCOPES
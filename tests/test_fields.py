@@ -0,0 +1,117 @@
+"""
+Máscaras fields= en modo estricto: cada consumidor de FIELDS solo lee lo
+que declaró. El servicio falso manda objetos completos, así que leer un
+campo no pedido lanza FieldNotRequested (y el método devolvería vacío).
+"""
+
+import logging
+
+import pytest
+
+from fields import FieldMask, FieldNotRequested
+
+
+@pytest.fixture(autouse=True)
+def strict(monkeypatch, caplog):
+    monkeypatch.setattr(FieldMask, "strict", True)
+    caplog.set_level(logging.WARNING, logger="YouTubeManager")
+    yield
+    leaks = [r.getMessage() for r in caplog.records if "máscara" in r.getMessage()]
+    assert not leaks
+
+
+def sent_fields(service, resource, verb):
+    return {str(k.get("fields")) for r, v, k in service.calls if (r, v) == (resource, verb)}
+
+
+def test_strict_dict_rejects_undeclared_keys():
+    mask = FieldMask("items.id", "items.snippet.title")
+    resp = mask.check({"items": [{"id": "a", "etag": "x",
+                                  "snippet": {"title": "t", "description": "d"}}]})
+    item = resp["items"][0]
+    assert item["snippet"]["title"] == "t"
+    with pytest.raises(FieldNotRequested):
+        item["etag"]
+    with pytest.raises(FieldNotRequested):
+        item["snippet"].get("description")
+    assert str(mask) == "items(id,snippet/title)"
+
+
+def test_channel_details(manager, service):
+    assert manager.get_channel_details("UC1") == {
+        "title": "Canal", "description": "Desc", "subscriberCount": "42"}
+    assert sent_fields(service, "channels", "list") == {
+        str(manager.FIELDS["channel_details"])}
+
+
+def test_search_channels(manager, service):
+    assert manager.search_channels("canal") == [
+        {"channelId": "UC1", "title": "Canal", "description": "Desc"}]
+    assert sent_fields(service, "search", "list") == {str(manager.FIELDS["search_channels"])}
+
+
+def test_uploads_playlist_and_upload_items(manager, service):
+    assert manager.uploads_playlist_id("UC1", use_checkpoint=False) == "UU1"
+    ids = list(manager.iter_channel_video_ids("UC1"))
+    assert ids == [v for v, _ in service.uploads]
+    assert sent_fields(service, "playlistItems", "list") == {
+        str(manager.FIELDS["upload_items"])}
+
+
+def test_playlist_version_and_mirror_items(manager, service):
+    service.new_item("PL1", "a")
+    assert manager.get_playlist_mirror("PL1") == {"a": "item1"}
+    assert sent_fields(service, "playlists", "list") == {
+        str(manager.FIELDS["playlist_version"])}
+    assert sent_fields(service, "playlistItems", "list") == {
+        str(manager.FIELDS["mirror_items"])}
+
+
+def test_list_playlists(manager, service):
+    assert manager.list_playlists() == [{"playlistId": "PL1", "title": "PL1",
+                                         "description": "", "privacyStatus": "private"}]
+
+
+def test_created(manager, service):
+    pid = manager.create_playlist("Nueva", "")
+    assert pid == "PL2"
+    assert manager.update_playlist(pid, "Otra", "", "private")["id"] == pid
+    result = manager.add_videos_to_playlist(pid, {"v0001"})
+    assert result["added"] == ["v0001"]
+    created = str(manager.FIELDS["created"])
+    assert sent_fields(service, "playlists", "insert") == {created}
+    assert sent_fields(service, "playlistItems", "insert") == {created}
+
+
+def test_iter_videos(manager, service):
+    meta = dict(manager.iter_videos(["v0001", "v0002"], fields=("title", "duration")))
+    assert meta == {"v0001": {"title": "Título v0001", "duration": "PT2M"},
+                    "v0002": {"title": "Título v0002", "duration": "PT3M"}}
+    assert sent_fields(service, "videos", "list") == {
+        "items(id,snippet/title,contentDetails/duration)"}
+
+
+def test_trending_returns_full_items(manager, service):
+    items = manager.get_trending_videos(maxResults=2)
+    assert [it["id"] for it in items] == ["v0030", "v0029"]
+    assert {"snippet", "contentDetails", "statistics"} <= set(items[0])
+    assert sent_fields(service, "videos", "list") == {"None"}
+
+
+def test_filter_parses_each_duration_once(manager, service, monkeypatch):
+    import utils
+    import yt_manager
+
+    calls = []
+    real = utils.parse_duration
+
+    def counted(value):
+        calls.append(value)
+        return real(value)
+    monkeypatch.setattr(utils, "parse_duration", counted)
+    monkeypatch.setattr(yt_manager, "parse_duration", counted)
+
+    ids = [f"v{n:04d}" for n in range(1, 11)]
+    kept = list(manager.iter_filtered(ids, {"min_duration": 300, "max_duration": 600}))
+    assert kept == [v for v in ids if 5 <= int(v[1:]) % 20 + 1 <= 10]
+    assert len(calls) == len(ids)
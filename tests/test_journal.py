@@ -0,0 +1,51 @@
+"""Diario de trabajos: plan por lotes y fallos permanentes entre trabajos."""
+
+from journal import JobJournal
+
+
+def inserted(service, video_id):
+    return sum(1 for r, v, k in service.calls if (r, v) == ("playlistItems", "insert")
+               and k["body"]["snippet"]["resourceId"]["videoId"] == video_id)
+
+
+def test_plan_written_once_per_batch(manager, monkeypatch):
+    calls = []
+    original = JobJournal.add_planned
+    monkeypatch.setattr(JobJournal, "add_planned",
+                        lambda self, job_id, ids, *a: calls.append(list(ids))
+                        or original(self, job_id, ids, *a))
+
+    result = manager.process_channel("UC1", "PL1", batch_size=20)
+
+    assert len(result["added"]) == 30
+    assert [len(c) for c in calls] == [20, 10]
+    assert manager.journal.get(result["job_id"])["status"] == "completed"
+
+
+def test_permanent_failure_not_requeued(manager, service):
+    service.rejected["v0003"] = "videoNotFound"
+    first = manager.process_channel("UC1", "PL1")
+    assert first["failed"] == [{"videoId": "v0003", "reason": "videoNotFound"}]
+
+    # Sale un video nuevo: el trabajo siguiente no reintenta v0003
+    service.uploads.insert(0, ("v0031", "2024-01-01T00:00:31Z"))
+    second = manager.process_channel("UC1", "PL1")
+    assert second["added"] == ["v0031"]
+    assert inserted(service, "v0003") == 1
+
+    # Tampoco después de purgar los trabajos terminados
+    manager.journal.purge()
+    service.uploads.insert(0, ("v0032", "2024-01-01T00:00:32Z"))
+    third = manager.process_batch(["UC1"], "PL1")
+    assert third["totals"]["added"] == 1
+    assert third["channels"]["UC1"]["failed_before"] == 1
+    assert inserted(service, "v0003") == 1
+
+
+def test_full_resync_retries_permanent_failures(manager, service):
+    service.rejected["v0003"] = "videoNotFound"
+    manager.process_channel("UC1", "PL1")
+    del service.rejected["v0003"]
+
+    result = manager.process_channel("UC1", "PL1", full_resync=True)
+    assert result["added"] == ["v0003"]
@@ -0,0 +1,50 @@
+"""Mirror local de playlists: se reutiliza solo si el etag coincide."""
+
+
+def test_mirror_reused_while_etag_matches(manager, service):
+    service.new_item("PL1", "a")
+    assert manager.get_playlist_mirror("PL1") == {"a": "item1"}
+    pages = service.count("playlistItems", "list")
+
+    assert manager.get_playlist_mirror("PL1") == {"a": "item1"}
+    assert service.count("playlistItems", "list") == pages
+
+
+def test_external_remove_and_add_with_same_count(manager, service):
+    service.new_item("PL1", "a")
+    service.new_item("PL1", "b")
+    manager.get_playlist_mirror("PL1")
+
+    # Otro cliente cambia un video por otro: el itemCount no se mueve
+    service.lists["PL1"] = [service.lists["PL1"][0]]
+    service.new_item("PL1", "c")
+
+    assert set(manager.get_playlist_mirror("PL1")) == {"a", "c"}
+
+
+def test_own_writes_do_not_repage(manager, service):
+    manager.get_playlist_mirror("PL1")
+    pages = service.count("playlistItems", "list")
+
+    manager.add_videos_to_playlist("PL1", {"v0001", "v0002"})
+    # El etag nuevo se adopta tras el lote: el itemCount cuadra con el mirror
+    assert manager.playlist_mirror.get("PL1")["etag"] is not None
+    assert set(manager.get_playlist_mirror("PL1")) == {"v0001", "v0002"}
+    manager.remove_videos_by_duration("PL1", max_duration=3600)
+    assert manager.get_playlist_mirror("PL1") == {}
+    assert service.count("playlistItems", "list") == pages
+
+
+def test_external_write_during_batch_invalidates(manager, service, monkeypatch):
+    manager.get_playlist_mirror("PL1")
+    insert = service._playlistItems_insert
+
+    def with_intruder(k):
+        resp = insert(k)
+        service.new_item("PL1", "x")      # otro cliente escribe a la vez
+        return resp
+    monkeypatch.setattr(service, "_playlistItems_insert", with_intruder)
+
+    manager.add_videos_to_playlist("PL1", {"v0001"})
+    assert manager.playlist_mirror.get("PL1")["etag"] is None
+    assert set(manager.get_playlist_mirror("PL1")) == {"v0001", "x"}
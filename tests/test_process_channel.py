@@ -0,0 +1,60 @@
+"""process_channel: proyección de cuota en el plan y errores en el resultado."""
+
+import argparse
+
+import cli
+from conftest import http_error
+
+
+def channel_args():
+    return argparse.Namespace(channel="UC1", playlist="PL1", full_resync=False)
+
+
+def test_plan_defers_what_does_not_fit(make_manager, service):
+    mgr = make_manager(service, quota_limit=600)
+
+    result = mgr.process_channel("UC1", "PL1", batch_size=20)
+
+    plan = result["plan"]
+    assert 0 < plan["to_add"] < 30
+    assert plan["to_add"] + plan["deferred"] == 30
+    assert plan["insert_units"] == plan["to_add"] * 50
+    assert len(result["added"]) == plan["to_add"] == service.count("playlistItems", "insert")
+    assert {s["reason"] for s in result["skipped"]} == {"quota_deferred"}
+    assert result["error"] is None
+    # Los diferidos quedan pendientes en el diario para la próxima ejecución
+    job = mgr.journal.get(result["job_id"])
+    assert job["status"] == "running" and job["counts"]["pending"] == plan["deferred"]
+
+
+def test_error_is_reported(manager, service, monkeypatch):
+    def broken(k):
+        raise http_error(404, "playlistNotFound")
+    monkeypatch.setattr(service, "_playlistItems_list", broken)
+
+    result = manager.process_channel("UC1", "PL1")
+    assert "playlistNotFound" in result["error"]
+
+    config = dict(cli.CLI_DEFAULTS, **cli.load_config(None))
+    payload, code = cli.cmd_process_channel(manager, channel_args(), config)
+    assert payload["error"] and code == cli.EXIT_ERROR
+
+
+def test_resume_skips_videos_added_by_another_job(make_manager, service):
+    mgr = make_manager(service, quota_limit=600)
+    first = mgr.process_channel("UC1", "PL1", batch_size=20)
+    deferred = first["plan"]["deferred"]
+    assert deferred
+
+    # Con más cuota, un batch agrega lo diferido antes de que se retome
+    mgr = make_manager(service)
+    batch = mgr.process_batch(["UC1"], "PL1", batch_size=20)
+    assert batch["totals"]["added"] == deferred
+
+    resumed = mgr.process_channel("UC1", "PL1", batch_size=20)
+    assert resumed["job_id"] == first["job_id"]
+    assert resumed["added"] == []
+    assert {s["reason"] for s in resumed["skipped"]} == {"already_in_playlist"}
+    videos = [v for _, v in service.lists["PL1"]]
+    assert len(videos) == len(set(videos)) == 30
+    assert mgr.journal.get(first["job_id"])["status"] == "completed"
@@ -0,0 +1,141 @@
+"""Programador: entradas por dueño con sus opciones y lease entre procesos."""
+
+import logging
+import threading
+
+import pytest
+
+from scheduler import Scheduler, ScheduleStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Inline(Scheduler):
+    """Corre los batches en el mismo hilo para poder mirar el resultado."""
+
+    def _spawn(self, playlist_id, channel_ids, options):
+        self._execute(playlist_id, channel_ids, options)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ScheduleStore(str(tmp_path / "state.db"))
+    yield s
+    s.close()
+
+
+def make(store, owner, runs, clock, cls=Inline):
+    return cls(lambda *a: runs.append(a), store, owner=owner, jitter=0, clock=clock)
+
+
+def test_entries_keep_their_options(store):
+    clock, runs = Clock(), []
+    gui = make(store, "gui", runs, clock)
+    gui.set_entries([("UC1", "PL1", 1, {"batch_size": 5, "filter_min_duration": 60})])
+
+    # Otra sesión de la GUI: usa las opciones guardadas, no las por defecto
+    restored = make(store, "gui", runs, clock)
+    clock.now += 61
+    restored._dispatch_due()
+    assert runs == [("PL1", ["UC1"], {"batch_size": 5, "filter_min_duration": 60})]
+
+
+def test_owners_do_not_replace_each_other(store):
+    clock, runs = Clock(), []
+    gui = make(store, "gui", runs, clock)
+    daemon = make(store, "daemon", runs, clock)
+    gui.set_entries([("UC1", "PL1", 1, {}), ("UC2", "PL2", 1, {})])
+    daemon.set_entries([("UC9", "PL9", 1, {})])
+
+    # Reprogramar solo PL1 deja PL2 y las entradas del daemon
+    gui.set_entries([("UC3", "PL1", 1, {})], playlists=["PL1"])
+    assert {(e["channel_id"], e["playlist_id"]) for e in store.entries("gui")} == {
+        ("UC3", "PL1"), ("UC2", "PL2")}
+    assert [e["channel_id"] for e in store.entries("daemon")] == ["UC9"]
+
+
+def test_lease_keeps_one_batch_per_playlist_across_processes(store):
+    clock, runs = Clock(), []
+    started, release = threading.Event(), threading.Event()
+
+    def slow(*a):
+        started.set()
+        release.wait(5)
+
+    gui = Scheduler(slow, store, owner="gui", jitter=0, clock=clock)
+    daemon = make(store, "daemon", runs, clock)
+    daemon.set_entries([("UC1", "PL1", 1, {})])
+
+    assert gui.submit("PL1", ["UC1"])
+    assert started.wait(5)
+    clock.now += 61
+    daemon._dispatch_due()
+    assert runs == [] and daemon.stats()["leased_elsewhere"] == ["PL1"]
+    assert not daemon.submit("PL1", ["UC1"])
+
+    release.set()
+    for t in threading.enumerate():
+        if t.name == "batch-PL1":
+            t.join(5)
+    clock.now += daemon.MAX_SLEEP
+    daemon._dispatch_due()
+    assert runs == [("PL1", ["UC1"], {})]
+
+
+def test_expired_lease_is_taken_over(store):
+    clock = Clock()
+    assert store.acquire_lease("PL1", "gui:1", ttl=10, now=clock.now)
+    assert not store.acquire_lease("PL1", "daemon:2", ttl=10, now=clock.now + 5)
+    store.renew_leases(["PL1"], "gui:1", ttl=10, now=clock.now + 5)
+    assert not store.acquire_lease("PL1", "daemon:2", ttl=10, now=clock.now + 12)
+    assert store.acquire_lease("PL1", "daemon:2", ttl=10, now=clock.now + 16)
+
+
+class Var:
+    """Reemplazo de tk.StringVar (sin display en los tests)."""
+
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def test_gui_restores_and_can_turn_off_saved_schedule(store):
+    app_module = pytest.importorskip("gui.app")
+    from settings import DEFAULT_CONFIG
+
+    clock, runs = Clock(), []
+    make(store, "gui", runs, clock).set_entries(
+        [("UC1", "PL1", 30, {"batch_size": 5}), ("UC2", "PL1", 30, {"batch_size": 5})])
+
+    # Sesión nueva: config por defecto y sin canales en pantalla
+    app = app_module.App.__new__(app_module.App)
+    app.config = dict(DEFAULT_CONFIG)
+    app.playlist_id = Var()
+    app.batch_channels = []
+    app.batch_listbox = type("Listbox", (), {"insert": lambda self, *a: None})()
+    app.logger = logging.getLogger("YouTubeManager")
+    app.scheduler = make(store, "gui", runs, clock)
+    app._restore_schedule()
+
+    assert app.playlist_id.get() == "PL1"
+    assert {ch["channelId"] for ch in app.batch_channels} == {"UC1", "UC2"}
+    assert app.config["auto_update_interval"] == 30 and app.config["batch_size"] == 5
+
+    # Agregar/quitar canales con intervalo 0 no borra nada...
+    app.config["auto_update_interval"] = 0
+    app._sync_schedule()
+    assert len(store.entries("gui")) == 2
+    # ...guardar la config con intervalo 0 sí
+    app._sync_schedule(clear=True)
+    assert store.entries("gui") == []
@@ -0,0 +1,181 @@
+"""
+transport.py – Pool de transportes HTTP autorizados.
+
+httplib2.Http no es thread-safe, así que cada hilo que llama a la API
+toma en préstamo su propio Http (envuelto en AuthorizedHttp) de un pool
+acotado. Los objetos se reutilizan entre llamadas con keep-alive; un hilo
+recupera preferentemente el mismo que usó la vez anterior, cuyas
+conexiones siguen abiertas.
+
+Con un HttpResponseCache, los GET se revalidan con If-None-Match y un
+304 se responde con el cuerpo guardado en disco.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+
+
+class PooledHttp(httplib2.Http):
+    """
+    httplib2.Http que cuenta peticiones y conexiones reutilizadas y, si
+    tiene `response_cache`, cachea los GET por ETag.
+    """
+
+    def __init__(self, *args, response_cache=None, cache_scope: str = "", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+        self.cache_scope = cache_scope
+        self.requests = 0
+        self.reused = 0
+        self.last_used = time.monotonic()
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if self.response_cache is None or method != "GET":
+            return super().request(uri, method, body, headers, **kwargs)
+        key = f"{self.cache_scope}|{uri}"
+        entry = self.response_cache.get(key)
+        if entry and entry["fresh"]:
+            self.response_cache.record_hit(key, revalidated=False)
+            return self._cached(entry)
+        headers = dict(headers or {})
+        if entry:
+            headers["if-none-match"] = entry["etag"]
+        resp, content = super().request(uri, method, body, headers, **kwargs)
+        if resp.status == 304 and entry:
+            self.response_cache.record_hit(key, revalidated=True)
+            return self._cached(entry)
+        etag = resp.get("etag")
+        if resp.status == 200 and etag:
+            self.response_cache.put(key, etag, dict(resp), content)
+        else:
+            self.response_cache.record_miss()
+        return resp, content
+
+    @staticmethod
+    def _cached(entry: dict):
+        info = dict(entry["headers"], status="200")
+        return httplib2.Response(info), entry["content"]
+
+    def _conn_request(self, conn, request_uri, method, body, headers):
+        self.requests += 1
+        if getattr(conn, "sock", None) is not None:
+            self.reused += 1
+        self.last_used = time.monotonic()
+        return super()._conn_request(conn, request_uri, method, body, headers)
+
+    def close_connections(self) -> int:
+        """Cierra las conexiones abiertas; devuelve cuántas había."""
+        n = len(self.connections)
+        for conn in self.connections.values():
+            conn.close()
+        self.connections.clear()
+        return n
+
+
+class TransportPool:
+    """
+    Hasta `size` transportes autorizados para las credenciales dadas.
+    Las conexiones que pasan más de `idle_timeout` segundos sin uso se
+    cierran antes de volver a prestarlas (el servidor ya las habrá cortado).
+    """
+
+    def __init__(self, creds, size: int = 8, idle_timeout: float = 60,
+                 timeout: float = 30, response_cache=None, cache_scope: str = ""):
+        self.creds = creds
+        self.response_cache = response_cache
+        self.cache_scope = cache_scope
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._idle = []          # AuthorizedHttp libres
+        self._all = []
+        self._local = threading.local()
+        self.waits = 0
+        self.expired = 0
+
+    def _new(self) -> AuthorizedHttp:
+        http = AuthorizedHttp(self.creds, http=PooledHttp(
+            timeout=self.timeout, response_cache=self.response_cache,
+            cache_scope=self.cache_scope))
+        self._all.append(http)
+        return http
+
+    def _take(self) -> AuthorizedHttp:
+        """Un transporte libre; prioriza el último que usó este hilo."""
+        with self._cond:
+            while True:
+                last = getattr(self._local, "last", None)
+                if last is not None and last in self._idle:
+                    self._idle.remove(last)
+                    http = last
+                elif self._idle:
+                    http = self._idle.pop()
+                elif len(self._all) < self.size:
+                    http = self._new()
+                else:
+                    self.waits += 1
+                    self._cond.wait()
+                    continue
+                break
+        if time.monotonic() - http.http.last_used > self.idle_timeout:
+            if http.http.close_connections():
+                with self._cond:
+                    self.expired += 1
+        return http
+
+    def _give_back(self, http: AuthorizedHttp):
+        with self._cond:
+            self._idle.append(http)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self):
+        """
+        Transporte exclusivo del hilo durante el bloque. Un préstamo anidado
+        en el mismo hilo recibe el mismo objeto.
+        """
+        held = getattr(self._local, "held", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+        http = self._take()
+        self._local.held, self._local.depth = http, 0
+        try:
+            yield http
+        finally:
+            self._local.held = None
+            self._local.last = http
+            self._give_back(http)
+
+    def close(self):
+        """Cierra las conexiones de los transportes libres."""
+        with self._cond:
+            for http in self._idle:
+                http.http.close_connections()
+
+    def stats(self) -> dict:
+        """Tamaño, préstamos en curso y reutilización de conexiones."""
+        with self._cond:
+            requests = sum(h.http.requests for h in self._all)
+            reused = sum(h.http.reused for h in self._all)
+            return {
+                "size": self.size,
+                "idle_timeout": self.idle_timeout,
+                "transports": len(self._all),
+                "in_use": len(self._all) - len(self._idle),
+                "waits": self.waits,
+                "requests": requests,
+                "reused_connections": reused,
+                "new_connections": requests - reused,
+                "expired": self.expired,
+                "reuse_ratio": round(reused / requests, 3) if requests else 0.0,
+            }
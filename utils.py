@@ -1,12 +1,40 @@
-import isodate
+import re
+from functools import lru_cache
 
-def iso8601_to_seconds(duration_str: str) -> int:
+# Subconjunto ISO 8601 que usa YouTube: P[nW][nD][T[nH][nM][nS]]
+_DURATION = re.compile(
+    r"P(?:(\d+)W)?(?:(\d+)D)?(?:T(?=\d)(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?"
+)
+
+
+class DurationError(ValueError):
+    """La cadena no es una duración ISO 8601 válida."""
+
+
+@lru_cache(maxsize=8192)
+def parse_duration(duration_str: str) -> int:
+    """
+    Convierte una duración de YouTube ('PT5M30S', 'P1DT2H', 'P0D') a
+    segundos. Lanza DurationError si la cadena está mal formada.
+    """
+    m = _DURATION.fullmatch(duration_str) if isinstance(duration_str, str) else None
+    if m is None or duration_str == "P":
+        raise DurationError(f"Duración inválida: {duration_str!r}")
+    weeks, days, hours, minutes, seconds = m.groups()
+    return (int(weeks or 0) * 604800 + int(days or 0) * 86400
+            + int(hours or 0) * 3600 + int(minutes or 0) * 60
+            + int(float(seconds or 0)))
+
+
+def parse_durations(durations: dict) -> tuple[dict, dict]:
     """
-    Convierte una cadena ISO 8601 ('PT5M30S') a segundos.
-    Si falla, devuelve 0.
+    Convierte una página {videoId: duración} de una vez.
+    Devuelve ({videoId: segundos}, {videoId: mensaje de error}).
     """
-    try:
-        dur = isodate.parse_duration(duration_str)
-        return int(dur.total_seconds())
-    except Exception:
-        return 0
+    ok, errors = {}, {}
+    for vid, value in durations.items():
+        try:
+            ok[vid] = parse_duration(value)
+        except DurationError as e:
+            errors[vid] = str(e)
+    return ok, errors
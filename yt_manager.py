@@ -1,33 +1,126 @@
+import time
+
+_IMPORT_T0 = time.perf_counter()
+
 import os
+import itertools
+import json
 import pickle
-import time
+import threading
 import logging
 import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 
+from fields import FieldMask
+from journal import ADDED, FAILED, INFLIGHT, PENDING, SKIPPED, JobJournal
+from keywords import KeywordMatcher
 from logger import setup_logging
-from utils import iso8601_to_seconds
+from pipeline import Pipeline
+from quota import DAILY_LIMIT, QuotaExhausted, QuotaLedger, QuotaMeter, method_cost
+from rate_limit import get_rate_limiter, is_throttle_error, request_kind
+from retry import RetryPolicy, classify_error
+from storage import (ChannelSyncStore, HttpResponseCache, PlaylistMirrorStore,
+                     VideoMetadataCache)
+from transport import TransportPool
+from utils import DurationError, parse_duration, parse_durations
+
+# Tiempo que tarda en importarse este módulo (fase "import" del arranque)
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_T0
+
+
+class AuthRequired(Exception):
+    """No hay token válido y no se permite abrir el navegador para pedirlo."""
+
 
 class YouTubeManager:
     """
     Gestiona autenticación y llamadas a la API de YouTube.
     """
-    def __init__(self, token_path: str, scopes: list, log_queue=None):
+    # campo de caché → (part de videos().list, clave dentro del part)
+    VIDEO_FIELDS = {
+        "title": ("snippet", "title"),
+        "description": ("snippet", "description"),
+        "duration": ("contentDetails", "duration"),
+    }
+
+    # Campos que lee cada llamada; se piden con fields= (respuesta parcial)
+    FIELDS = {
+        "channel_details": FieldMask("items.snippet.title", "items.snippet.description",
+                                     "items.statistics.subscriberCount"),
+        "search_channels": FieldMask("items.id.kind", "items.id.channelId",
+                                     "items.snippet.title", "items.snippet.description"),
+        "uploads_playlist": FieldMask("items.contentDetails.relatedPlaylists.uploads"),
+        "upload_items": FieldMask("nextPageToken", "items.contentDetails.videoId",
+                                  "items.contentDetails.videoPublishedAt"),
+        "mirror_items": FieldMask("nextPageToken", "items.id",
+                                  "items.contentDetails.videoId"),
+        "playlist_version": FieldMask("items.etag", "items.contentDetails.itemCount"),
+        "list_playlists": FieldMask("items.id", "items.snippet.title",
+                                    "items.snippet.description",
+                                    "items.status.privacyStatus"),
+        "created": FieldMask("id"),
+    }
+
+    # Días que se conservan en el diario los trabajos terminados
+    JOURNAL_RETENTION_DAYS = 7
+
+    # Máximo de sub-peticiones por lote HTTP
+    BATCH_LIMIT = 50
+
+    # Un lock de escritura por playlist, compartido por todos los managers
+    _playlist_locks = {}
+    _playlist_locks_guard = threading.Lock()
+
+    # Documento de discovery en disco; se comparte entre instancias ya parseado
+    DISCOVERY_CACHE = "youtube_v3_discovery.json"
+    _discovery_doc = None
+    _discovery_lock = threading.Lock()
+
+    def __init__(self, token_path: str, scopes: list, log_queue=None,
+                 state_db: str = "ytmanager.db", rate_limiter=None,
+                 quota_limit: int = DAILY_LIMIT, pool_size: int = 8,
+                 idle_timeout: float = 60, interactive_auth: bool = True):
         # Logger con cola para GUI
         self.logger = setup_logging(log_queue=log_queue)
 
         self.token_path = token_path
         self.scopes = scopes
-        self.youtube = self._authenticate()
+        # False en la CLI: sin token válido se lanza AuthRequired en vez del navegador
+        self.interactive_auth = interactive_auth
+        self.state_db = state_db
+        self.metadata_cache = VideoMetadataCache(state_db)
+        self.channel_sync = ChannelSyncStore(state_db)
+        self.playlist_mirror = PlaylistMirrorStore(state_db)
+        self.http_cache = HttpResponseCache(state_db)
+        self.journal = JobJournal(state_db)
+        self.journal.purge(self.JOURNAL_RETENTION_DAYS)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.quota = QuotaMeter(QuotaLedger(state_db), quota_limit)
+        self._refresh_stop = threading.Event()
+        self._refresh_thread = None
+        self.creds = None
+        self._service = None
+        self._service_lock = threading.Lock()
+        self.timings = {"import": IMPORT_SECONDS, "auth": None, "build": None}
+        t0 = time.perf_counter()
+        self.creds = self._authenticate()
+        self.timings["auth"] = time.perf_counter() - t0
+        # httplib2 no es thread-safe: cada hilo usa su propio transporte del pool
+        self.transport = TransportPool(self.creds, size=pool_size,
+                                       idle_timeout=idle_timeout,
+                                       response_cache=self.http_cache,
+                                       cache_scope=os.path.abspath(token_path))
         self.MAX_RETRIES = 3
-        self.RETRY_DELAY = 5  # segundos entre reintentos
+        self.RETRY_DELAY = 5  # segundos base del backoff entre reintentos
+        self.OPERATION_DEADLINE = 300  # segundos máximos por llamada con reintentos
 
     def _authenticate(self):
-        """Carga o genera credenciales y devuelve el servicio."""
+        """Carga o genera credenciales y las devuelve."""
         creds = None
         secret_file = "client_secrets.json"
 
@@ -51,31 +144,249 @@ class YouTubeManager:
                     creds = None
 
             if not creds or not creds.valid:
+                if not self.interactive_auth:
+                    raise AuthRequired(
+                        f"Sin token válido en {self.token_path}; ejecutar `cli.py auth`.")
                 flow = InstalledAppFlow.from_client_secrets_file(secret_file, self.scopes)
                 creds = flow.run_local_server(port=0)
                 self.logger.info("Token obtenido por navegador.")
 
             # Guardo nuevo token
-            with open(self.token_path, 'wb') as f:
-                pickle.dump(creds, f)
-                self.logger.info("Token guardado en disco.")
+            self._save_token(creds)
 
-        # 3) Creo el servicio
+        return creds
+
+    @property
+    def youtube(self):
+        """Servicio de la API; se construye en el primer uso."""
+        if self._service is None:
+            with self._service_lock:
+                if self._service is None:
+                    self._service = self._build_service()
+        return self._service
+
+    @classmethod
+    def _load_discovery_doc(cls) -> dict | None:
+        """
+        Discovery de youtube v3 sin ir a la red: primero el archivo local,
+        si no el que trae empaquetado google-api-python-client.
+        """
+        with cls._discovery_lock:
+            if cls._discovery_doc is not None:
+                return cls._discovery_doc
+            raw = None
+            if os.path.exists(cls.DISCOVERY_CACHE):
+                with open(cls.DISCOVERY_CACHE, encoding="utf-8") as f:
+                    raw = f.read()
+            else:
+                try:
+                    from googleapiclient.discovery_cache import get_static_doc
+                    raw = get_static_doc("youtube", "v3")
+                except ImportError:
+                    raw = None
+                if raw:
+                    with open(cls.DISCOVERY_CACHE, "w", encoding="utf-8") as f:
+                        f.write(raw)
+            if raw:
+                cls._discovery_doc = json.loads(raw)
+            return cls._discovery_doc
+
+    def _build_service(self):
+        """Crea el servicio desde el discovery local y registra los tiempos."""
+        t0 = time.perf_counter()
         try:
-            svc = build('youtube', 'v3', credentials=creds)
-            self.logger.info("Servicio YouTube listo.")
-            return svc
+            from googleapiclient.discovery import build, build_from_document
+            doc = self._load_discovery_doc()
+            if doc:
+                svc = build_from_document(doc, credentials=self.creds)
+            else:
+                self.logger.warning("Sin discovery local; se descarga de la red.")
+                svc = build('youtube', 'v3', credentials=self.creds)
         except Exception as e:
             self.logger.critical(f"No pudo crear servicio: {e}")
             raise
+        self.timings["build"] = time.perf_counter() - t0
+        self.logger.info("Servicio YouTube listo.")
+        self.startup_report()
+        return svc
+
+    def startup_report(self) -> dict:
+        """Registra y devuelve los tiempos de arranque por fase (segundos)."""
+        parts = ", ".join(
+            f"{k} {v:.3f}s" if v is not None else f"{k} pendiente"
+            for k, v in self.timings.items()
+        )
+        self.logger.info(f"Arranque: {parts}")
+        return dict(self.timings)
+
+    def _save_token(self, creds):
+        with open(self.token_path, 'wb') as f:
+            pickle.dump(creds, f)
+            self.logger.info("Token guardado en disco.")
+
+    def _execute(self, request, deadline: float = None, fields: FieldMask = None):
+        """
+        Ejecuta una petición de la API aplicando la política de reintentos:
+        los errores transitorios se reintentan con backoff, los permanentes
+        se propagan enseguida. `fields` es la máscara con que se armó la
+        petición; en modo estricto la respuesta solo deja leer esos campos.
+        La cuota se cobra una vez por llamada, no por intento.
+        """
+        self.quota.charge(getattr(request, "methodId", ""))
+        policy = RetryPolicy(self.MAX_RETRIES, self.RETRY_DELAY,
+                             deadline=self.OPERATION_DEADLINE)
+
+        def on_retry(attempt, reason, wait):
+            self.logger.warning(f"{getattr(request, 'methodId', 'API')}: {reason} "
+                                f"(intento {attempt}); reintento en {wait:.1f}s.")
+
+        resp = policy.call(lambda: self._execute_once(request),
+                           on_retry=on_retry, deadline=deadline)
+        return fields.check(resp) if fields is not None else resp
+
+    def _execute_once(self, request):
+        """
+        Un intento: respeta el limitador y ejecuta con un transporte propio
+        del hilo.
+        """
+        kind = request_kind(request)
+        self.rate_limiter.acquire(kind)
+        try:
+            with self.transport.lease() as http:
+                resp = request.execute(http=http)
+        except Exception as e:
+            self._note_quota_error(e)
+            if is_throttle_error(e):
+                retry_after = None
+                try:
+                    retry_after = float(e.resp.get("retry-after"))
+                except (AttributeError, TypeError, ValueError):
+                    pass
+                pause = self.rate_limiter.on_throttle(kind, retry_after)
+                self.logger.warning(f"API saturada ({kind}); pausa de {pause:.0f}s.")
+            raise
+        self.rate_limiter.on_success(kind)
+        return resp
+
+    def _note_quota_error(self, exc):
+        """Si la API dice quotaExceeded, el ledger da el día por agotado."""
+        if classify_error(exc)[1] == "quotaExceeded":
+            self.quota.mark_exhausted()
+            self.logger.error("Cuota de API excedida.")
+
+    def _execute_batch(self, requests: list, deadline: float = None) -> dict:
+        """
+        Ejecuta [(clave, petición), ...] en lotes HTTP de hasta BATCH_LIMIT.
+        Devuelve {clave: (respuesta, excepción)}. Las sub-peticiones con error
+        transitorio se reintentan en rondas con la misma política de backoff;
+        la cuota se cobra solo en la primera ronda.
+        """
+        policy = RetryPolicy(self.MAX_RETRIES, self.RETRY_DELAY,
+                             deadline=self.OPERATION_DEADLINE)
+        deadline = deadline if deadline is not None else policy.deadline
+        results = {}
+        pending = list(requests)
+        start = time.monotonic()
+        attempt = 1
+        while pending:
+            retry = []
+            for i in range(0, len(pending), self.BATCH_LIMIT):
+                chunk = pending[i:i+self.BATCH_LIMIT]
+                keys = {str(n): key for n, (key, _) in enumerate(chunk)}
+
+                def callback(request_id, response, exception, keys=keys):
+                    results[keys[request_id]] = (response, exception)
+
+                batch = self.youtube.new_batch_http_request(callback=callback)
+                for n, (key, req) in enumerate(chunk):
+                    results.pop(key, None)
+                    batch.add(req, request_id=str(n))
+                try:
+                    if attempt == 1:
+                        self.quota.charge(getattr(chunk[0][1], "methodId", ""), len(chunk))
+                except QuotaExhausted as e:
+                    self.logger.error(str(e))
+                    for key, _ in chunk:
+                        results[key] = (None, e)
+                    continue
+                # Un lote es una sola petición HTTP para el limitador
+                kind = request_kind(chunk[0][1])
+                self.rate_limiter.acquire(kind)
+                try:
+                    with self.transport.lease() as http:
+                        batch.execute(http=http)
+                except Exception as e:
+                    for key, _ in chunk:
+                        results.setdefault(key, (None, e))
+                throttled = False
+                for key, req in chunk:
+                    exc = results[key][1]
+                    if exc is None:
+                        continue
+                    self._note_quota_error(exc)
+                    throttled = throttled or is_throttle_error(exc)
+                    if classify_error(exc)[0]:
+                        retry.append((key, req))
+                if throttled:
+                    self.rate_limiter.on_throttle(kind)
+                else:
+                    self.rate_limiter.on_success(kind)
+            if not retry or attempt >= policy.max_attempts:
+                break
+            wait = policy.delay(attempt)
+            if deadline is not None and time.monotonic() - start + wait > deadline:
+                break
+            self.logger.warning(f"Lote: {len(retry)} sub-peticiones con error transitorio "
+                                f"(intento {attempt}); reintento en {wait:.1f}s.")
+            time.sleep(wait)
+            attempt += 1
+            pending = retry
+        return results
+
+    def start_auto_refresh(self, margin: int = 300):
+        """
+        Refresca las credenciales en segundo plano `margin` segundos antes de
+        que expiren, para que ninguna llamada pague el refresh.
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+
+        def worker():
+            while not self._refresh_stop.is_set():
+                expiry = getattr(self.creds, "expiry", None)
+                if not expiry or not self.creds.refresh_token:
+                    return
+                wait = (expiry - datetime.utcnow()).total_seconds() - margin
+                if self._refresh_stop.wait(max(wait, 0)):
+                    return
+                try:
+                    self.creds.refresh(Request())
+                    self._save_token(self.creds)
+                    self.logger.info("Token refrescado en segundo plano.")
+                except Exception as e:
+                    self.logger.error(f"Refresh en segundo plano falló: {e}")
+                    self._refresh_stop.wait(60)
+
+        self._refresh_thread = threading.Thread(target=worker, daemon=True)
+        self._refresh_thread.start()
+
+    def stop_auto_refresh(self):
+        self._refresh_stop.set()
+
+    def close(self):
+        """Detiene el refresh en segundo plano y cierra las conexiones del pool."""
+        self.stop_auto_refresh()
+        self.transport.close()
 
     def get_channel_details(self, channel_id: str) -> dict:
         """Devuelve título, descripción y suscriptores."""
         try:
-            resp = self.youtube.channels().list(
+            mask = self.FIELDS["channel_details"]
+            resp = self._execute(self.youtube.channels().list(
                 part="snippet,statistics",
-                id=channel_id
-            ).execute()
+                id=channel_id,
+                fields=str(mask)
+            ), fields=mask)
             items = resp.get("items", [])
             if not items:
                 self.logger.warning("Canal no encontrado.")
@@ -107,7 +418,9 @@ class YouTubeManager:
             if published_before:
                 params["publishedBefore"] = published_before
 
-            resp = self.youtube.search().list(**params).execute()
+            mask = self.FIELDS["search_channels"]
+            params["fields"] = str(mask)
+            resp = self._execute(self.youtube.search().list(**params), fields=mask)
             items = resp.get("items", [])
             results = []
             for it in items:
@@ -125,161 +438,774 @@ class YouTubeManager:
                 })
             self.logger.info(f"Encontrados {len(results)} canales para '{query}'")
             return results
+        except QuotaExhausted as e:
+            self.logger.error(f"Búsqueda omitida: {e}")
+            return []
         except HttpError as e:
-            content = e.content.decode("utf-8") if hasattr(e, "content") else ""
-            if "quotaExceeded" in content:
-                self.logger.error("Cuota de API excedida.")
-            else:
+            # quotaExceeded ya quedó registrado en _execute
+            if classify_error(e)[1] != "quotaExceeded":
                 self.logger.error(f"Error HTTP en búsqueda: {e}")
             return []
         except Exception as e:
             self.logger.error(f"Error en búsqueda: {e}")
             return []
 
-    def get_video_ids_from_channel(self, channel_id: str) -> set:
-        """Recupera todos los IDs de video del canal."""
+    # ------------------------------------------------------------------ #
+    # Lectura paginada en streaming
+    # ------------------------------------------------------------------ #
+    def iter_playlist_items(self, playlist_id: str, part: str = "contentDetails",
+                            fields: FieldMask = None):
+        """
+        Genera los items de una playlist página a página. Cada página se pide
+        solo cuando el consumidor terminó la anterior, así que se puede
+        cortar en cualquier momento sin pagar las siguientes.
+        Por defecto solo trae videoId y fecha de publicación.
+        """
+        mask = fields or self.FIELDS["upload_items"]
+        token = None
+        while True:
+            r = self._execute(self.youtube.playlistItems().list(
+                part=part,
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=token,
+                fields=str(mask)
+            ), fields=mask)
+            yield from r.get("items", [])
+            token = r.get("nextPageToken")
+            if not token:
+                return
+
+    def uploads_playlist_id(self, channel_id: str, use_checkpoint: bool = True) -> str:
+        """Playlist de uploads del canal ('' si el canal no existe)."""
+        cp = self.channel_sync.get_checkpoint(channel_id) if use_checkpoint else None
+        if cp:
+            return cp["uploads_playlist_id"]
+        mask = self.FIELDS["uploads_playlist"]
+        resp = self._execute(self.youtube.channels().list(
+            part='contentDetails',
+            id=channel_id,
+            fields=str(mask)
+        ), fields=mask)
+        items = resp.get('items', [])
+        if not items:
+            return ""
+        return items[0]['contentDetails']['relatedPlaylists']['uploads']
+
+    def iter_channel_uploads(self, channel_id: str):
+        """Genera los items de uploads del canal, del más nuevo al más viejo."""
+        uploads_pl = self.uploads_playlist_id(channel_id)
+        if uploads_pl:
+            yield from self.iter_playlist_items(uploads_pl)
+
+    def iter_videos(self, video_ids, fields=("title", "description", "duration")):
+        """
+        Genera (videoId, {campo: valor}) en bloques de 50: lo que está en la
+        caché local sale directo y solo los faltantes se piden a la API.
+        Acepta cualquier iterable de IDs, incluso otro generador.
+        """
+        parts = ",".join(sorted({self.VIDEO_FIELDS[f][0] for f in fields}))
+        mask = FieldMask("items.id", *(f"items.{part}.{key}" for part, key in
+                                       (self.VIDEO_FIELDS[f] for f in fields)))
+        chunk = []
+        cached = requested = 0
+        for vid in itertools.chain(video_ids, [None]):
+            if vid is not None:
+                chunk.append(vid)
+                if len(chunk) < 50:
+                    continue
+            if not chunk:
+                break
+            found, missing = self.metadata_cache.get_many(chunk, fields)
+            chunk = []
+            cached += len(found)
+            yield from found.items()
+            if not missing:
+                continue
+            requested += len(missing)
+            try:
+                resp = self._execute(self.youtube.videos().list(
+                    part=parts,
+                    id=",".join(missing),
+                    fields=str(mask)
+                ), fields=mask)
+            except Exception as e:
+                self.logger.error(f"Error obteniendo metadatos: {e}")
+                continue
+            fetched = {}
+            for it in resp.get("items", []):
+                fetched[it["id"]] = {
+                    f: it.get(self.VIDEO_FIELDS[f][0], {}).get(self.VIDEO_FIELDS[f][1], "")
+                    for f in fields
+                }
+            self.metadata_cache.put_many(fetched)
+            yield from fetched.items()
+        if cached or requested:
+            self.logger.info(f"Metadatos: {cached} en caché, {requested} pedidos a la API.")
+
+    def iter_channel_video_ids(self, channel_id: str, full_resync: bool = False):
+        """
+        Genera los IDs del canal: primero los nuevos, a medida que llegan las
+        páginas de uploads, y después los que ya conocía el checkpoint.
+        Con checkpoint solo pagina hasta el primer video conocido (por ID:
+        un video viejo que se hizo público tarde trae una fecha anterior al
+        checkpoint y aun así es nuevo); el checkpoint se guarda únicamente
+        si el recorrido llega al final.
+        """
+        cp = None if full_resync else self.channel_sync.get_checkpoint(channel_id)
+        uploads_pl = self.uploads_playlist_id(channel_id, use_checkpoint=bool(cp))
+        if not uploads_pl:
+            self.logger.warning("Canal sin detalles de uploads.")
+            return
+        known = self.channel_sync.known_video_ids(channel_id) if cp else set()
+        new_items = []
+        # uploads viene del más nuevo al más viejo
+        for it in self.iter_playlist_items(uploads_pl):
+            vid = it['contentDetails']['videoId']
+            pub = it['contentDetails'].get('videoPublishedAt', '')
+            if cp and (vid in known or vid == cp["newest_video_id"]):
+                break
+            new_items.append((vid, pub))
+            yield vid
+        self.channel_sync.save(channel_id, uploads_pl, new_items, full=not cp)
+        new_ids = {vid for vid, _ in new_items}
+        self.logger.info(f"Canal {channel_id} tiene {len(known | new_ids)} videos "
+                         f"({len(new_items)} nuevos desde el último checkpoint).")
+        yield from known - new_ids
+
+    def get_video_ids_from_channel(self, channel_id: str, full_resync: bool = False) -> set:
+        """
+        Recupera todos los IDs de video del canal.
+        full_resync=True ignora el checkpoint y lo reconstruye.
+        """
         ids = set()
         try:
-            resp = self.youtube.channels().list(
-                part='contentDetails',
-                id=channel_id
-            ).execute()
-            items = resp.get('items', [])
-            if not items:
-                self.logger.warning("Canal sin detalles de uploads.")
-                return ids
-            uploads_pl = items[0]['contentDetails']['relatedPlaylists']['uploads']
-            token = None
-            while True:
-                r = self.youtube.playlistItems().list(
-                    part='contentDetails',
-                    playlistId=uploads_pl,
-                    maxResults=50,
-                    pageToken=token
-                ).execute()
-                for it in r.get('items', []):
-                    ids.add(it['contentDetails']['videoId'])
-                token = r.get('nextPageToken')
-                if not token:
-                    break
-                time.sleep(1)
-            self.logger.info(f"Canal {channel_id} tiene {len(ids)} videos.")
+            ids = set(self.iter_channel_video_ids(channel_id, full_resync))
         except Exception as e:
             self.logger.error(f"Error obteniendo videos canal: {e}")
         return ids
 
+    def get_playlist_mirror(self, playlist_id: str) -> dict:
+        """
+        Membresía {videoId: playlistItemId} de la playlist. El mirror local
+        se usa solo si su etag es el que devuelve la API; si no coincide o
+        quedó en NULL (escrituras propias que _revalidate_mirror no pudo
+        confirmar), se re-pagina y se guarda el etag nuevo. Para un cambio
+        externo el itemCount solo no alcanza: puede quedar igual.
+        """
+        version = self._playlist_version(playlist_id)
+        if version is None:
+            self.logger.warning(f"Playlist {playlist_id} no encontrada.")
+            return {}
+        etag, item_count = version
+
+        mirror = self.playlist_mirror.get(playlist_id)
+        if mirror and etag and mirror["etag"] == etag:
+            return mirror["items"]
+
+        mapping = {}
+        for it in self.iter_playlist_items(playlist_id, part="id,contentDetails",
+                                           fields=self.FIELDS["mirror_items"]):
+            mapping.setdefault(it["contentDetails"]["videoId"], it["id"])
+        self.playlist_mirror.replace(playlist_id, mapping, etag, item_count)
+        self.logger.info(f"Mirror de playlist {playlist_id} recargado.")
+        return mapping
+
+    def _playlist_version(self, playlist_id: str) -> tuple | None:
+        """(etag, itemCount) de la playlist (1 unidad); None si no existe."""
+        mask = self.FIELDS["playlist_version"]
+        r = self._execute(self.youtube.playlists().list(
+            part="contentDetails",
+            id=playlist_id,
+            fields=str(mask)
+        ), fields=mask)
+        items = r.get("items", [])
+        if not items:
+            return None
+        return items[0].get("etag"), items[0]["contentDetails"]["itemCount"]
+
+    def _revalidate_mirror(self, playlist_id: str):
+        """
+        Después de un lote de escrituras propias (que ya se aplicaron al
+        mirror): si el itemCount de la API coincide con el del mirror se
+        adopta el etag nuevo y el mirror sigue sirviendo sin re-paginar.
+        Si no coincide queda invalidado y el próximo uso re-pagina.
+        """
+        try:
+            version = self._playlist_version(playlist_id)
+        except Exception as e:
+            self.logger.warning(f"No se pudo revalidar el mirror de {playlist_id}: {e}")
+            return
+        if version and self.playlist_mirror.adopt_etag(playlist_id, *version):
+            return
+        self.logger.info(f"Mirror de {playlist_id} sin revalidar: se recarga en el "
+                         f"próximo uso.")
+
     def get_existing_videos_from_playlist(self, playlist_id: str) -> set:
         """IDs de videos ya en la playlist."""
         ids = set()
         try:
-            token = None
-            while True:
-                r = self.youtube.playlistItems().list(
-                    part="contentDetails",
-                    playlistId=playlist_id,
-                    maxResults=50,
-                    pageToken=token
-                ).execute()
-                for it in r.get("items", []):
-                    ids.add(it["contentDetails"]["videoId"])
-                token = r.get("nextPageToken")
-                if not token:
-                    break
-                time.sleep(1)
+            ids = set(self.get_playlist_mirror(playlist_id))
             self.logger.info(f"Playlist {playlist_id} tenía {len(ids)} videos.")
         except Exception as e:
             self.logger.error(f"Error leyendo playlist: {e}")
         return ids
 
-    def filter_videos(self, video_ids: set, exclude_keywords: list = [],
-                      min_duration=None, max_duration=None) -> set:
-        """Filtra según palabras clave y duración (en segundos)."""
-        out = set()
-        vids = list(video_ids)
-        for i in range(0, len(vids), 50):
-            chunk = vids[i:i+50]
+    def get_video_metadata(self, video_ids, fields=("title", "description", "duration")) -> dict:
+        """
+        Metadatos {videoId: {campo: valor}}. Se leen primero de la caché
+        local; solo los faltantes se piden a la API en lotes de 50.
+        """
+        return dict(self.iter_videos(video_ids, fields))
+
+    @staticmethod
+    def video_passes_filter(meta: dict, exclude_keywords=(),
+                            min_duration=None, max_duration=None,
+                            include_keywords=(), whole_word: bool = False,
+                            accent_insensitive: bool = False, seconds: int = None) -> bool:
+        """
+        True si el video (metadatos de iter_videos) pasa los filtros.
+        Las listas de palabras pueden venir ya compiladas (KeywordMatcher);
+        si no, se compilan una vez y se reutilizan entre llamadas.
+        `seconds` es la duración ya convertida, si quien llama la tiene.
+        """
+        title = meta["title"]
+        desc = meta["description"]
+        exclude = KeywordMatcher.compile(exclude_keywords, whole_word, accent_insensitive)
+        if exclude and exclude.search(title, desc):
+            return False
+        include = KeywordMatcher.compile(include_keywords, whole_word, accent_insensitive)
+        if include and not include.search(title, desc):
+            return False
+        if min_duration or max_duration:
+            # Una duración ilegible no puede cumplir un rango
             try:
-                resp = self.youtube.videos().list(
-                    part="snippet,contentDetails",
-                    id=",".join(chunk)
-                ).execute()
-                for it in resp.get("items", []):
-                    vid = it["id"]
-                    title = it["snippet"]["title"]
-                    desc = it["snippet"]["description"]
-                    dur = iso8601_to_seconds(it["contentDetails"]["duration"])
-                    if any(kw.lower() in title.lower() or kw.lower() in desc.lower() for kw in exclude_keywords):
-                        continue
-                    if min_duration and dur < min_duration:
-                        continue
-                    if max_duration and dur > max_duration:
-                        continue
-                    out.add(vid)
-            except Exception as e:
-                self.logger.error(f"Error filtrando videos: {e}")
-        return out
+                dur = seconds if seconds is not None else parse_duration(meta["duration"])
+            except DurationError:
+                return False
+            if min_duration and dur < min_duration:
+                return False
+            if max_duration and dur > max_duration:
+                return False
+        return True
+
+    def iter_filtered(self, video_ids, filter_kwargs=None):
+        """Genera los IDs que pasan filter_kwargs (sin filtros, todos)."""
+        if not filter_kwargs:
+            yield from video_ids
+            return
+        fk = dict(filter_kwargs)
+        whole, accents = fk.pop("whole_word", False), fk.pop("accent_insensitive", False)
+        exclude = KeywordMatcher.compile(fk.pop("exclude_keywords", ()), whole, accents)
+        include = KeywordMatcher.compile(fk.pop("include_keywords", ()), whole, accents)
+        videos = self.iter_videos(video_ids)
+        while True:
+            page = dict(itertools.islice(videos, 50))
+            if not page:
+                return
+            seconds, errors = {}, {}
+            if fk.get("min_duration") or fk.get("max_duration"):
+                seconds, errors = parse_durations({v: m["duration"] for v, m in page.items()})
+                if errors:
+                    self.logger.warning(f"{len(errors)} videos con duración inválida "
+                                        f"quedan fuera del filtro: {', '.join(errors)}")
+            for vid, meta in page.items():
+                if vid in errors:
+                    continue
+                if self.video_passes_filter(meta, exclude, include_keywords=include,
+                                            seconds=seconds.get(vid), **fk):
+                    yield vid
+
+    def filter_videos(self, video_ids: set, exclude_keywords=(), min_duration=None,
+                      max_duration=None, include_keywords=(), whole_word: bool = False,
+                      accent_insensitive: bool = False) -> set:
+        """Filtra según palabras clave y duración (en segundos)."""
+        return set(self.iter_filtered(video_ids, {
+            "exclude_keywords": exclude_keywords,
+            "include_keywords": include_keywords,
+            "min_duration": min_duration,
+            "max_duration": max_duration,
+            "whole_word": whole_word,
+            "accent_insensitive": accent_insensitive,
+        }))
 
     def add_videos_to_playlist(self, playlist_id: str, video_ids: set,
                                batch_size: int = 20, progress_callback=None,
-                               cancel_callback=None):
-        """Agrega videos en lotes, con reintentos y callback de progreso."""
+                               cancel_callback=None) -> dict:
+        """
+        Agrega videos en lotes HTTP (batch_size por lote, máx. BATCH_LIMIT),
+        con reintentos y callback de progreso.
+        Devuelve {"added": [ids], "skipped": [...], "failed": [...]}; los
+        omitidos y fallidos van como {"videoId", "reason"}.
+        """
+        result = {"added": [], "skipped": [], "failed": []}
         if not video_ids:
             self.logger.info("No hay videos nuevos para agregar.")
-            return
+            return result
         self.logger.info(f"Agregando {len(video_ids)} videos a {playlist_id}")
         vids = list(video_ids)
+        batch_size = max(1, min(batch_size, self.BATCH_LIMIT))
+        mirror = self.playlist_mirror.get(playlist_id)
+        known = mirror["items"] if mirror else {}
         total_batches = math.ceil(len(vids) / batch_size)
-        added, failed = [], []
+        done = 0
         for idx, start in enumerate(range(0, len(vids), batch_size)):
             if cancel_callback and cancel_callback():
                 self.logger.info("Operación cancelada.")
                 break
             batch = vids[start:start+batch_size]
-            for vid in batch:
-                if cancel_callback and cancel_callback():
-                    break
-                for attempt in range(1, self.MAX_RETRIES+1):
-                    try:
-                        body = {
-                            "snippet": {
-                                "playlistId": playlist_id,
-                                "resourceId": {"kind": "youtube#video", "videoId": vid}
-                            }
-                        }
-                        r = self.youtube.playlistItems().insert(
-                            part="snippet", body=body
-                        ).execute()
-                        if r.get("id"):
-                            added.append(vid)
-                            self.logger.info(f"Video {vid} agregado.")
-                            break
-                    except Exception as e:
-                        self.logger.error(f"Error agregando {vid} (intento {attempt}): {e}")
-                        time.sleep(self.RETRY_DELAY)
+            done = start + len(batch)
+            self._insert_batch(playlist_id, batch, result, known)
             if progress_callback:
                 progress_callback(((idx+1)/total_batches)*100)
-            time.sleep(15)
-        self.logger.info(f"Resumen: total={len(video_ids)}, agregados={len(added)}, fallidos={len(failed)}")
+        for vid in vids[done:]:
+            result["skipped"].append({"videoId": vid, "reason": "cancelled"})
+        self.logger.info(f"Resumen: total={len(video_ids)}, agregados={len(result['added'])}, "
+                         f"omitidos={len(result['skipped'])}, fallidos={len(result['failed'])}")
+        for f in result["failed"]:
+            self.logger.info(f"  Fallido {f['videoId']}: {f['reason']}")
+        return result
+
+    @classmethod
+    def _playlist_lock(cls, playlist_id: str) -> threading.Lock:
+        """Lock que serializa las escrituras sobre una misma playlist."""
+        with cls._playlist_locks_guard:
+            return cls._playlist_locks.setdefault(playlist_id, threading.Lock())
+
+    def _insert_batch(self, playlist_id: str, batch: list, result: dict, known=()):
+        """Inserta un lote HTTP de videos y anota cada resultado en `result`."""
+        with self._playlist_lock(playlist_id):
+            added = len(result["added"])
+            self._insert_batch_locked(playlist_id, batch, result, known)
+            if len(result["added"]) > added:
+                self._revalidate_mirror(playlist_id)
+
+    def _insert_batch_locked(self, playlist_id: str, batch: list, result: dict, known=()):
+        requests = []
+        for vid in batch:
+            if vid in known:
+                result["skipped"].append({"videoId": vid, "reason": "already_in_playlist"})
+                continue
+            body = {
+                "snippet": {
+                    "playlistId": playlist_id,
+                    "resourceId": {"kind": "youtube#video", "videoId": vid}
+                }
+            }
+            requests.append((vid, self.youtube.playlistItems().insert(
+                part="snippet", body=body, fields=str(self.FIELDS["created"])
+            )))
+        outcome = self._execute_batch(requests)
+        for vid, _ in requests:
+            r, exc = outcome[vid]
+            if exc is not None:
+                _, reason = classify_error(exc)
+                result["failed"].append({"videoId": vid, "reason": reason})
+                self.logger.error(f"Error agregando {vid}: {reason}")
+            elif r and r.get("id"):
+                result["added"].append(vid)
+                self.playlist_mirror.add(playlist_id, vid, r["id"])
+                self.logger.info(f"Video {vid} agregado.")
+            else:
+                result["failed"].append({"videoId": vid, "reason": "empty_response"})
+
+    def _insert_journaled(self, job_id: str, playlist_id: str, batch: list, result: dict,
+                          known=()):
+        """_insert_batch con el lote anotado en el diario antes y después."""
+        part = {"added": [], "skipped": [], "failed": []}
+        self.journal.mark_inflight(job_id, batch)
+        self._insert_batch(playlist_id, batch, part, known)
+        self.journal.record(job_id, part)
+        for key, items in part.items():
+            result[key] += items
+
+    def _insert_batches(self, job_id: str, playlist_id: str, ids, batch_size: int,
+                        result: dict, known=()):
+        """
+        Inserta `ids` en lotes con diario y control de cuota; genera cuántos
+        videos se procesaron tras cada lote. Los de `known` (ya en la
+        playlist) se omiten sin gastar cuota. Cuando la cuota no alcanza, el
+        resto se sigue consumiendo como diferido (pendiente en el diario),
+        así el plan queda completo y la próxima ejecución no relee nada.
+        """
+        insert_cost = method_cost("playlistItems.insert")
+        exhausted = False
+        batch = []
+        for vid in itertools.chain(ids, [None]):
+            if vid is not None:
+                batch.append(vid)
+                if len(batch) < batch_size:
+                    continue
+            if not batch:
+                break
+            fits = 0 if exhausted else self.quota.remaining() // insert_cost
+            if fits < len(batch):
+                result["skipped"] += [{"videoId": v, "reason": "quota_deferred"}
+                                      for v in batch[fits:]]
+                if not exhausted:
+                    self.logger.warning("Cuota insuficiente: el resto queda para otra ejecución.")
+                exhausted = True
+                batch = batch[:fits]
+            if batch:
+                self._insert_journaled(job_id, playlist_id, batch, result, known)
+            yield len(batch)
+            batch = []
+
+    def plan_batch(self, channel_ids: list, playlist_id: str, filter_kwargs=None,
+                   full_resync: bool = False, cancel_callback=None,
+                   max_workers: int = 4, exclude=()) -> dict:
+        """
+        Plan único de un batch hacia una playlist: lee y filtra todos los
+        canales en paralelo, deduplica los candidatos entre canales (gana el
+        primer canal de la lista), los compara una sola vez contra el mirror
+        de la playlist y arma un orden de inserción. Lo que no entra en la
+        cuota restante queda en "deferred". Los videos de `exclude` (fallos
+        permanentes de trabajos anteriores) no se planifican.
+        """
+        used_before = self.quota.used()
+        channel_ids = list(dict.fromkeys(channel_ids))
+
+        def read(cid):
+            out = []
+            for vid in self.iter_filtered(self.iter_channel_video_ids(cid, full_resync),
+                                          filter_kwargs):
+                if cancel_callback and cancel_callback():
+                    break
+                out.append(vid)
+            return out
+
+        candidates, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(read, cid): cid for cid in channel_ids}
+            for fut in as_completed(futures):
+                cid = futures[fut]
+                try:
+                    candidates[cid] = fut.result()
+                except Exception as e:
+                    errors[cid] = str(e)
+                    self.logger.error(f"Error leyendo canal {cid}: {e}")
+
+        existing = self.get_playlist_mirror(playlist_id) if candidates else {}
+        owner = {}
+        channels = {}
+        for cid in channel_ids:
+            entry = {"candidates": len(candidates.get(cid, [])), "planned": 0,
+                     "duplicates": 0, "already_in_playlist": 0, "failed_before": 0,
+                     "error": errors.get(cid)}
+            channels[cid] = entry
+            for vid in candidates.get(cid, []):
+                if vid in existing:
+                    entry["already_in_playlist"] += 1
+                elif vid in exclude:
+                    entry["failed_before"] += 1
+                elif vid in owner:
+                    entry["duplicates"] += 1
+                else:
+                    owner[vid] = cid
+                    entry["planned"] += 1
+
+        order = list(owner)
+        cost = method_cost("playlistItems.insert")
+        budget = self.quota.remaining() // cost
+        deferred = order[budget:]
+        if deferred:
+            self.logger.warning(f"Cuota insuficiente: {len(deferred)} videos quedan "
+                                f"para otra ejecución.")
+        dupes = sum(c["duplicates"] for c in channels.values())
+        self.logger.info(f"Plan batch: {len(order)} videos a insertar de "
+                         f"{len(channel_ids)} canales ({dupes} repetidos entre canales).")
+        return {
+            "playlist_id": playlist_id,
+            "order": order,
+            "owner": owner,
+            "deferred": deferred,
+            "channels": channels,
+            "read_units": self.quota.used() - used_before,
+            "insert_units": (len(order) - len(deferred)) * cost,
+            "remaining": self.quota.remaining(),
+        }
 
     def process_channel(self, channel_id: str, playlist_id: str, batch_size: int = 20,
-                        progress_callback=None, cancel_callback=None, filter_kwargs=None):
-        """Flujo: tomar videos de canal, filtrar, comparar con playlist y agregar."""
+                        progress_callback=None, cancel_callback=None, filter_kwargs=None,
+                        full_resync: bool = False, queue_size: int = 200) -> dict:
+        """
+        Flujo en pipeline: uploads → metadatos y filtro → dedup contra la
+        playlist → inserts. Las etapas corren a la vez, unidas por colas
+        acotadas, así el primer lote se inserta apenas está completo.
+        La etapa de dedup arma el plan y proyecta su costo: un video entra
+        a la cola de inserts solo si su insert, sumado a los planificados
+        que aún no se insertaron, cabe en la cuota restante; si no, queda
+        diferido (pendiente en el diario) antes de gastar nada en él.
+        Devuelve {"added", "skipped", "failed", "job_id", "plan", "error"};
+        "error" es None o el mensaje del error que cortó el proceso.
+        """
         self.logger.info(f"Procesando canal {channel_id} → {playlist_id}")
-        vids = self.get_video_ids_from_channel(channel_id)
-        if not vids:
-            self.logger.info("No hay videos en el canal.")
+        batch_size = max(1, min(batch_size, self.BATCH_LIMIT))
+        job_args = ("channel", [channel_id], playlist_id, filter_kwargs)
+        job_id = self.journal.find_open(*job_args)
+        if job_id and full_resync:
+            self.journal.abandon(job_id)
+            job_id = None
+        if job_id and self.journal.get(job_id)["planned"]:
+            self.logger.info(f"Reanudando trabajo {job_id} sin releer el canal.")
+            return self.resume_job(job_id, batch_size, progress_callback, cancel_callback)
+        if job_id:
+            self.logger.info(f"Reanudando trabajo {job_id} (plan incompleto: se relee el canal).")
+            self._settle_inflight(job_id, playlist_id)
+        else:
+            job_id = self.journal.create(*job_args)
+        done_before = set(self.journal.video_ids(job_id, ADDED, SKIPPED, FAILED))
+        if not full_resync:
+            # Fallos permanentes de trabajos anteriores: no se reintentan
+            done_before |= set(self.journal.permanent_failures(playlist_id))
+        result = {"added": [], "skipped": [], "failed": [], "job_id": job_id,
+                  "plan": None, "error": None}
+        counts = {"found": 0, "done": 0}
+        insert_cost = method_cost("playlistItems.insert")
+
+        def enrich(ids):
+            yield from self.iter_filtered(ids, filter_kwargs)
+
+        def dedup(ids):
+            existing = self.get_playlist_mirror(playlist_id)
+            seen = set()
+            planned, deferred = [], []
+            for vid in itertools.chain(ids, [None]):
+                if vid is not None:
+                    if vid in existing or vid in seen or vid in done_before:
+                        continue
+                    seen.add(vid)
+                    planned.append(vid)
+                    if len(planned) < batch_size:
+                        continue
+                if not planned:
+                    break
+                # Proyección: lo planificado sin insertar más este lote, contra la cuota
+                outstanding = counts["found"] - counts["done"]
+                fits = 0 if deferred else max(
+                    0, self.quota.remaining() // insert_cost - outstanding)
+                if fits < len(planned) and not deferred:
+                    self.logger.warning("Cuota insuficiente según el plan: "
+                                        "el resto queda para otra ejecución.")
+                deferred += planned[fits:]
+                counts["found"] += min(fits, len(planned))
+                # El plan se anota (un lote por transacción) antes de que esos
+                # videos lleguen a insertarse; los diferidos quedan pendientes
+                self.journal.add_planned(job_id, planned, channel_id)
+                yield from planned[:fits]
+                planned = []
+            result["skipped"] += [{"videoId": v, "reason": "quota_deferred"} for v in deferred]
+            result["plan"] = {"to_add": counts["found"], "deferred": len(deferred),
+                              "insert_units": counts["found"] * insert_cost}
+            self.logger.info(f"Plan del canal {channel_id}: {counts['found']} videos "
+                             f"({counts['found'] * insert_cost} unidades de insert), "
+                             f"{len(deferred)} diferidos por cuota.")
+            if not pipe.cancelled():
+                self.journal.mark_planned(job_id)
+
+        def insert(ids):
+            for n in self._insert_batches(job_id, playlist_id, ids, batch_size, result):
+                counts["done"] += n
+                if progress_callback:
+                    progress_callback(counts["done"] / max(counts["found"], 1) * 100)
+                yield
+
+        pipe = Pipeline(
+            self.iter_channel_video_ids(channel_id, full_resync),
+            enrich, dedup, insert,
+            maxsize=queue_size, cancel_callback=cancel_callback
+        )
+        try:
+            for _ in pipe:
+                pass
+        except Exception as e:
+            result["error"] = str(e)
+            self.logger.error(f"Error procesando canal {channel_id}: {e}")
+        if cancel_callback and cancel_callback():
+            self.logger.info("Operación cancelada.")
+        return self._finish_job(job_id, result)
+
+    def _finish_job(self, job_id: str, result: dict) -> dict:
+        status = self.journal.finish(job_id)
+        self.logger.info(f"Resumen: agregados={len(result['added'])}, "
+                         f"omitidos={len(result['skipped'])}, fallidos={len(result['failed'])}")
+        for f in result["failed"]:
+            self.logger.info(f"  Fallido {f['videoId']}: {f['reason']}")
+        if status != "completed":
+            self.logger.info(f"Trabajo {job_id} con pendientes: se retoma en la próxima ejecución.")
+        return result
+
+    def resume_job(self, job_id: str, batch_size: int = 20, progress_callback=None,
+                   cancel_callback=None) -> dict:
+        """
+        Retoma un trabajo del diario con plan completo: solo inserta lo
+        pendiente, sin releer canal ni filtros. Los videos que quedaron
+        `inflight` (corte con el lote en vuelo) se confirman contra el mirror,
+        y los pendientes que otro trabajo ya agregó se omiten.
+        """
+        job = self.journal.get(job_id)
+        if job is None:
+            raise ValueError(f"Trabajo inexistente: {job_id}")
+        playlist_id = job["playlist_id"]
+        batch_size = max(1, min(batch_size, self.BATCH_LIMIT))
+        result = {"added": [], "skipped": [], "failed": [], "job_id": job_id,
+                  "plan": None, "error": None}
+
+        self._settle_inflight(job_id, playlist_id)
+        # El plan puede ser viejo: otro trabajo o batch pudo agregar ya
+        # algunos pendientes a la playlist
+        known = self.get_playlist_mirror(playlist_id)
+        pending = self.journal.video_ids(job_id, PENDING)
+        present = {"skipped": [{"videoId": v, "reason": "already_in_playlist"}
+                               for v in pending if v in known]}
+        if present["skipped"]:
+            self.journal.record(job_id, present)
+            result["skipped"] += present["skipped"]
+            pending = [v for v in pending if v not in known]
+        self.logger.info(f"Trabajo {job_id}: {len(pending)} videos pendientes → {playlist_id}")
+
+        def ids():
+            for vid in pending:
+                if cancel_callback and cancel_callback():
+                    self.logger.info("Operación cancelada.")
+                    return
+                yield vid
+
+        done = 0
+        for n in self._insert_batches(job_id, playlist_id, ids(), batch_size, result, known):
+            done += n
+            if progress_callback:
+                progress_callback(done / max(len(pending), 1) * 100)
+        return self._finish_job(job_id, result)
+
+    def _settle_inflight(self, job_id: str, playlist_id: str):
+        """
+        Videos de un lote cortado en vuelo: los que llegaron a la playlist
+        quedan como agregados, el resto vuelve a pendiente.
+        """
+        inflight = self.journal.video_ids(job_id, INFLIGHT)
+        if not inflight:
             return
-        if filter_kwargs:
-            vids = self.filter_videos(
-                vids,
-                exclude_keywords=filter_kwargs.get("exclude_keywords", []),
-                min_duration=filter_kwargs.get("min_duration"),
-                max_duration=filter_kwargs.get("max_duration")
-            )
-        existing = self.get_existing_videos_from_playlist(playlist_id)
-        to_add = vids - existing
-        self.logger.info(f"Videos nuevos a agregar: {len(to_add)}")
-        self.add_videos_to_playlist(playlist_id, to_add, batch_size, progress_callback, cancel_callback)
+        existing = self.get_playlist_mirror(playlist_id)
+        landed = [v for v in inflight if v in existing]
+        self.journal.record(job_id, {"added": landed})
+        self.journal.reset_pending(job_id, [v for v in inflight if v not in existing])
+        self.logger.info(f"Lote interrumpido: {len(landed)}/{len(inflight)} ya estaban "
+                         f"en la playlist.")
+
+    def list_jobs(self, status: str = None) -> list:
+        """Trabajos del diario con el conteo de videos por estado."""
+        return self.journal.list_jobs(status)
+
+    def purge_jobs(self, older_than_days: float = 0) -> int:
+        """Borra del diario los trabajos terminados o abandonados."""
+        n = self.journal.purge(older_than_days)
+        self.logger.info(f"Diario: {n} trabajos terminados eliminados.")
+        return n
+
+    def process_batch(self, channel_ids: list, playlist_id: str, batch_size: int = 20,
+                      progress_callback=None, cancel_callback=None, filter_kwargs=None,
+                      full_resync: bool = False, max_workers: int = 4) -> dict:
+        """
+        Procesa varios canales hacia una playlist con un único plan
+        (plan_batch): lecturas en paralelo, dedup global y una sola
+        comparación contra la playlist; después, los inserts en el orden del
+        plan. El plan queda en el diario, así un batch cortado se retoma sin
+        releer los canales.
+        Devuelve un reporte con el resultado de cada canal y los totales.
+        """
+        t0 = time.monotonic()
+        batch_size = max(1, min(batch_size, self.BATCH_LIMIT))
+        job_args = ("batch", channel_ids, playlist_id, filter_kwargs)
+        job_id = self.journal.find_open(*job_args)
+        if job_id and full_resync:
+            self.journal.abandon(job_id)
+            job_id = None
+        job = self.journal.get(job_id) if job_id else None
+        report = {"playlist_id": playlist_id, "job_id": job_id, "channels": {}}
+
+        if job and job["planned"]:
+            self.logger.info(f"Reanudando batch {job_id} sin releer los canales.")
+            owner = self.journal.video_owners(job_id)
+            channels = {cid: {"candidates": 0, "planned": 0, "duplicates": 0,
+                              "already_in_playlist": 0, "failed_before": 0, "error": None}
+                        for cid in job["channel_ids"]}
+            result = self.resume_job(job_id, batch_size, progress_callback, cancel_callback)
+        else:
+            if job:
+                self.journal.abandon(job_id)
+            self.logger.info(f"Batch de {len(channel_ids)} canales → {playlist_id} "
+                             f"({max_workers} hilos de lectura)")
+            failures = {} if full_resync else self.journal.permanent_failures(playlist_id)
+            plan = self.plan_batch(channel_ids, playlist_id, filter_kwargs, full_resync,
+                                   cancel_callback, max_workers, exclude=failures)
+            owner, channels = plan["owner"], plan["channels"]
+            job_id = report["job_id"] = self.journal.create(*job_args)
+            for cid in channels:
+                self.journal.add_planned(job_id, [v for v in plan["order"] if owner[v] == cid],
+                                         cid)
+            if not (cancel_callback and cancel_callback()) and not any(
+                    c["error"] for c in channels.values()):
+                self.journal.mark_planned(job_id)
+            if progress_callback:
+                progress_callback(50)
+            result = {"added": [], "skipped": [], "failed": [], "job_id": job_id}
+            done = 0
+            order = plan["order"]
+
+            def ids():
+                for vid in order:
+                    if cancel_callback and cancel_callback():
+                        return
+                    yield vid
+
+            for n in self._insert_batches(job_id, playlist_id, ids(), batch_size, result):
+                done += n
+                if progress_callback:
+                    progress_callback(50 + done / max(len(order), 1) * 50)
+            inserted = {v for v in result["added"]} | {
+                x["videoId"] for x in result["skipped"] + result["failed"]}
+            result["skipped"] += [{"videoId": v, "reason": "cancelled"}
+                                  for v in order if v not in inserted]
+            self._finish_job(job_id, result)
+
+        for cid, plan_entry in channels.items():
+            report["channels"][cid] = dict(plan_entry, added=[], skipped=[], failed=[])
+        for key in ("added", "skipped", "failed"):
+            for item in result[key]:
+                vid = item if key == "added" else item["videoId"]
+                cid = owner.get(vid)
+                if cid in report["channels"]:
+                    report["channels"][cid][key].append(item)
+
+        chans = report["channels"].values()
+        report["totals"] = {
+            "channels": len(report["channels"]),
+            "errors": sum(1 for c in chans if c["error"]),
+            "added": sum(len(c["added"]) for c in chans),
+            "skipped": sum(len(c["skipped"]) for c in chans),
+            "failed": sum(len(c["failed"]) for c in chans),
+            "duplicates": sum(c["duplicates"] for c in chans),
+        }
+        for cid, c in report["channels"].items():
+            self.logger.info(f"Canal {cid}: {c['candidates']} candidatos, "
+                             f"{len(c['added'])} agregados, {c['duplicates']} repetidos, "
+                             f"{len(c['failed'])} fallidos.")
+        report["elapsed_seconds"] = round(time.monotonic() - t0, 2)
+        report["quota_remaining"] = self.quota.remaining()
+        report["transport"] = self.transport.stats()
+        report["http_cache"] = self.http_cache.stats()
+        t = report["totals"]
+        self.logger.info(f"Batch terminado en {report['elapsed_seconds']}s: "
+                         f"agregados={t['added']}, omitidos={t['skipped']}, "
+                         f"fallidos={t['failed']}, canales con error={t['errors']}")
+        c = report["http_cache"]
+        self.logger.info(f"Caché HTTP: {c['hit_ratio']:.0%} aciertos, "
+                         f"{c['revalidation_ratio']:.0%} revalidados (304), "
+                         f"{c['miss_ratio']:.0%} descargas completas.")
+        if progress_callback:
+            progress_callback(100)
+        return report
 
     def create_playlist(self, title: str, description: str, privacy: str = "private") -> str:
         """Crea una playlist y retorna su ID."""
@@ -288,7 +1214,9 @@ class YouTubeManager:
                 "snippet": {"title": title, "description": description},
                 "status": {"privacyStatus": privacy}
             }
-            r = self.youtube.playlists().insert(part="snippet,status", body=body).execute() 
+            mask = self.FIELDS["created"]
+            r = self._execute(self.youtube.playlists().insert(
+                part="snippet,status", body=body, fields=str(mask)), fields=mask)
             pid = r.get("id", "")
             self.logger.info(f"Playlist creada: {pid}")
             return pid
@@ -296,38 +1224,41 @@ class YouTubeManager:
             self.logger.error(f"Error creando playlist: {e}")
             return ""
 
-    def empty_playlist(self, playlist_id: str):
-        """Borra todos los videos de una playlist."""
+    def _delete_playlist_items(self, playlist_id: str, items: dict) -> int:
+        """Borra {videoId: itemId} en lotes HTTP y actualiza el mirror."""
+        requests = [(vid, self.youtube.playlistItems().delete(id=iid))
+                    for vid, iid in items.items()]
+        removed = 0
+        for vid, (_, exc) in self._execute_batch(requests).items():
+            if exc is not None:
+                _, reason = classify_error(exc)
+                self.logger.error(f"Error al eliminar {items[vid]}: {reason}")
+                continue
+            self.playlist_mirror.remove(playlist_id, vid)
+            removed += 1
+            self.logger.info(f"Eliminado video {vid}.")
+        if removed:
+            self._revalidate_mirror(playlist_id)
+        return removed
+
+    def empty_playlist(self, playlist_id: str) -> int:
+        """Borra todos los videos de una playlist; devuelve cuántos borró."""
         try:
-            token = None
-            while True:
-                r = self.youtube.playlistItems().list(
-                    part="id", playlistId=playlist_id,
-                    maxResults=50, pageToken=token
-                ).execute()
-                items = r.get("items", [])
-                if not items:
-                    break
-                for it in items:
-                    pid = it["id"]
-                    try:
-                        self.youtube.playlistItems().delete(id=pid).execute()
-                        self.logger.info(f"Eliminado {pid}")
-                    except Exception as ex:
-                        self.logger.error(f"Error al eliminar {pid}: {ex}")
-                token = r.get("nextPageToken")
-                if not token:
-                    break
-            self.logger.info("Playlist vaciada.")
+            mapping = self.get_playlist_mirror(playlist_id)
         except Exception as e:
             self.logger.error(f"Error vaciando playlist: {e}")
+            raise
+        removed = self._delete_playlist_items(playlist_id, dict(mapping))
+        self.logger.info(f"Playlist vaciada ({removed}/{len(mapping)} eliminados).")
+        return removed
 
     def list_playlists(self) -> list:
         """Devuelve lista de tus playlists con título, descripción y privacidad."""
         try:
-            r = self.youtube.playlists().list(
-                part="snippet,status", mine=True, maxResults=50
-            ).execute()
+            mask = self.FIELDS["list_playlists"]
+            r = self._execute(self.youtube.playlists().list(
+                part="snippet,status", mine=True, maxResults=50, fields=str(mask)
+            ), fields=mask)
             items = r.get("items", [])
             out = []
             for it in items:
@@ -341,7 +1272,7 @@ class YouTubeManager:
             return out
         except Exception as e:
             self.logger.error(f"Error listando playlists: {e}")
-            return []
+            raise
 
     def update_playlist(self, playlist_id: str, title: str, description: str, privacy: str):
         """Actualiza título/desc/privacidad de una playlist."""
@@ -351,7 +1282,9 @@ class YouTubeManager:
                 "snippet": {"title": title, "description": description},
                 "status": {"privacyStatus": privacy}
             }
-            r = self.youtube.playlists().update(part="snippet,status", body=body).execute()
+            mask = self.FIELDS["created"]
+            r = self._execute(self.youtube.playlists().update(
+                part="snippet,status", body=body, fields=str(mask)), fields=mask)
             self.logger.info(f"Playlist {playlist_id} actualizada.")
             return r
         except Exception as e:
@@ -359,72 +1292,56 @@ class YouTubeManager:
             return None
 
     def delete_playlist(self, playlist_id: str):
-        """Elimina una playlist (solo con OAuth adecuado)."""
+        """Elimina una playlist (solo con OAuth adecuado); los errores se propagan."""
         try:
-            self.youtube.playlists().delete(id=playlist_id).execute()
-            self.logger.info(f"Playlist {playlist_id} eliminada.")
+            self._execute(self.youtube.playlists().delete(id=playlist_id))
         except Exception as e:
             self.logger.error(f"Error eliminando playlist: {e}")
+            raise
+        self.playlist_mirror.drop(playlist_id)
+        self.logger.info(f"Playlist {playlist_id} eliminada.")
 
-    def remove_videos_by_duration(self, playlist_id: str, min_duration: int = None, max_duration: int = None) -> int:
+    def remove_videos_by_duration(self, playlist_id: str, min_duration: int = None, max_duration: int = None) -> dict:
         """
         Elimina de la playlist videos cuya duración (en segundos) esté
-        dentro del rango dado. Devuelve cuántos eliminó.
+        dentro del rango dado. Devuelve {"removed": n, "failed": n}.
         """
-        # Recojo {videoId: itemId}
-        mapping = {}
-        token = None
-        while True:
-            r = self.youtube.playlistItems().list(
-                part="id,contentDetails",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=token
-            ).execute()
-            for it in r.get("items", []):
-                vid = it["contentDetails"]["videoId"]
-                mapping[vid] = it["id"]
-            token = r.get("nextPageToken")
-            if not token:
-                break
-
-        vids = list(mapping.keys())
-        removed = 0
-        for i in range(0, len(vids), 50):
-            chunk = vids[i:i+50]
+        # {videoId: itemId} desde el mirror local
+        mapping = self.get_playlist_mirror(playlist_id)
+        to_delete = {}
+        for vid, it in self.iter_videos(mapping, fields=("duration",)):
             try:
-                r = self.youtube.videos().list(
-                    part="contentDetails", id=",".join(chunk)
-                ).execute()
-                for it in r.get("items", []):
-                    vid = it["id"]
-                    dur = iso8601_to_seconds(it["contentDetails"]["duration"])
-                    if min_duration and dur < min_duration:
-                        continue
-                    if max_duration and dur > max_duration:
-                        continue
-                    item_id = mapping.get(vid)
-                    if item_id:
-                        self.youtube.playlistItems().delete(id=item_id).execute()
-                        removed += 1
-                        self.logger.info(f"Eliminado video {vid}.")
-            except Exception as e:
-                self.logger.error(f"Error eliminando por duración: {e}")
-        return removed
+                dur = parse_duration(it["duration"])
+            except DurationError as e:
+                # Sin duración fiable no se borra nada
+                self.logger.warning(f"{vid}: {e}")
+                continue
+            if min_duration and dur < min_duration:
+                continue
+            if max_duration and dur > max_duration:
+                continue
+            if mapping.get(vid):
+                to_delete[vid] = mapping[vid]
+        removed = self._delete_playlist_items(playlist_id, to_delete)
+        return {"removed": removed, "failed": len(to_delete) - removed}
 
     def get_trending_videos(self, regionCode='US', maxResults=10) -> list:
-        """Devuelve los videos más populares en la región dada."""
+        """
+        Videos más populares en la región dada: los items de videos().list
+        completos, con snippet, contentDetails y statistics. Sin máscara
+        fields=, porque GUI y CLI entregan el item tal cual.
+        """
         try:
-            r = self.youtube.videos().list(
+            r = self._execute(self.youtube.videos().list(
                 part="snippet,contentDetails,statistics",
                 chart="mostPopular",
                 regionCode=regionCode,
                 maxResults=maxResults
-            ).execute()
+            ))
             return r.get("items", [])
         except Exception as e:
             self.logger.error(f"Error trending: {e}")
-            return []
+            raise
 
     @classmethod
     def update_token_pickle(cls, token_path: str, client_secrets_file: str, scopes: list):